@@ -0,0 +1,5 @@
+"""
+Benchmarks for performance-sensitive paths.
+
+Run each with ``python -m benchmarks.<name>`` from the project root.
+"""
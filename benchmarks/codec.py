@@ -0,0 +1,65 @@
+"""
+Compare decoding a large devices payload (as returned by
+``/api/v1/devices``) with each installed JSON codec, and with
+``requests.Response.json``.
+"""
+
+import functools
+import timeit
+
+import requests
+
+from jaraco.abode import codec
+
+DEVICES = 500
+
+
+def payload(count=DEVICES):
+    devices = [
+        dict(
+            id=f'ZW:{n:08}',
+            type_tag='device_type.door_contact',
+            type='Door Contact',
+            name=f'Door {n}',
+            area='1',
+            zone=str(n),
+            control_url=f'api/v1/control/device/ZW:{n:08}',
+            status='Closed',
+            faults=dict(low_battery=0, tempered=0, supervision=0, out_of_order=0),
+            statuses=dict(open='0', temperature=None, humidity=None),
+            generic_type='door',
+            uuid=f'{n:032x}',
+            version='MNIC_1.1.5',
+            is_window='0',
+        )
+        for n in range(count)
+    ]
+    return codec.select('json').dumps(devices).encode('utf-8')
+
+
+def response(content):
+    resp = requests.Response()
+    resp._content = content
+    resp.encoding = 'utf-8'
+    return resp
+
+
+def main(number=50):
+    content = payload()
+    print(f'{len(content)} bytes')
+    print(f'{"requests":>10}: ', end='')
+    elapsed = timeit.timeit(response(content).json, number=number)
+    print(f'{elapsed / number * 1000:.2f} ms')
+    for name in codec.codecs:
+        try:
+            selected = codec.select(name)
+        except ImportError:
+            print(f'{name:>10}: not installed')
+            continue
+        elapsed = timeit.timeit(
+            functools.partial(selected.loads, content), number=number
+        )
+        print(f'{name:>10}: {elapsed / number * 1000:.2f} ms')
+
+
+__name__ == '__main__' and main()
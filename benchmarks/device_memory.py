@@ -0,0 +1,45 @@
+"""
+Compare the memory per device, the time to read its slotted
+(status, faults, name) and other (battery_low) fields, and the time to
+update it from a refreshed state, with plain and compact device states.
+"""
+
+import timeit
+import tracemalloc
+
+from jaraco.abode import codec
+from jaraco.abode.devices.base import Device
+from jaraco.abode.state import CompactState
+
+from .codec import DEVICES, payload
+
+
+def load(compact):
+    content = payload()
+    tracemalloc.start()
+    docs = codec.loads(content)
+    devices = [Device.new(CompactState(doc) if compact else doc, None) for doc in docs]
+    del docs
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return devices, size
+
+
+def main(number=100_000):
+    for compact in (False, True):
+        devices, size = load(compact)
+        device = devices[0]
+        refreshed = dict(device._state, status='Open')
+        hot = timeit.timeit(lambda: (device.status, device.name), number=number)
+        cold = timeit.timeit(lambda: device.battery_low, number=number)
+        update = timeit.timeit(lambda: device.update(refreshed), number=number)
+        label = 'compact' if compact else 'dict'
+        print(
+            f'{label:>8}: {size / DEVICES:.0f} bytes/device, '
+            f'{hot / number * 1e6:.2f} µs (status, name), '
+            f'{cold / number * 1e6:.2f} µs (battery_low), '
+            f'{update / number * 1e6:.2f} µs (update)'
+        )
+
+
+__name__ == '__main__' and main()
@@ -0,0 +1,35 @@
+"""
+Compare classifying a large batch of timeline event codes with
+``map_event_codes`` against calling ``map_event_code`` for each.
+"""
+
+import random
+import timeit
+
+from jaraco.abode.helpers import timeline as TIMELINE
+
+CODES = 50_000
+
+
+def codes(count=CODES):
+    rand = random.Random(0)
+    return [str(rand.randrange(1000, 6200)) for _ in range(count)]
+
+
+def scalar(codes):
+    return [TIMELINE.map_event_code(code) for code in codes]
+
+
+def batch(codes):
+    return TIMELINE.map_event_codes(codes)
+
+
+def main(number=10):
+    sample = codes()
+    assert scalar(sample) == batch(sample)
+    for func in (scalar, batch):
+        elapsed = timeit.timeit(lambda: func(sample), number=number)
+        print(f'{func.__name__:>7}: {elapsed / number * 1000:.1f} ms per {CODES} codes')
+
+
+__name__ == '__main__' and main()
@@ -0,0 +1,38 @@
+"""
+Measure the time to import the package, its client and its
+command-line interface (with ``python -X importtime``), reporting
+the best of several runs and the slowest imports.
+"""
+
+import subprocess
+import sys
+
+MODULES = 'jaraco.abode', 'jaraco.abode.client', 'jaraco.abode.cli'
+
+
+def importtime(module):
+    """Return the cumulative and self times (µs) of each module imported."""
+    proc = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    times = {}
+    for line in proc.stderr.splitlines()[1:]:
+        self_us, cumulative, name = line[len('import time:') :].split('|')
+        times[name.strip()] = int(cumulative), int(self_us)
+    return times
+
+
+def main(runs=5, top=5):
+    for module in MODULES:
+        results = [importtime(module) for _ in range(runs)]
+        best = min(results, key=lambda times: times[module][0])
+        print(f'{module}: {best[module][0] / 1000:.1f} ms')
+        slowest = sorted(best.items(), key=lambda item: item[1][1], reverse=True)
+        for name, (_, self_us) in slowest[:top]:
+            print(f'    {name}: {self_us / 1000:.1f} ms')
+
+
+__name__ == '__main__' and main()
@@ -0,0 +1,109 @@
+"""
+Compare decoding a stream of Socket.IO event frames with the packet
+parser and dispatch tables against the previous approach (mapping
+codes through BijectiveMaps, dispatching through getattr and finding
+the JSON list by scanning the text).
+"""
+
+import functools
+import json
+import timeit
+
+import jaraco.collections
+
+from jaraco.abode import packets
+
+FRAMES = 1000
+
+
+def frames(count=FRAMES):
+    return [
+        f'42["com.goabode.device.update","ZW:{n:08}"]'
+        if n % 4
+        else (
+            '42["com.goabode.gateway.timeline",{"id":"%d","event_code":"5001",'
+            '"event_type":"Capture Image","device_id":"ZW:%08d"}]' % (n, n)
+        )
+        for n in range(count)
+    ]
+
+
+class EngineIO:
+    codes = jaraco.collections.BijectiveMap(
+        open=0,
+        close=1,
+        ping=2,
+        pong=3,
+        message=4,
+    )
+
+
+class SocketIO:
+    codes = jaraco.collections.BijectiveMap(
+        connect=0,
+        disconnect=1,
+        event=2,
+        error=4,
+    )
+
+
+def find_json_list(text):
+    l_bracket = text.find("[")
+    r_bracket = text.rfind("]")
+
+    if l_bracket == -1 or r_bracket == -1:
+        raise ValueError("No list found", text)
+
+    return json.loads(text[l_bracket : r_bracket + 1])
+
+
+class Previous:
+    def on_text(self, text):
+        code = int(text[:1])
+        message = text[1:]
+        name = EngineIO.codes[code]
+        getattr(self, f'_on_engineio_{name}')(message)
+
+    def _on_engineio_message(self, message):
+        code = int(message[:1])
+        data = message[1:]
+        name = SocketIO.codes[code]
+        getattr(self, f'_on_socketio_{name}')(data)
+
+    def _on_socketio_event(self, data):
+        json_data = find_json_list(data)
+        return json_data[0], json_data[1:]
+
+
+class Current:
+    def __init__(self):
+        self.engineio = {packets.EngineIO.MESSAGE: self._on_engineio_message}
+        self.socketio = {packets.SocketIO.EVENT: self._on_socketio_event}
+
+    def on_text(self, text):
+        self.engineio[text[:1]](text)
+
+    def _on_engineio_message(self, text):
+        packet = packets.parse(text, pos=1)
+        self.socketio[packet.type](packet)
+
+    def _on_socketio_event(self, packet):
+        return packet.data[0], packet.data[1:]
+
+
+def decode(handler, stream):
+    for text in stream:
+        handler.on_text(text)
+
+
+def main(number=100):
+    stream = frames()
+    for handler in (Previous(), Current()):
+        elapsed = timeit.timeit(
+            functools.partial(decode, handler, stream), number=number
+        )
+        name = type(handler).__name__
+        print(f'{name:>8}: {elapsed / number / len(stream) * 1e6:.2f} µs per frame')
+
+
+__name__ == '__main__' and main()
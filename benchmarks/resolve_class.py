@@ -0,0 +1,40 @@
+"""
+Compare resolving device classes through the precomputed lookup
+against rebuilding the lookup for each device, as loading a large
+device list once did.
+"""
+
+import functools
+import itertools
+import timeit
+
+from jaraco.abode.devices import pkg
+from jaraco.abode.devices.base import Device, Unknown
+
+DEVICES = 300
+
+
+def device_docs(count=DEVICES):
+    pkg.import_all()
+    tags = itertools.cycle(sorted(Device._build_lookup()))
+    return [dict(id=f'ZW:{n:08}', type_tag=tag) for n, tag in zip(range(count), tags)]
+
+
+def rebuilt(docs):
+    for doc in docs:
+        Device._build_lookup().get(doc['type_tag'].lower(), Unknown)(doc, None)
+
+
+def precomputed(docs):
+    for doc in docs:
+        Device.new(doc, None)
+
+
+def main(number=100):
+    docs = device_docs()
+    for func in (rebuilt, precomputed):
+        elapsed = timeit.timeit(functools.partial(func, docs), number=number)
+        print(f'{func.__name__:>12}: {elapsed / number * 1000:.3f} ms per load')
+
+
+__name__ == '__main__' and main()
@@ -2,7 +2,24 @@
 An Abode alarm Python library.
 """
 
-from .client import Client
+import importlib
+from typing import TYPE_CHECKING
+
 from .exceptions import AuthenticationException, Exception
 
+if TYPE_CHECKING:
+    from .client import Client
+
 __all__ = ['Exception', 'Client', 'AuthenticationException']
+
+
+def __getattr__(name):
+    """Import the client (and its dependencies) and submodules on first use."""
+    if name == 'Client':
+        return importlib.import_module('.client', __name__).Client
+    try:
+        return importlib.import_module(f'.{name}', __name__)
+    except ModuleNotFoundError as exc:
+        if exc.name != f'{__name__}.{name}':
+            raise
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
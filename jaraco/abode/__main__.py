@@ -1,3 +1,5 @@
+import sys
+
 from .cli import main
 
-__name__ == '__main__' and main()
+__name__ == '__main__' and sys.exit(main())
@@ -1,10 +1,24 @@
+import collections.abc
+import functools
+
 import more_itertools
 
 import jaraco.functools
-import jaraco.itertools
-
-single = jaraco.functools.compose(more_itertools.one, jaraco.itertools.always_iterable)
 
-opt_single = jaraco.functools.compose(
-    more_itertools.only, jaraco.itertools.always_iterable
+always_iterable = functools.partial(
+    more_itertools.always_iterable,
+    base_type=(str, bytes, collections.abc.Mapping),
 )
+"""
+Like :func:`jaraco.itertools.always_iterable` (treating mappings
+as singletons), but without importing that module's dependencies.
+
+>>> list(always_iterable(dict(a=1)))
+[{'a': 1}]
+>>> list(always_iterable(None))
+[]
+"""
+
+single = jaraco.functools.compose(more_itertools.one, always_iterable)
+
+opt_single = jaraco.functools.compose(more_itertools.only, always_iterable)
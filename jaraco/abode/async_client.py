@@ -0,0 +1,424 @@
+"""
+Native asyncio client to an Abode system.
+
+Requires `aiohttp <https://pypi.org/project/aiohttp>`_ unless a
+compatible session is supplied.
+"""
+
+import asyncio
+import contextlib
+import functools
+import logging
+import urllib.parse
+import weakref
+
+from more_itertools import consume
+
+from . import bulk, codec
+from ._itertools import always_iterable, single
+from .client import BaseClient, _cookies, _log_response
+from .devices import alarm as ALARM
+from .exceptions import AuthenticationException, TransientException
+from .helpers import errors as ERROR
+from .helpers import urls
+from .policy import Deadline
+
+log = logging.getLogger(__name__)
+
+
+@functools.lru_cache
+def _transport_errors():
+    errors = OSError, asyncio.TimeoutError
+    with contextlib.suppress(ImportError):
+        import aiohttp
+
+        errors += (aiohttp.ClientError,)
+    return errors
+
+
+class Response:
+    """
+    A response whose body has been read, exposing the subset of the
+    :class:`requests.Response` interface used by the devices.
+
+    >>> resp = Response(200, {'Content-Type': 'application/json'}, b'{"id": 1}')
+    >>> resp.json()
+    {'id': 1}
+    >>> resp.text
+    '{"id": 1}'
+    >>> bool(resp)
+    True
+    """
+
+    def __init__(self, status_code, headers, content, cookies=None):
+        self.status_code = status_code
+        self.headers = headers
+        self.content = content
+        self.cookies = cookies or {}
+
+    @property
+    def text(self):
+        return self.content.decode('utf-8', errors='replace')
+
+    def json(self):
+        return codec.loads(self.content)
+
+    @property
+    def ok(self):
+        return self.status_code < 400
+
+    def __bool__(self):
+        return self.ok
+
+
+def _save_cookies(values):
+    from requests.cookies import create_cookie
+
+    jar = _cookies()
+    domain = urllib.parse.urlparse(urls.BASE).hostname
+    for name, value in values.items():
+        if jar.get(name) != value:
+            jar.set_cookie(create_cookie(name, value, domain=domain))
+
+
+class AsyncClient(BaseClient):
+    """
+    Client to an Abode system for use in an asyncio event loop.
+
+    Devices and automations are the same objects loaded by
+    :class:`jaraco.abode.Client`, but actions affecting the
+    Abode system are invoked on the client, e.g.
+    ``await client.switch_on(device)``. The methods of the devices
+    and automations that make requests (e.g. ``device.switch_on()``
+    or ``device.refresh()``) are not supported with this client;
+    use the corresponding methods of the client instead.
+
+    Cookies (including the ``uuid`` identifying this client to Abode)
+    are shared with :class:`jaraco.abode.Client`: they're loaded at the
+    first login, sent with each request and saved on logout.
+
+    Requests are never hedged.
+    """
+
+    def __init__(
+        self,
+        username=None,
+        password=None,
+        session=None,
+        timeout=30,
+        retry_policy=None,
+        compact=False,
+    ):
+        super().__init__(username, password, timeout, retry_policy, compact)
+        self._session = session
+        self._owns_session = session is None
+        self._cookies = None
+        self._login_locks = weakref.WeakKeyDictionary()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    def _get_session(self):
+        if self._session is None:
+            import aiohttp
+
+            self._session = aiohttp.ClientSession()
+        return self._session
+
+    async def close(self):
+        """Log out and close the session (if owned by the client)."""
+        await self.logout()
+        if self._owns_session and self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    async def _request(self, method, path, headers=None, data=None, timeout=None):
+        return await asyncio.wait_for(
+            self._read(method, path, headers, data),
+            self.timeout if timeout is None else timeout,
+        )
+
+    async def _read(self, method, path, headers, data):
+        url = urllib.parse.urljoin(urls.BASE, path)
+        request = self._get_session().request(
+            method.upper(),
+            url,
+            headers=headers,
+            json=data,
+            cookies=self._cookies,
+            allow_redirects=False,
+        )
+        async with request as resp:
+            content = await resp.read()
+            cookies = {
+                name: morsel.value
+                for name, morsel in getattr(resp, 'cookies', {}).items()
+            }
+        if self._cookies is not None:
+            self._cookies.update(cookies)
+        return Response(resp.status, resp.headers, content, cookies)
+
+    async def _load_cookies(self):
+        """Load the saved cookies (without blocking the event loop)."""
+        if self._cookies is not None:
+            return
+        jar = await asyncio.get_running_loop().run_in_executor(None, _cookies)
+        self._cookies = {cookie.name: cookie.value for cookie in jar}
+
+    async def _save_cookies(self):
+        """Save the cookies (without blocking the event loop)."""
+        if not self._cookies:
+            return
+        await asyncio.get_running_loop().run_in_executor(
+            None, _save_cookies, dict(self._cookies)
+        )
+
+    @staticmethod
+    def _raise_for(response):
+        if not response.ok:
+            message = AuthenticationException.best_message(response)
+            raise AuthenticationException((response.status_code, message))
+
+    def _login_lock(self):
+        # asyncio locks are bound to a single event loop
+        loop = asyncio.get_running_loop()
+        return self._login_locks.setdefault(loop, asyncio.Lock())
+
+    async def login(self, username=None, password=None, mfa_code=None):
+        """Explicit Abode login."""
+        async with self._login_lock():
+            await self._login(username, password, mfa_code)
+
+    async def _login(self, username=None, password=None, mfa_code=None):
+        await self._load_cookies()
+        login_data = self._login_data(
+            username, password, mfa_code, self._cookies.get('uuid')
+        )
+
+        response = await self._request('post', urls.LOGIN, data=login_data)
+        self._raise_for(response)
+        response_object = response.json()
+        self._cookies.setdefault('uuid', login_data['uuid'])
+
+        self._check_mfa(response_object)
+
+        oauth_response = await self._request('get', urls.OAUTH_TOKEN)
+        self._raise_for(oauth_response)
+
+        self._logged_in(response_object, oauth_response.json())
+
+    async def logout(self):
+        """Explicit Abode logout, saving the cookies."""
+        await self._save_cookies()
+
+        if not self._token:
+            return
+
+        header_data = {'ABODE-API-KEY': self._token}
+
+        self._reset()
+
+        try:
+            response = await self._request('post', urls.LOGOUT, headers=header_data)
+        except _transport_errors() as exc:
+            log.warning("Caught exception during logout: %s", exc)
+            return
+
+        self._raise_for(response)
+
+        log.info("Logout successful")
+
+    async def send_request(
+        self, method, path, headers=None, data=None, sensitive=False, timeout=None
+    ):
+        """
+        Send requests to Abode, within ``timeout`` seconds (default
+        :attr:`timeout`) and retrying failures according to the
+        :attr:`retry_policy`.
+        """
+        deadline = Deadline.of(self.timeout if timeout is None else timeout)
+        generation = None
+
+        async def attempt():
+            nonlocal generation
+            generation, auth_headers = await self._authorize(headers)
+            return await self._send_request(
+                method, path, auth_headers, data, sensitive, deadline
+            )
+
+        async def reauthenticate():
+            await self._reauthenticate(generation)
+
+        return await self.retry_policy.call_async(
+            attempt, reauthenticate, deadline, self.metrics
+        )
+
+    async def _authorize(self, headers):
+        async with self._login_lock():
+            if self._needs_login():
+                await self._login()
+            return self._generation, self._auth_headers(headers)
+
+    async def _reauthenticate(self, generation):
+        async with self._login_lock():
+            if generation == self._generation:
+                await self._login()
+
+    async def _send_request(self, method, path, headers, data, sensitive, deadline):
+        self.metrics.count('requests')
+        try:
+            response = await self._request(
+                method, path, headers=headers, data=data, timeout=deadline.check()
+            )
+        except asyncio.TimeoutError as exc:
+            self.metrics.count('timeouts')
+            log.info("Abode request timed out...")
+            raise TransientException(ERROR.REQUEST_TIMEOUT) from exc
+        except _transport_errors() as exc:
+            log.info("Abode connection reset...")
+            raise TransientException(ERROR.REQUEST) from exc
+
+        _log_response(method, path, response, sensitive)
+
+        return self._check_response(response)
+
+    async def refresh(self):
+        """Do a full refresh of all devices and automations."""
+        await self.get_devices(refresh=True)
+        await self.get_automations(refresh=True)
+
+    async def get_devices(self, refresh=False, generic_type=None):
+        """Get all devices from Abode."""
+        if refresh or self._devices is None:
+            await self._load_devices()
+
+        return self._filter_devices(generic_type)
+
+    async def _load_devices(self):
+        if self._devices is None:
+            self._devices = {}
+
+        log.info("Updating all devices...")
+        response = await self.send_request("get", urls.DEVICES)
+        consume(map(self._load_device, always_iterable(response.json())))
+
+        panel_response = await self.send_request("get", urls.PANEL)
+        self._load_panel(panel_response.json())
+
+    async def get_device(self, device_id, refresh=False):
+        """Get a single device."""
+        if self._devices is None:
+            await self.get_devices()
+            refresh = False
+
+        device = self._devices.get(device_id)
+
+        if device and refresh:
+            await self.refresh_state(device)
+
+        return device
+
+    async def get_alarm(self, area='1', refresh=False):
+        """Shortcut method to get the alarm device."""
+        return await self.get_device(ALARM.id(area), refresh)
+
+    async def get_automations(self, refresh=False):
+        """Get all automations."""
+        if refresh or self._automations is None:
+            log.info("Updating all automations...")
+            response = await self.send_request("get", urls.AUTOMATION)
+            self._load_automations(response.json())
+
+        return list(self._automations.values())
+
+    async def get_automation(self, automation_id, refresh=False):
+        """Get a single automation."""
+        if self._automations is None:
+            await self.get_automations()
+            refresh = False
+
+        automation = self._automations.get(str(automation_id))
+
+        if automation and refresh:
+            await self.refresh_state(automation)
+
+        return automation
+
+    async def execute_many(self, commands, limit=None):
+        """
+        Invoke many device commands concurrently, with at most
+        ``limit`` in flight.
+
+        Each command is a tuple of (device or device id, action, value),
+        where the action names a method of this client (e.g. 'switch_on'
+        or 'set_level') invoked with the device and value (if not None).
+
+        Return a :class:`bulk.Result` for each command, in order,
+        capturing its return value or exception.
+        """
+        return await bulk.execute_async(self, commands, limit)
+
+    async def refresh_state(self, stateful):
+        """Refresh the state of a device or automation."""
+        response = await self.send_request("get", stateful._refresh_path())
+        return stateful._refreshed(single(response.json()))
+
+    async def set_status(self, device, status):
+        """Set the status of a device."""
+        response = await self.send_request(**device._status_request(status))
+        device._check_status(response.json(), status)
+
+    async def set_level(self, device, level):
+        """Set the level of a device."""
+        response = await self.send_request(**device._level_request(level))
+        device._check_level(response.json(), level)
+
+    async def perform(self, device, action):
+        """Perform a status-changing action on the device."""
+        state = device.actions[action]
+        await self.set_status(device, int(state))
+        device._state['status'] = state
+
+    async def switch_on(self, device):
+        """Turn the device on (or arm the alarm to the default mode)."""
+        if isinstance(device, ALARM.Alarm):
+            return await self.set_mode(device, self.default_mode)
+        await self.perform(device, 'switch_on')
+
+    async def switch_off(self, device):
+        """Turn the device off (or set the alarm to standby)."""
+        if isinstance(device, ALARM.Alarm):
+            return await self.set_mode(device, 'standby')
+        await self.perform(device, 'switch_off')
+
+    async def lock(self, device):
+        """Lock the device."""
+        await self.perform(device, 'lock')
+
+    async def unlock(self, device):
+        """Unlock the device."""
+        await self.perform(device, 'unlock')
+
+    async def set_mode(self, alarm, mode):
+        """Set the alarm mode."""
+        mode = alarm._validate_mode(mode)
+        path = urls.panel_mode(alarm._area, mode)
+        response = await self.send_request("put", path)
+        return alarm._check_mode(response.json(), mode)
+
+    async def enable_automation(self, automation, enable=True):
+        """Enable or disable the automation."""
+        path = urls.AUTOMATION_ID.format(id=automation.id)
+        response = await self.send_request(
+            method="patch", path=path, data={'enabled': enable}
+        )
+        automation._check_enabled(single(response.json()), enable)
+
+    async def trigger_automation(self, automation):
+        """Trigger the automation."""
+        path = urls.AUTOMATION_APPLY.format(id=automation.id)
+        await self.send_request(method="post", path=path)
+        log.info("Automation triggered: %s", automation.name)
@@ -0,0 +1,172 @@
+"""
+Fetch the timeline of events of an Abode system, page by page, and
+keep it in a local, indexed store, along with the events pushed live.
+"""
+
+import contextlib
+import logging
+import sqlite3
+import threading
+import urllib.parse
+
+import jaraco
+
+from . import codec, config
+from .helpers import errors as ERROR
+from .helpers import timeline as TIMELINE
+from .helpers import urls
+
+log = logging.getLogger(__name__)
+
+
+def pages(client, size=100, cursor=None, **params):
+    """
+    Generate pages of up to ``size`` timeline events, newest first,
+    starting after the event with id ``cursor``. Additional
+    ``params`` (e.g. ``device_id``) filter the events.
+    """
+    while True:
+        query = dict(params, dir='next', size=size)
+        if cursor is not None:
+            query.update(id=cursor)
+        path = f'{urls.TIMELINE}?{urllib.parse.urlencode(query)}'
+        page = codec.loads(client.send_request('get', path).content)
+        if page:
+            yield page
+        if len(page) < size:
+            return
+        cursor = page[-1]['id']
+
+
+class Store:
+    """
+    Timeline events, indexed by code, group, device and time
+    (``event_utc``), and unique by id.
+
+    >>> store = Store(':memory:')
+    >>> event = dict(id='1', event_code='1100', event_utc='1700000000', device_id='1')
+    >>> store.add([event, event])
+    1
+    >>> store.query(group=TIMELINE.Groups.ALARM, start=1700000000) == [event]
+    True
+    >>> store.query(device_id='2')
+    []
+    """
+
+    filename = 'timeline.sqlite'
+
+    schema = """
+        CREATE TABLE IF NOT EXISTS events (
+            id TEXT PRIMARY KEY NOT NULL,
+            code INTEGER,
+            event_group TEXT,
+            device_id TEXT,
+            utc INTEGER,
+            doc TEXT NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS events_code ON events (code, utc);
+        CREATE INDEX IF NOT EXISTS events_group ON events (event_group, utc);
+        CREATE INDEX IF NOT EXISTS events_device ON events (device_id, utc);
+        CREATE INDEX IF NOT EXISTS events_utc ON events (utc);
+    """
+
+    def __init__(self, path=None):
+        path = path or config.paths.user_data / self.filename
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.executescript(self.schema)
+        self._lock = threading.Lock()
+
+    def close(self):
+        self._db.close()
+
+    @staticmethod
+    def _code(event):
+        with contextlib.suppress(KeyError, TypeError, ValueError):
+            return int(event['event_code'])
+        return None
+
+    @classmethod
+    def _rows(cls, events):
+        events = [event for event in events if event.get('id')]
+        codes = [cls._code(event) for event in events]
+        # events without a (valid) code are stored, but in no group
+        groups = iter(
+            TIMELINE.map_event_codes([code for code in codes if code is not None])
+        )
+        for event, code in zip(events, codes):
+            group = None if code is None else next(groups)
+            utc = event.get('event_utc')
+            yield (
+                str(event['id']),
+                code,
+                group,
+                event.get('device_id'),
+                int(utc) if utc else None,
+                codec.dumps(event),
+            )
+
+    def add(self, events):
+        """Add the events not already stored; return how many were added."""
+        rows = list(self._rows(events))
+        with self._lock, self._db:
+            before = self._db.total_changes
+            self._db.executemany(
+                'INSERT OR IGNORE INTO events VALUES (?, ?, ?, ?, ?, ?)', rows
+            )
+            return self._db.total_changes - before
+
+    def backfill(self, client, size=100, full=False):
+        """
+        Fetch the timeline (newest first) until a page holding only
+        stored events (or, if ``full``, the oldest event); return the
+        number of events added.
+        """
+        added = 0
+        for page in pages(client, size):
+            count = self.add(page)
+            added += count
+            if not count and not full:
+                break
+        log.info("Added %d timeline events", added)
+        return added
+
+    def track(self, events):
+        """Add the timeline events pushed to the event controller."""
+        return events.add_timeline_callback(TIMELINE.ALL, self._on_event)
+
+    def _on_event(self, event):
+        if not self.add([event]):
+            log.debug("Skipping stored or unidentified event: %s", event)
+
+    def query(
+        self, code=None, group=None, device_id=None, start=None, end=None, limit=None
+    ):
+        """
+        The stored events (newest first) with the code, in the group
+        and for the device, from ``start`` until ``end`` (in seconds
+        since the epoch).
+        """
+        if group is not None and group not in TIMELINE.Groups.ALL:
+            raise jaraco.abode.Exception(ERROR.EVENT_GROUP_INVALID)
+        conditions = dict(
+            code=('code = ?', code and int(code)),
+            group=('event_group = ?', group),
+            device_id=('device_id = ?', device_id),
+            start=('utc >= ?', start),
+            end=('utc < ?', end),
+        )
+        terms = [
+            (clause, value)
+            for clause, value in conditions.values()
+            if value is not None
+        ]
+        where = ' AND '.join(clause for clause, _ in terms) or '1'
+        order = 'utc DESC, CAST(id AS INTEGER) DESC, id DESC'
+        sql = f'SELECT doc FROM events WHERE {where} ORDER BY {order}'
+        values = [value for _, value in terms]
+        if limit is not None:
+            sql += ' LIMIT ?'
+            values.append(limit)
+        with self._lock:
+            rows = self._db.execute(sql, values).fetchall()
+        return [codec.loads(doc) for (doc,) in rows]
@@ -6,6 +6,7 @@ from typing import Any, Dict
 
 import jaraco.abode
 
+from . import codec
 from ._itertools import single
 from .helpers import errors as ERROR
 from .helpers import urls
@@ -28,16 +29,15 @@ class Automation(Stateful):
             method="patch", path=path, data={'enabled': enable}
         )
 
-        state: Dict[str, Any] = single(response.json())
+        self._check_enabled(single(codec.loads(response.content)), enable)
 
+    def _check_enabled(self, state: Dict[str, Any], enable: bool):
         if state['id'] != self._state['id'] or state['enabled'] != enable:
             raise jaraco.abode.Exception(ERROR.INVALID_AUTOMATION_EDIT_RESPONSE)
 
         self.update(state)
 
         log.info("Set automation %s enable to: %s", self.name, self.enabled)
-        log.debug("Automation URL (patch): %s", path)
-        log.debug("Automation response: %s", response.text)
 
     def trigger(self):
         """Trigger the automation."""
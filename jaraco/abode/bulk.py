@@ -0,0 +1,114 @@
+"""Execute many device commands concurrently."""
+
+import asyncio
+import concurrent.futures
+import itertools
+from typing import Any, NamedTuple, Optional
+
+import jaraco.abode
+
+from .devices.base import Device
+from .helpers import errors as ERROR
+
+
+class Command(NamedTuple):
+    """
+    An action (method name) to invoke on a device (or device id),
+    with an optional value.
+
+    >>> Command('ZW:01', 'switch_on')
+    Command(device='ZW:01', action='switch_on', value=None)
+    """
+
+    device: Any
+    action: str
+    value: Any = None
+
+    @property
+    def args(self):
+        return () if self.value is None else (self.value,)
+
+
+class Result(NamedTuple):
+    """The outcome of a :class:`Command`."""
+
+    command: Command
+    value: Any = None
+    exception: Optional[BaseException] = None
+
+    @property
+    def ok(self):
+        return self.exception is None
+
+
+def resolve(devices, commands):
+    """
+    Normalize commands, resolving device ids to devices.
+
+    Unknown devices resolve to ``None``.
+    """
+    for command in itertools.starmap(Command, commands):
+        device = command.device
+        if not isinstance(device, Device):
+            device = devices.get(device)
+        yield command, device
+
+
+def _check(device):
+    if device is None:
+        raise jaraco.abode.Exception(ERROR.INVALID_DEVICE_ID)
+    return device
+
+
+def _invoke(command, device):
+    return getattr(_check(device), command.action)(*command.args)
+
+
+def _result(command, future):
+    try:
+        return Result(command, future.result())
+    except Exception as exc:
+        return Result(command, exception=exc)
+
+
+def execute(client, commands, max_workers=8):
+    """
+    Invoke the commands concurrently on at most ``max_workers`` threads,
+    returning a :class:`Result` for each command, in order.
+    """
+    # load devices first so that they're loaded only once
+    client.get_devices()
+    resolved = list(resolve(client._devices, commands))
+    with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as pool:
+        futures = [
+            (command, pool.submit(_invoke, command, device))
+            for command, device in resolved
+        ]
+    return [_result(command, future) for command, future in futures]
+
+
+async def execute_async(client, commands, limit=None):
+    """
+    Invoke the commands concurrently on the :class:`AsyncClient`,
+    with at most ``limit`` in flight, returning a :class:`Result`
+    for each command, in order.
+    """
+    await client.get_devices()
+    resolved = list(resolve(client._devices, commands))
+    semaphore = asyncio.Semaphore(limit or len(resolved) or 1)
+
+    async def invoke(command, device):
+        async with semaphore:
+            action = getattr(client, command.action)
+            return await action(_check(device), *command.args)
+
+    outcomes = await asyncio.gather(
+        *itertools.starmap(invoke, resolved), return_exceptions=True
+    )
+    return [
+        Result(command, exception=outcome)
+        # a cancelled call is a CancelledError, which isn't an Exception
+        if isinstance(outcome, BaseException)
+        else Result(command, outcome)
+        for (command, _), outcome in zip(resolved, outcomes)
+    ]
@@ -2,31 +2,37 @@
 
 import argparse
 import code
+import collections
 import contextlib
+import contextvars
+import functools
 import getpass
 import importlib
-import json
+import io
 import logging
 import os
+import queue
+import sys
+import threading
 import time
 
-import keyring
 from more_itertools import always_iterable
 
 import jaraco.abode
-from jaraco.context import suppress
 from jaraco.functools import pass_none
 
-from . import Client
+from . import codec, daemon, plan
 from .helpers import timeline as TIMELINE
 from .helpers import urls
 
 log = logging.getLogger(__name__)
 
 
-@suppress(ImportError)
 def enable_color():
-    import colorlog
+    try:
+        import colorlog
+    except ImportError:
+        return
 
     fmt = "%(asctime)s %(levelname)s (%(threadName)s) [%(name)s] %(message)s"
     colorfmt = f"%(log_color)s{fmt}%(reset)s"
@@ -62,6 +68,19 @@ def setup_logging(log_level=logging.INFO):
     logging.getLogger().setLevel(log_level)
 
 
+def _workers(value):
+    """
+    >>> _workers('0')
+    Traceback (most recent call last):
+    ...
+    argparse.ArgumentTypeError: must be at least 1
+    """
+    workers = int(value)
+    if workers < 1:
+        raise argparse.ArgumentTypeError("must be at least 1")
+    return workers
+
+
 def build_parser():
     """
     Get parsed arguments.
@@ -70,6 +89,15 @@ def build_parser():
     """
     parser = argparse.ArgumentParser("abode")
 
+    parser.add_argument(
+        'command',
+        nargs='?',
+        choices=['daemon'],
+        help='Run a daemon that keeps a client logged in, serving other '
+        'invocations (without --listen, --interact or --mfa) '
+        'over a Unix-domain socket',
+    )
+
     parser.add_argument(
         '-u', '--username', help='Username', default=os.environ.get('ABODE_USERNAME')
     )
@@ -203,6 +231,15 @@ def build_parser():
         action='append',
     )
 
+    parser.add_argument(
+        '--parallel',
+        metavar='N',
+        type=_workers,
+        help='Run the actions (--arm through --image) on N threads, '
+        'keeping those on the same device or automation in order, '
+        'and report the outcome and timing of each',
+    )
+
     parser.add_argument(
         '--listen',
         help='Block and listen for device_id',
@@ -210,6 +247,15 @@ def build_parser():
         action="store_true",
     )
 
+    parser.add_argument(
+        '--format',
+        choices=['text', 'ndjson'],
+        default='text',
+        help='Output devices (--json, --devices, --device) and, with '
+        '--listen, device changes and timeline events as text or as '
+        'JSON, one document per line',
+    )
+
     parser.add_argument(
         '--debug',
         help='Enable debug logging',
@@ -228,7 +274,7 @@ def build_parser():
 
 
 def _create_client_instance(args):
-    return Client(
+    return jaraco.abode.Client(
         username=args.username,
         password=args.password,
         get_devices=args.mfa is None,
@@ -263,32 +309,180 @@ def _timeline_callback(resp):
     log.info(tmpl.format_map(resp))
 
 
+class _Lines:
+    """
+    Write documents to ``stream`` as compact JSON, one per line,
+    flushing each line. A thread writes the lines from a queue of up
+    to ``maxsize``, so a slow reader holds up callers only once the
+    queue is full. Once the stream fails (e.g. the reader went away),
+    ``failed`` is set and the remaining lines are discarded.
+
+    >>> stream = io.StringIO()
+    >>> lines = _Lines(stream)
+    >>> lines(dict(id='ZW:01', status='Off'))
+    >>> lines.close()
+    >>> stream.getvalue()
+    '{"id":"ZW:01","status":"Off"}\\n'
+    """
+
+    def __init__(self, stream, maxsize=1024):
+        self.stream = stream
+        self._queue = queue.Queue(maxsize)
+        self.failed = threading.Event()
+        self._thread = threading.Thread(target=self._write, name='ndjson', daemon=True)
+        self._thread.start()
+
+    def __call__(self, doc):
+        self._queue.put(codec.dumps(doc) + '\n')
+
+    def _write(self):
+        lines = iter(self._queue.get, None)
+        try:
+            for line in lines:
+                self.stream.write(line)
+                self.stream.flush()
+        except BrokenPipeError:
+            self.failed.set()
+        except OSError as exc:
+            log.error("Unable to write output: %s", exc)
+            self.failed.set()
+        # keep draining, so callers are never held up
+        collections.deque(lines, maxlen=0)
+
+    def close(self):
+        """Write the lines queued."""
+        self._queue.put(None)
+        self._thread.join()
+
+
 class Dispatcher:  # pragma: no cover
     def __init__(self, client, args):
         self.client = client
         self.args = args
+        self.lines = None
 
     def dispatch(self):
+        with self._output():
+            if self.args.parallel:
+                return self.dispatch_parallel()
+            return self.dispatch_serial()
+
+    @contextlib.contextmanager
+    def _output(self):
+        if self.args.format == 'ndjson':
+            self.lines = _Lines(sys.stdout)
+        try:
+            yield
+        finally:
+            lines, self.lines = self.lines, None
+            lines and lines.close()
+        if lines and lines.failed.is_set():
+            # As the standard library's command-line interfaces do,
+            # discard the output left and exit with an error.
+            os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+            raise SystemExit(1)
+
+    def dispatch_serial(self):
+        """Run the actions and outputs in turn; return 1 if any action failed."""
         self.login()
         self.output_current_mode()
-        self.change_system_mode()
-        self.set_setting()
-        self.switch_on()
-        self.switch_off()
-        self.lock()
-        self.unlock()
+        results = [
+            self.change_system_mode(),
+            self.set_setting(),
+            self.switch_on(),
+            self.switch_off(),
+            self.lock(),
+            self.unlock(),
+        ]
         self.output_json()
         self.print_all_automations()
-        self.enable_automation()
-        self.disable_automation()
-        self.trigger_automation()
-        self.trigger_image_capture()
-        self.start_kvs_stream()
-        self.save_camera_image()
+        results += [
+            self.enable_automation(),
+            self.disable_automation(),
+            self.trigger_automation(),
+            self.trigger_image_capture(),
+            self.start_kvs_stream(),
+            self.save_camera_image(),
+        ]
         self.print_all_devices()
         self.print_specific_devices()
         self.start_device_change_listener()
         self.interact()
+        return int(not all(results))
+
+    def dispatch_parallel(self):
+        """
+        Run the actions concurrently, then the outputs; return 1
+        if any action failed.
+        """
+        self.login()
+        self.output_current_mode()
+        steps = list(self.steps())
+        # load the devices (and automations) once, rather than racing
+        # to load them on each thread
+        self.client.get_devices()
+        if any(step.key[0] == 'automation' for step in steps):
+            self.client.get_automations()
+        start = time.monotonic()
+        outcomes = plan.run(steps, workers=self.args.parallel)
+        plan.report(outcomes, time.monotonic() - start)
+        self.output_json()
+        self.print_all_automations()
+        self.print_all_devices()
+        self.print_specific_devices()
+        self.start_device_change_listener()
+        self.interact()
+        return int(not all(outcome.ok for outcome in outcomes))
+
+    def steps(self):
+        """
+        The actions, in the order they run serially, keyed by the
+        panel, device or automation each affects. Each returns a
+        true value if it succeeded (``None`` for a device or
+        automation not found).
+        """
+        args = self.args
+        if args.arm:
+            yield plan.Step(('panel',), f'--arm {args.arm}', self.change_system_mode)
+        for setting in always_iterable(args.set):
+            func = functools.partial(self._set_setting, setting)
+            yield plan.Step(('panel',), f'--set {setting}', func)
+        device_actions = dict(
+            on=self._switch_on,
+            off=self._switch_off,
+            lock=self._lock,
+            unlock=self._unlock,
+        )
+        yield from self._device_steps(device_actions)
+        automation_actions = dict(
+            activate=self._enable_automation,
+            deactivate=self._disable_automation,
+            trigger=self._trigger_automation,
+        )
+        for name, action in automation_actions.items():
+            for id in always_iterable(getattr(args, name)):
+                func = functools.partial(self._with_automation, action, id)
+                yield plan.Step(('automation', id), f'--{name} {id}', func)
+        yield from self._device_steps(dict(capture=self._trigger_image_capture))
+        for name, action in dict(
+            stream=self._start_kvs_stream, image=self._save_camera_image
+        ).items():
+            for keyval in always_iterable(getattr(args, name)):
+                id, _, loc = keyval.partition("=")
+                func = functools.partial(self._with_device, action, id, loc)
+                yield plan.Step(('device', id), f'--{name} {keyval}', func)
+
+    def _device_steps(self, actions):
+        for name, action in actions.items():
+            for id in always_iterable(getattr(self.args, name)):
+                func = functools.partial(self._with_device, action, id)
+                yield plan.Step(('device', id), f'--{name} {id}', func)
+
+    def _with_device(self, action, id, *args):
+        return action(self._get_device(id), *args)
+
+    def _with_automation(self, action, id):
+        return action(self._get_automation(id))
 
     def login(self):
         if not self.args.mfa:
@@ -315,17 +509,24 @@ class Dispatcher:  # pragma: no cover
 
     def change_system_mode(self):
         if not self.args.arm:
-            return
+            return True
         if self.client.get_alarm().set_mode(self.args.arm):
             log.info("Alarm mode changed to: %s", self.args.arm)
-        else:
-            log.warning("Failed to change alarm mode to: %s", self.args.arm)
+            return True
+        log.warning("Failed to change alarm mode to: %s", self.args.arm)
+        return False
 
     def set_setting(self):
-        for setting in always_iterable(self.args.set):
-            key, _, val = setting.partition("=")
-            if self.client.set_setting(key, val):
-                log.info("Setting %s changed to %s", key, val)
+        return all([
+            self._set_setting(setting) for setting in always_iterable(self.args.set)
+        ])
+
+    def _set_setting(self, setting):
+        key, _, val = setting.partition("=")
+        if self.client.set_setting(key, val):
+            log.info("Setting %s changed to %s", key, val)
+            return True
+        return False
 
     def _get_device(self, id):
         device = self.client.get_device(id)
@@ -334,60 +535,86 @@ class Dispatcher:  # pragma: no cover
         return device
 
     def switch_on(self):
-        for device_id in always_iterable(self.args.on):
+        return all([
             self._switch_on(self._get_device(device_id))
+            for device_id in always_iterable(self.args.on)
+        ])
 
     @staticmethod
     @pass_none
     def _switch_on(device):
-        if device.switch_on():
-            log.info("Switched on device with id: %s", device.id)
+        device.switch_on()
+        log.info("Switched on device with id: %s", device.id)
+        return True
 
     def switch_off(self):
-        for device_id in always_iterable(self.args.off):
+        return all([
             self._switch_off(self._get_device(device_id))
+            for device_id in always_iterable(self.args.off)
+        ])
 
     @staticmethod
     @pass_none
     def _switch_off(device):
-        if device.switch_off():
-            log.info("Switched off device with id: %s", device.id)
+        device.switch_off()
+        log.info("Switched off device with id: %s", device.id)
+        return True
 
     def lock(self):
-        for device_id in always_iterable(self.args.lock):
+        return all([
             self._lock(self._get_device(device_id))
+            for device_id in always_iterable(self.args.lock)
+        ])
 
     @staticmethod
     @pass_none
     def _lock(device):
-        if device.lock():
-            log.info("Locked device with id: %s", device.id)
+        device.lock()
+        log.info("Locked device with id: %s", device.id)
+        return True
 
     def unlock(self):
-        for device_id in always_iterable(self.args.unlock):
+        return all([
             self._unlock(self._get_device(device_id))
+            for device_id in always_iterable(self.args.unlock)
+        ])
 
     @staticmethod
     @pass_none
     def _unlock(device):
-        if device.unlock():
-            log.info("Unlocked device with id: %s", device.id)
+        device.unlock()
+        log.info("Unlocked device with id: %s", device.id)
+        return True
 
     def output_json(self):
         for device_id in always_iterable(self.args.json):
             self._output_json(self._get_device(device_id))
 
-    @staticmethod
-    @pass_none
-    def _output_json(device):
-        print(
-            json.dumps(
-                device._state,
-                sort_keys=True,
-                indent=4,
-                separators=(',', ': '),
-            )
-        )
+    def _output_json(self, device):
+        if device is None:
+            return
+        if self.lines:
+            self.lines(dict(device._state))
+            return
+        print(codec.dumps(dict(device._state), pretty=True))
+
+    def _print_device(self, device):
+        if self.lines:
+            self.lines(dict(device._state))
+            return
+        _device_print(device)
+
+    def _on_device(self, device):
+        if self.lines:
+            self.lines(dict(device._state))
+            return
+        _device_callback(device)
+
+    def _on_timeline(self, event):
+        if self.lines:
+            self.lines(event)
+            return
+        _timeline_callback(event)
 
     def print_all_automations(self):
         if not self.args.automations:
@@ -402,62 +629,78 @@ class Dispatcher:  # pragma: no cover
         return automation
 
     def enable_automation(self):
-        for automation_id in always_iterable(self.args.activate):
+        return all([
             self._enable_automation(self._get_automation(automation_id))
+            for automation_id in always_iterable(self.args.activate)
+        ])
 
     @staticmethod
     @pass_none
     def _enable_automation(automation):
-        if automation.enable(True):
-            log.info("Activated automation with id: %s", automation.id)
+        automation.enable(True)
+        log.info("Activated automation with id: %s", automation.id)
+        return True
 
     def disable_automation(self):
-        for automation_id in always_iterable(self.args.deactivate):
+        return all([
             self._disable_automation(self._get_automation(automation_id))
+            for automation_id in always_iterable(self.args.deactivate)
+        ])
 
     @staticmethod
     @pass_none
     def _disable_automation(automation):
-        if automation.enable(False):
-            log.info("Deactivated automation with id: %s", automation.id)
+        automation.enable(False)
+        log.info("Deactivated automation with id: %s", automation.id)
+        return True
 
     def trigger_automation(self):
-        for automation_id in always_iterable(self.args.trigger):
+        return all([
             self._trigger_automation(self._get_automation(automation_id))
+            for automation_id in always_iterable(self.args.trigger)
+        ])
 
     @staticmethod
     @pass_none
     def _trigger_automation(automation):
-        if automation.trigger():
-            log.info("Triggered automation with id: %s", automation.id)
+        automation.trigger()
+        log.info("Triggered automation with id: %s", automation.id)
+        return True
 
     def trigger_image_capture(self):
-        for device_id in always_iterable(self.args.capture):
+        return all([
             self._trigger_image_capture(self._get_device(device_id))
+            for device_id in always_iterable(self.args.capture)
+        ])
 
     @staticmethod
     @pass_none
     def _trigger_image_capture(device):
         if device.capture():
             log.info("Image requested from device with id: %s", device.id)
-        else:
-            log.warning("Failed to request image from device with id: %s", device.id)
+            return True
+        log.warning("Failed to request image from device with id: %s", device.id)
+        return False
 
     def start_kvs_stream(self):
-        for keyval in always_iterable(self.args.stream):
-            dev, _, loc = keyval.partition("=")
-            self._start_kvs_stream(self._get_device(dev), loc)
+        pairs = (keyval.partition("=") for keyval in always_iterable(self.args.stream))
+        return all([
+            self._start_kvs_stream(self._get_device(dev), loc) for dev, _, loc in pairs
+        ])
 
     @staticmethod
     @pass_none
     def _start_kvs_stream(device, path):
-        if not device.start_kvs_stream(path):
-            log.warning("Failed to start KVS stream for device with id: %s", device.id)
+        if device.start_kvs_stream(path):
+            return True
+        log.warning("Failed to start KVS stream for device with id: %s", device.id)
+        return False
 
     def save_camera_image(self):
-        for keyval in always_iterable(self.args.image):
-            dev, _, loc = keyval.partition("=")
-            self._save_camera_image(self._get_device(dev), loc)
+        pairs = (keyval.partition("=") for keyval in always_iterable(self.args.image))
+        return all([
+            self._save_camera_image(self._get_device(dev), loc) for dev, _, loc in pairs
+        ])
 
     @staticmethod
     @pass_none
@@ -465,14 +708,16 @@ class Dispatcher:  # pragma: no cover
         try:
             if device.refresh_image() and device.image_to_file(path):
                 log.info("Saved image to %s for device id: %s", path, device.id)
+                return True
         except jaraco.abode.Exception as exc:
             log.warning("Unable to save image: %s", exc)
+        return False
 
     def print_all_devices(self):
         if not self.args.devices:
             return
         for device in self.client.get_devices():
-            _device_print(device)
+            self._print_device(device)
 
     def print_specific_devices(self):
         for device_id in always_iterable(self.args.device):
@@ -480,10 +725,11 @@ class Dispatcher:  # pragma: no cover
             device and self._print_specific_device(device)
 
     def _print_specific_device(self, device):
-        _device_print(device)
+        self._print_device(device)
 
         # Register the specific devices if we decide to listen.
-        self.client.events.add_device_callback(device.id, _device_callback)
+        if self.args.listen:
+            self.client.events.add_device_callback(device.id, self._on_device)
 
     def start_device_change_listener(self):
         if not self.args.listen:
@@ -493,18 +739,130 @@ class Dispatcher:  # pragma: no cover
             log.info("Adding all devices to listener...")
 
             for device in self.client.get_devices():
-                self.client.events.add_device_callback(device.id, _device_callback)
+                self.client.events.add_device_callback(device.id, self._on_device)
 
-        self.client.events.add_timeline_callback(TIMELINE.ALL, _timeline_callback)
+        self.client.events.add_timeline_callback(TIMELINE.ALL, self._on_timeline)
 
         log.info("Listening for device and timeline updates...")
         self.client.events.start()
+        # listen until interrupted, or until the output can't be written
+        failed = self.lines.failed if self.lines else threading.Event()
+        with contextlib.suppress(KeyboardInterrupt):
+            while not failed.wait(1):
+                pass
+        self.client.events.stop()
+        log.info("Device update listening stopped.")
+
+
+class Daemon:
+    """
+    Run the commands of other invocations with a client kept logged in
+    and up to date through the event stream, returning their output.
+    """
+
+    def __init__(self, client, username):
+        self.client = client
+        self.username = username
+
+    @staticmethod
+    def eligible(args):
+        return not (args.command or args.listen or args.interact or args.mfa)
+
+    def __call__(self, message):
+        if message.get('username') not in (None, self.username):
+            return dict(refused=f"Daemon is serving {self.username}")
+        args = build_parser().parse_args(message['argv'])
+        if not self.eligible(args):
+            return dict(refused="Command not supported by the daemon")
+        _resolve_paths(args, message.get('cwd', ''))
+        stdout, stderr = io.StringIO(), io.StringIO()
+        capture = _capture_logs(stderr, _log_level(args))
+        status = 0
+        with capture, contextlib.redirect_stdout(stdout):
+            try:
+                status = Dispatcher(self.client, args).dispatch()
+            except jaraco.abode.Exception as exc:
+                log.error(exc)
+                status = 1
+            except Exception:
+                log.exception("Command failed")
+                status = 1
+        return dict(stdout=stdout.getvalue(), stderr=stderr.getvalue(), status=status)
+
+    def serve(self, path=None):
+        self.client.events.start()
+        server = daemon.Server(self, path)
+        log.info("Serving commands at %s", server.path)
         try:
-            while True:
-                time.sleep(1)
+            server.serve_forever()
         except KeyboardInterrupt:
+            log.info("Daemon stopped.")
+        finally:
+            server.server_close()
             self.client.events.stop()
-            log.info("Device update listening stopped.")
+
+
+def _resolve_paths(args, cwd):
+    """Resolve the paths of ``device_id=path`` arguments relative to ``cwd``."""
+    for name in ('stream', 'image'):
+        pairs = (
+            keyval.partition('=') for keyval in always_iterable(getattr(args, name))
+        )
+        resolved = [f'{dev}={os.path.join(cwd, loc)}' for dev, _, loc in pairs]
+        setattr(args, name, resolved or None)
+
+
+_capturing = contextvars.ContextVar('capturing', default=None)
+
+
+@contextlib.contextmanager
+def _capture_logs(stream, level):
+    """
+    Capture the records logged at the level in this context,
+    including by the threads of a plan run in it.
+    """
+    handler = logging.StreamHandler(stream)
+    handler.setFormatter(logging.Formatter(logging.BASIC_FORMAT))
+    handler.setLevel(level)
+    handler.addFilter(lambda record: _capturing.get() is handler)
+    token = _capturing.set(handler)
+    root = logging.getLogger()
+    orig_level = root.level
+    root.setLevel(min(orig_level, level))
+    root.addHandler(handler)
+    try:
+        yield
+    finally:
+        root.removeHandler(handler)
+        root.setLevel(orig_level)
+        _capturing.reset(token)
+
+
+def _log_level(args):
+    return logging.INFO + 10 * (args.quiet - args.debug)
+
+
+def _run_in_daemon(args, argv):
+    """
+    Run the command in a daemon, if one is serving and accepts it;
+    return its response. A command the daemon accepted is never run
+    again locally, even if it failed.
+    """
+    if not Daemon.eligible(args):
+        return None
+    message = dict(argv=argv, username=args.username, cwd=os.getcwd())
+    response = daemon.request(message)
+    if response is None:
+        return None
+    if 'refused' in response:
+        log.debug("Not using the daemon: %s", response['refused'])
+        return None
+    if 'error' in response:
+        log.error("Daemon failed to run the command: %s", response['error'])
+        return dict(status=1)
+    sys.stdout.write(response['stdout'])
+    sys.stderr.write(response['stderr'])
+    return response
 
 
 def _get_password(args):
@@ -514,6 +872,8 @@ def _get_password(args):
 
 
 def _get_or_set_password(username):
+    import keyring
+
     password = keyring.get_password(urls.BASE, username)
     if not password:
         password = getpass.getpass(f"Password for {username}: ")
@@ -522,11 +882,22 @@ def _get_or_set_password(username):
 
 
 def main():
-    """Execute command line helper."""
-    args = build_parser().parse_args()
-    _get_password(args)
+    """Execute command line helper, returning the exit status."""
+    argv = sys.argv[1:]
+    args = build_parser().parse_args(argv)
+
+    setup_logging(log_level=_log_level(args))
 
-    setup_logging(log_level=logging.INFO + 10 * (args.quiet - args.debug))
+    response = _run_in_daemon(args, argv)
+    if response is not None:
+        return response['status']
+
+    _get_password(args)
 
     with _log_errors_and_logout(_create_client_instance(args)) as client:
-        Dispatcher(client, args).dispatch()
+        if args.command == 'daemon':
+            Daemon(client, args.username).serve()
+            return
+        return Dispatcher(client, args).dispatch()
+    # an error was logged
+    return 1
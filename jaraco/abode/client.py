@@ -2,28 +2,34 @@
 An Abode alarm Python library.
 """
 
+import concurrent.futures
 import functools
 import logging
+import threading
+import time
 import uuid
 
 from more_itertools import consume
-from requests.exceptions import RequestException
-from requests_toolbelt import sessions
+from requests.exceptions import RequestException, Timeout
 
 import jaraco
 from jaraco.collections import Everything
 from jaraco.functools import retry
-from jaraco.itertools import always_iterable
 from jaraco.net.http import cookies
 
-from . import config, settings
+from . import bulk, codec, config, settings
+from ._itertools import always_iterable
 from .automation import Automation
+from .debug import ResponseBody
 from .devices import alarm as ALARM
 from .devices.base import Device, Unknown
-from .event_controller import EventController
-from .exceptions import AuthenticationException
+from .exceptions import AuthenticationException, TransientException
 from .helpers import errors as ERROR
 from .helpers import urls
+from .policy import Deadline, Metrics, RetryPolicy
+from .snapshot import Snapshot
+from .state import CompactState
+from .transport import Transport
 
 log = logging.getLogger(__name__)
 
@@ -37,47 +43,62 @@ def _cookies():
     return cookies.ShelvedCookieJar.create(config.paths.user_data)
 
 
-class Client:
-    """Client to an Abode system."""
+def _log_response(method, path, response, sensitive):
+    log.debug(
+        "%s %s (%s) Response: %s",
+        method.upper(),
+        path,
+        response.status_code,
+        ResponseBody(response, redact_all=sensitive),
+    )
+
+
+class BaseClient:
+    """
+    State common to the clients of an Abode system, independent
+    of the transport used to communicate with it.
+
+    Each request must complete within ``timeout`` seconds (including
+    any retries, per the ``retry_policy``). ``metrics`` counts the
+    requests made and their timeouts, retries, reauthentications
+    and hedges.
+
+    Credentials are renewed (by logging in again) when rejected or
+    ``refresh_margin`` seconds before they expire, and only one login
+    is in flight at a time; ``_generation`` counts the logins.
+
+    With ``compact``, device states are held in a
+    :class:`~jaraco.abode.state.CompactState`, using less memory for
+    systems with many devices at the cost of decoding the less
+    frequently read fields on each access.
+    """
+
+    refresh_margin = 60
 
     def __init__(
-        self,
-        username=None,
-        password=None,
-        auto_login=False,
-        get_devices=False,
-        get_automations=False,
+        self, username=None, password=None, timeout=30, retry_policy=None, compact=False
     ):
-        self._session = None
         self._token = None
+        self._oauth_token = None
+        self._expires = None
+        self._generation = 0
         self._panel = None
         self._user = None
         self._username = username
         self._password = password
 
-        self._event_controller = EventController(self)
-
         self._default_alarm_mode = 'away'
 
         self._devices = None
 
         self._automations = None
 
-        self._session = sessions.BaseUrlSession(urls.BASE)
-        self._session.cookies = _cookies()
-
-        if auto_login:
-            self.login()
-
-        if get_devices:
-            self.get_devices()
-
-        if get_automations:
-            self.get_automations()
-
-    def login(self, username=None, password=None, mfa_code=None):
-        """Explicit Abode login."""
+        self.timeout = timeout
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.metrics = Metrics()
+        self.compact = compact
 
+    def _login_data(self, username, password, mfa_code, uuid_):
         self._token = None
 
         username = username or self._username
@@ -92,17 +113,17 @@ class Client:
         login_data = {
             'id': username,
             'password': password,
-            'uuid': self._session.cookies.get('uuid') or str(uuid.uuid1()),
+            'uuid': uuid_ or str(uuid.uuid1()),
         }
 
         if mfa_code is not None:
             login_data['mfa_code'] = mfa_code
             login_data['remember_me'] = 1
 
-        response = self._session.post(urls.LOGIN, json=login_data)
-        AuthenticationException.raise_for(response)
-        response_object = response.json()
+        return login_data
 
+    @staticmethod
+    def _check_mfa(response_object):
         # Check for multi-factor authentication
         if 'mfa_type' in response_object:
             if response_object['mfa_type'] == "google_authenticator":
@@ -110,88 +131,100 @@ class Client:
 
             raise AuthenticationException(ERROR.UNKNOWN_MFA_TYPE)
 
-        oauth_response = self._session.get(urls.OAUTH_TOKEN)
-        AuthenticationException.raise_for(oauth_response)
-        oauth_response_object = oauth_response.json()
-
-        log.debug("Login URL: %s", urls.LOGIN)
-        log.debug("Login Response: %s", response.text)
-
+    def _logged_in(self, response_object, oauth_response_object):
         self._token = response_object['token']
-        self._panel = response_object['panel']
+        self._update_panel(response_object['panel'])
         self._user = response_object['user']
         self._oauth_token = oauth_response_object['access_token']
+        self._expires = self._expiry(oauth_response_object.get('expires_in'))
+        self._generation += 1
 
         log.info("Login successful")
 
-    def logout(self):
-        """Explicit Abode logout."""
-        if not self._token:
+    def _update_panel(self, panel):
+        """Update the panel in place, as the alarm state is a view on it."""
+        if self._panel is None:
+            self._panel = panel
             return
+        self._panel.update(panel)
+        for key in self._panel.keys() - panel.keys():
+            del self._panel[key]
 
-        header_data = {'ABODE-API-KEY': self._token}
+    def _expiry(self, lifetime):
+        """When to renew credentials valid for ``lifetime`` seconds."""
+        if lifetime is None:
+            return None
+        return time.monotonic() + lifetime - min(self.refresh_margin, lifetime / 2)
 
-        self._session = sessions.BaseUrlSession(urls.BASE)
+    def _needs_login(self):
+        expired = self._expires is not None and time.monotonic() >= self._expires
+        return not self._token or expired
+
+    def _reset(self):
         self._token = None
+        self._expires = None
         self._panel = None
         self._user = None
         self._devices = None
         self._automations = None
 
-        try:
-            response = self._session.post(urls.LOGOUT, headers=header_data)
-        except OSError as exc:
-            log.warning("Caught exception during logout: %s", exc)
-            return
-
-        AuthenticationException.raise_for(response)
-
-        log.debug("Logout URL: %s", urls.LOGOUT)
-        log.debug("Logout Response: %s", response.text)
-
-        log.info("Logout successful")
-
-    def refresh(self):
-        """Do a full refresh of all devices and automations."""
-        self.get_devices(refresh=True)
-        self.get_automations(refresh=True)
-
-    def get_devices(self, refresh=False, generic_type=None):
-        """Get all devices from Abode."""
-        if refresh or self._devices is None:
-            self._load_devices()
+    def _auth_headers(self, headers):
+        headers = dict(headers or {})
+        headers['Authorization'] = 'Bearer ' + self._oauth_token
+        headers['ABODE-API-KEY'] = self._token
+        return headers
+
+    @staticmethod
+    def _check_response(response):
+        """
+        Return the response if successful, otherwise raise an
+        exception classifying the failure.
+        """
+        status = response.status_code
+        if status < 400:
+            return response
+        if status in (401, 403):
+            raise AuthenticationException(ERROR.REQUEST)
+        if status == 429 or 500 <= status < 600:
+            raise TransientException(ERROR.REQUEST)
+        raise jaraco.abode.Exception(ERROR.REQUEST)
 
+    def _filter_devices(self, generic_type):
         spec_types = (
             Everything() if generic_type is None else set(always_iterable(generic_type))
         )
 
+        # copy first, as the revalidation may be adding devices
         return [
             device
-            for device in self._devices.values()
+            for device in list(self._devices.values())
             if device.generic_type in spec_types
         ]
 
-    def _load_devices(self):
-        if self._devices is None:
-            self._devices = {}
+    def _load_device(self, doc):
+        self._reuse_device(doc) or self._create_new_device(doc)
 
-        log.info("Updating all devices...")
-        response = self.send_request("get", urls.DEVICES)
-        devices = always_iterable(response.json())
+    def _reuse_device(self, doc):
+        device = self._devices.get(doc['id'])
 
-        log.debug("Get Devices URL (get): %s", urls.AUTOMATION)
-        log.debug("Get Devices Response: %s", response.text)
+        if not device:
+            return
 
-        consume(map(self._load_device, devices))
+        device.update(doc)
+        return device
 
-        # We will be treating the Abode panel itself as an armable device.
-        panel_response = self.send_request("get", urls.PANEL)
-        panel_json = panel_response.json()
+    def _create_new_device(self, doc):
+        device = Device.new(CompactState(doc) if self.compact else doc, self)
 
-        self._panel.update(panel_json)
+        if isinstance(device, Unknown):
+            log.debug("Skipping unknown device: %s", doc)
+            return
 
-        log.debug("Get Mode Panel URL (get): %s", urls.AUTOMATION)
-        log.debug("Get Mode Panel Response: %s", response.text)
+        self._devices[device.id] = device
+
+    def _load_panel(self, panel_json):
+        # We will be treating the Abode panel itself as an armable device.
+        self._panel.update(panel_json)
 
         alarm_device = self._devices.get(ALARM.id(1))
 
@@ -201,26 +234,215 @@ class Client:
             alarm_device = ALARM.create_alarm(self._panel, self)
             self._devices[alarm_device.id] = alarm_device
 
-    def _load_device(self, doc):
-        self._reuse_device(doc) or self._create_new_device(doc)
+    def _load_automations(self, states):
+        if self._automations is None:
+            # Set up the device libraries
+            self._automations = {}
 
-    def _reuse_device(self, doc):
-        device = self._devices.get(doc['id'])
+        for state in always_iterable(states):
+            # Attempt to reuse an existing automation object
+            automation = self._automations.get(str(state['id']))
 
-        if not device:
+            # No existing automation, create a new one
+            if automation:
+                automation.update(state)
+            else:
+                automation = Automation(state, self)
+                self._automations[automation.id] = automation
+
+    def set_default_mode(self, default_mode):
+        """Set the default mode when alarms are turned 'on'."""
+        if default_mode.lower() not in ('away', 'home'):
+            raise jaraco.abode.Exception(ERROR.INVALID_DEFAULT_ALARM_MODE)
+
+        self._default_alarm_mode = default_mode.lower()
+
+    @property
+    def default_mode(self):
+        """Get the default mode."""
+        return self._default_alarm_mode
+
+
+class Client(BaseClient):
+    """
+    Client to an Abode system.
+
+    With ``snapshot_max_age`` (in seconds), the loaded devices and
+    automations are saved to disk, and a client started within that
+    many seconds of the last save serves them immediately, while
+    revalidating them in the background (see :attr:`revalidated`
+    and :attr:`data_age`).
+    """
+
+    def __init__(
+        self,
+        username=None,
+        password=None,
+        auto_login=False,
+        get_devices=False,
+        get_automations=False,
+        transport=None,
+        timeout=30,
+        retry_policy=None,
+        snapshot_max_age=None,
+        compact=False,
+    ):
+        super().__init__(username, password, timeout, retry_policy, compact)
+
+        self._login_lock = threading.Lock()
+
+        self._transport = transport or Transport()
+        self._session = self._transport.api_session()
+        self._session.cookies = _cookies()
+
+        self.snapshot_max_age = snapshot_max_age
+        self.snapshot = None
+        self.revalidated = threading.Event()
+        self._fetched = None
+        self._restore()
+
+        if auto_login:
+            # unless the revalidation already logged in
+            self._authorize(None)
+
+        if get_devices:
+            self.get_devices()
+
+        if get_automations:
+            self.get_automations()
+
+    def login(self, username=None, password=None, mfa_code=None):
+        """Explicit Abode login."""
+        with self._login_lock:
+            self._login(username, password, mfa_code)
+
+    def _login(self, username=None, password=None, mfa_code=None):
+        login_data = self._login_data(
+            username, password, mfa_code, self._session.cookies.get('uuid')
+        )
+
+        response = self._session.post(urls.LOGIN, json=login_data, timeout=self.timeout)
+        AuthenticationException.raise_for(response)
+        response_object = codec.loads(response.content)
+
+        self._check_mfa(response_object)
+
+        oauth_response = self._session.get(urls.OAUTH_TOKEN, timeout=self.timeout)
+        AuthenticationException.raise_for(oauth_response)
+        oauth_response_object = codec.loads(oauth_response.content)
+
+        log.debug("Login URL: %s", urls.LOGIN)
+        log.debug("Login Response: %s", ResponseBody(response))
+
+        self._logged_in(response_object, oauth_response_object)
+
+    def logout(self):
+        """Explicit Abode logout."""
+        self._shutdown_hedging()
+
+        if not self._token:
             return
 
-        device.update(doc)
-        return device
+        with self._login_lock:
+            header_data = {'ABODE-API-KEY': self._token}
 
-    def _create_new_device(self, doc):
-        device = Device.new(doc, self)
+            self._session = self._transport.api_session()
+            self._reset()
 
-        if isinstance(device, Unknown):
-            log.debug("Skipping unknown device: %s", doc)
+        try:
+            response = self._session.post(
+                urls.LOGOUT, headers=header_data, timeout=self.timeout
+            )
+        except OSError as exc:
+            log.warning("Caught exception during logout: %s", exc)
             return
 
-        self._devices[device.id] = device
+        AuthenticationException.raise_for(response)
+
+        log.debug("Logout URL: %s", urls.LOGOUT)
+        log.debug("Logout Response: %s", ResponseBody(response))
+
+        log.info("Logout successful")
+
+    def _restore(self):
+        """Serve the saved snapshot, if fresh enough, and revalidate it."""
+        snapshot = self.snapshot_max_age is not None and Snapshot.load(
+            max_age=self.snapshot_max_age, username=self._username
+        )
+        if not snapshot:
+            self.revalidated.set()
+            return
+
+        self._panel = snapshot.panel
+        if snapshot.devices is not None:
+            self._devices = {}
+            consume(map(self._load_device, snapshot.devices))
+            self._load_panel(snapshot.panel)
+        if snapshot.automations is not None:
+            self._load_automations(snapshot.automations)
+        self._fetched = snapshot.saved
+        self.snapshot = snapshot
+        self._start_revalidation()
+
+    def _start_revalidation(self):
+        threading.Thread(
+            target=self._revalidate, name='abode-revalidate', daemon=True
+        ).start()
+
+    def _revalidate(self):
+        try:
+            self.refresh()
+        except Exception as exc:
+            log.warning("Unable to revalidate snapshot: %s", exc)
+        finally:
+            self.revalidated.set()
+
+    def _save_snapshot(self):
+        if self.snapshot_max_age is None:
+            return
+        try:
+            Snapshot.capture(self).save()
+        except OSError as exc:
+            log.warning("Unable to save snapshot: %s", exc)
+
+    @property
+    def data_age(self):
+        """Seconds since the devices were fetched (``None`` if never)."""
+        return None if self._fetched is None else time.time() - self._fetched
+
+    def refresh(self):
+        """Do a full refresh of all devices and automations."""
+        self.get_devices(refresh=True)
+        self.get_automations(refresh=True)
+
+    def get_devices(self, refresh=False, generic_type=None):
+        """Get all devices from Abode."""
+        if refresh or self._devices is None:
+            self._load_devices()
+
+        return self._filter_devices(generic_type)
+
+    def _load_devices(self):
+        deadline = Deadline(self.timeout)
+
+        self._fetch_devices(deadline)
+
+        panel_response = self.send_request("get", urls.PANEL, timeout=deadline)
+
+        self._load_panel(codec.loads(panel_response.content))
+        self._fetched = time.time()
+        self._save_snapshot()
+
+    def _fetch_devices(self, timeout=None):
+        """Load all devices (but not the panel) in a single request."""
+        if self._devices is None:
+            self._devices = {}
+
+        log.info("Updating all devices...")
+        response = self.send_request("get", urls.DEVICES, timeout=timeout)
+        devices = always_iterable(codec.loads(response.content))
+
+        consume(map(self._load_device, devices))
 
     def get_device(self, device_id, refresh=False):
         """Get a single device."""
@@ -243,25 +465,11 @@ class Client:
         return list(self._automations.values())
 
     def _update_all(self):
-        if self._automations is None:
-            # Set up the device libraries
-            self._automations = {}
-
         log.info("Updating all automations...")
         resp = self.send_request("get", urls.AUTOMATION)
-        log.debug("Get Automations URL (get): %s", urls.AUTOMATION)
-        log.debug("Get Automations Response: %s", resp.text)
-
-        for state in always_iterable(resp.json()):
-            # Attempt to reuse an existing automation object
-            automation = self._automations.get(str(state['id']))
 
-            # No existing automation, create a new one
-            if automation:
-                automation.update(state)
-            else:
-                automation = Automation(state, self)
-                self._automations[automation.id] = automation
+        self._load_automations(codec.loads(resp.content))
+        self._save_snapshot()
 
     def get_automation(self, automation_id, refresh=False):
         """Get a single automation."""
@@ -280,57 +488,128 @@ class Client:
         """Shortcut method to get the alarm device."""
         return self.get_device(ALARM.id(area), refresh)
 
-    def set_default_mode(self, default_mode):
-        """Set the default mode when alarms are turned 'on'."""
-        if default_mode.lower() not in ('away', 'home'):
-            raise jaraco.abode.Exception(ERROR.INVALID_DEFAULT_ALARM_MODE)
+    def execute_many(self, commands, max_workers=8):
+        """
+        Invoke many device commands concurrently.
 
-        self._default_alarm_mode = default_mode.lower()
+        Each command is a tuple of (device or device id, action, value),
+        where the action is the name of a device method (e.g. 'switch_on'
+        or 'set_level') and the value (if not None) is passed to it.
+
+        Return a :class:`bulk.Result` for each command, in order,
+        capturing its return value or exception.
+        """
+        return bulk.execute(self, commands, max_workers)
 
     def set_setting(self, name, value, area='1'):
         """Set an abode system setting to a given value."""
         setting = settings.Setting.load(name.lower(), value, area)
         return self.send_request(method="put", path=setting.path, data=setting.data)
 
-    def send_request(self, method, path, headers=None, data=None):
-        """Send requests to Abode."""
-        attempt = functools.partial(self._send_request, method, path, headers, data)
-        return jaraco.functools.retry_call(
-            attempt,
-            retries=1,
-            cleanup=self.login,
-            trap=(jaraco.abode.Exception),
+    def send_request(
+        self, method, path, headers=None, data=None, sensitive=False, timeout=None
+    ):
+        """
+        Send requests to Abode.
+
+        The request (including retries) must complete within ``timeout``
+        seconds (default :attr:`timeout`), or by the :class:`Deadline`
+        shared with other requests. Failures are retried according
+        to the :attr:`retry_policy`.
+
+        The response is logged at debug level, its body omitted
+        if ``sensitive``.
+        """
+        deadline = Deadline.of(self.timeout if timeout is None else timeout)
+        generation = None
+
+        def attempt():
+            nonlocal generation
+            generation, auth_headers = self._authorize(headers)
+            return self._send_request(
+                method, path, auth_headers, data, sensitive, deadline
+            )
+
+        def reauthenticate():
+            self._reauthenticate(generation)
+
+        return self.retry_policy.call(attempt, reauthenticate, deadline, self.metrics)
+
+    def _authorize(self, headers):
+        """
+        Log in if the credentials are missing or about to expire,
+        returning the credentials generation and the request headers
+        bearing them.
+        """
+        with self._login_lock:
+            if self._needs_login():
+                self._login()
+            return self._generation, self._auth_headers(headers)
+
+    def _reauthenticate(self, generation):
+        """
+        Log in again after credentials of ``generation`` were rejected,
+        unless another caller already did.
+        """
+        with self._login_lock:
+            if generation == self._generation:
+                self._login()
+
+    def _send_request(self, method, path, headers, data, sensitive, deadline):
+        request = functools.partial(
+            self._request, method, path, headers, data, deadline.check()
         )
 
-    def _send_request(self, method, path, headers, data):
-        if not self._token:
-            self.login()
+        if self.retry_policy.hedges(method):
+            response = self.retry_policy.hedge(
+                request, self._hedge_executor, self.metrics
+            )
+        else:
+            response = request()
 
-        if not headers:
-            headers = {}
+        _log_response(method, path, response, sensitive)
 
-        headers['Authorization'] = 'Bearer ' + self._oauth_token
-        headers['ABODE-API-KEY'] = self._token
+        return self._check_response(response)
 
+    def _request(self, method, path, headers, data, timeout):
+        self.metrics.count('requests')
         try:
-            response = getattr(self._session, method)(path, headers=headers, json=data)
-
-            if response and response.status_code < 400:
-                return response
-        except RequestException:
+            return getattr(self._session, method)(
+                path, headers=headers, json=data, timeout=timeout
+            )
+        except Timeout as exc:
+            self.metrics.count('timeouts')
+            log.info("Abode request timed out...")
+            raise TransientException(ERROR.REQUEST_TIMEOUT) from exc
+        except RequestException as exc:
             log.info("Abode connection reset...")
+            raise TransientException(ERROR.REQUEST) from exc
 
-        raise jaraco.abode.Exception(ERROR.REQUEST)
+    hedge_workers = 8
+    """The most requests (including hedges) in flight at once when hedging."""
 
-    @property
-    def default_mode(self):
-        """Get the default mode."""
-        return self._default_alarm_mode
+    @functools.cached_property
+    def _hedge_executor(self):
+        return concurrent.futures.ThreadPoolExecutor(
+            max_workers=self.hedge_workers, thread_name_prefix='abode-hedge'
+        )
+
+    def _shutdown_hedging(self):
+        executor = vars(self).pop('_hedge_executor', None)
+        if executor is not None:
+            executor.shutdown(wait=False)
 
     @property
+    def transport(self):
+        """Get the HTTP transport (and its connection pool statistics)."""
+        return self._transport
+
+    @functools.cached_property
     def events(self):
-        """Get the event controller."""
-        return self._event_controller
+        """Get the event controller (importing its dependencies on first use)."""
+        from .event_controller import EventController
+
+        return EventController(self)
 
     @property
     def uuid(self):
@@ -0,0 +1,103 @@
+"""Coalesce device update events into fewer refreshes."""
+
+import collections
+import logging
+import threading
+
+from .devices.alarm import Alarm
+
+log = logging.getLogger(__name__)
+
+
+class Coalescer:
+    """
+    Collect device update events, refreshing each dirty device at most
+    once per ``window`` seconds and refreshing all devices in a single
+    request when at least ``batch_threshold`` devices are dirty.
+
+    ``notify`` is invoked with each refreshed device.
+
+    ``stats`` counts the ``events`` received, the ``requests`` made
+    and the requests ``saved`` relative to a refresh per event.
+    """
+
+    def __init__(self, client, notify, window=1.0, batch_threshold=3):
+        self._client = client
+        self._notify = notify
+        self.window = window
+        self.batch_threshold = batch_threshold
+        self.stats = collections.Counter()
+
+        self._lock = threading.Lock()
+        self._dirty = {}
+        self._pending = 0
+        self._timer = None
+
+    def mark(self, device_id):
+        """Mark the device as needing a refresh."""
+        with self._lock:
+            self.stats['events'] += 1
+            self._pending += 1
+            self._dirty[device_id] = None
+            if self._timer is None:
+                self._timer = threading.Timer(self.window, self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+
+    def cancel(self):
+        """Discard any pending refreshes."""
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+            self._timer = None
+            self._dirty.clear()
+            self._pending = 0
+
+    def flush(self):
+        """Refresh the dirty devices now."""
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+            self._timer = None
+            dirty = list(self._dirty)
+            events = self._pending
+            self._dirty.clear()
+            self._pending = 0
+
+        if not dirty:
+            return
+
+        try:
+            requests = self._refresh(dirty)
+        except Exception as exc:
+            log.warning("Captured exception during device refresh: %s", exc)
+            return
+
+        self.stats['requests'] += requests
+        self.stats['saved'] += events - requests
+
+        for device_id in dirty:
+            device = self._client.get_device(device_id)
+            if not device:
+                log.debug("Got device update for unknown device: %s", device_id)
+                continue
+            self._notify(device)
+
+    def _refresh(self, device_ids):
+        """Refresh the devices, returning the number of requests made."""
+        devices = self._client._devices or {}
+        # alarms reflect the panel, which isn't among all devices
+        alarms = [id for id in device_ids if isinstance(devices.get(id), Alarm)]
+        others = [id for id in device_ids if id not in alarms]
+
+        for alarm_id in alarms:
+            self._client.get_device(alarm_id, refresh=True)
+
+        if len(others) >= self.batch_threshold:
+            log.debug("Refreshing %d devices in one request", len(others))
+            self._client._fetch_devices()
+            return len(alarms) + 1
+
+        for device_id in others:
+            self._client.get_device(device_id, refresh=True)
+        return len(device_ids)
@@ -0,0 +1,107 @@
+"""
+JSON encoding and decoding, using `orjson <https://pypi.org/project/orjson>`_
+or `ujson <https://pypi.org/project/ujson>`_ when installed and falling
+back to the standard library.
+
+Refer to ``codec.loads`` and ``codec.dumps`` through the module, so
+that :func:`use` takes effect.
+
+>>> loads(b'{"id": 1}')
+{'id': 1}
+>>> dumps({'b': 1, 'a': [1, 2]})
+'{"b":1,"a":[1,2]}'
+"""
+
+import contextlib
+import json
+from typing import Callable, NamedTuple
+
+
+class Codec(NamedTuple):
+    name: str
+    loads: Callable
+    dumps: Callable
+
+
+def _pretty(obj):
+    # the same for every codec, as orjson only indents by 2
+    return json.dumps(obj, indent=4, sort_keys=True, separators=(',', ': '))
+
+
+def _orjson():
+    import orjson
+
+    def dumps(obj, pretty=False):
+        if pretty:
+            return _pretty(obj)
+        return orjson.dumps(obj).decode('utf-8')
+
+    return Codec('orjson', orjson.loads, dumps)
+
+
+def _ujson():
+    import ujson
+
+    def dumps(obj, pretty=False):
+        if pretty:
+            return _pretty(obj)
+        return ujson.dumps(obj, ensure_ascii=False, escape_forward_slashes=False)
+
+    return Codec('ujson', ujson.loads, dumps)
+
+
+def _json():
+    def dumps(obj, pretty=False):
+        if pretty:
+            return _pretty(obj)
+        return json.dumps(obj, separators=(',', ':'))
+
+    return Codec('json', json.loads, dumps)
+
+
+codecs = dict(orjson=_orjson, ujson=_ujson, json=_json)
+"""Codecs by name, in order of preference."""
+
+
+def select(*names):
+    """
+    The first of the named codecs (default: all, in order of
+    preference) whose library is installed.
+
+    >>> select('json').name
+    'json'
+    """
+    for name in names or codecs:
+        with contextlib.suppress(ImportError):
+            return codecs[name]()
+    raise ImportError(f"No JSON library available among {names}")
+
+
+def use(*names):
+    """
+    Use the first installed of the named codecs.
+
+    >>> previous = name
+    >>> use('json')
+    'json'
+    >>> use(previous) == previous
+    True
+    """
+    global name, loads, dumps
+    name, loads, dumps = select(*names)
+    return name
+
+
+name: str
+"""The name of the codec in use."""
+
+loads: Callable
+"""Decode a JSON document from ``str`` or ``bytes``."""
+
+dumps: Callable
+"""
+Encode an object as a compact JSON string, or (if ``pretty``),
+indented by 4 and with sorted keys, the same whichever the codec.
+"""
+
+use()
@@ -0,0 +1,94 @@
+"""
+Serve requests from a long-running process over a Unix-domain socket,
+one JSON document per line.
+"""
+
+import contextlib
+import logging
+import os
+import socket
+import socketserver
+
+from . import codec, config
+
+log = logging.getLogger(__name__)
+
+filename = 'abode.sock'
+
+
+def default_path():
+    return config.paths.user_data / filename
+
+
+def _encode(doc):
+    return codec.dumps(doc).encode('utf-8') + b'\n'
+
+
+def request(message, path=None, timeout=60):
+    """
+    Send the message to the daemon listening at ``path`` and return
+    its response, or None if no daemon is listening.
+
+    Once the daemon has accepted the connection, the message may
+    already have been acted upon, so a missing or invalid reply
+    (including a timeout) is returned as an ``error`` response.
+
+    >>> request(dict(argv=[]), path=getfixture('tmp_path') / 'missing.sock')
+    """
+    if not hasattr(socket, 'AF_UNIX'):
+        return None
+    path = path or default_path()
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.settimeout(timeout)
+        try:
+            sock.connect(os.fspath(path))
+        except OSError as exc:
+            log.debug("No daemon at %s: %s", path, exc)
+            return None
+        try:
+            sock.sendall(_encode(message))
+            with sock.makefile('rb') as file:
+                return codec.loads(file.readline())
+        except (OSError, ValueError) as exc:
+            return dict(error=f"No valid response from the daemon: {exc!r}")
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    def handle(self):
+        line = self.rfile.readline()
+        try:
+            message = codec.loads(line)
+            response = {} if 'ping' in message else self.server.respond(message)
+        except (Exception, SystemExit) as exc:
+            log.exception("Failed to handle request")
+            response = dict(error=str(exc))
+        self.wfile.write(_encode(response))
+
+
+class Server(socketserver.UnixStreamServer):
+    """
+    Serve ``respond(message) -> response`` at ``path``, one request at
+    a time. The socket is accessible only to the current user and is
+    removed when the server is closed.
+    """
+
+    def __init__(self, respond, path=None):
+        self.respond = respond
+        self.path = path or default_path()
+        self._remove_stale()
+        umask = os.umask(0o177)
+        try:
+            super().__init__(os.fspath(self.path), _Handler)
+        finally:
+            os.umask(umask)
+
+    def _remove_stale(self):
+        if request(dict(ping=True), self.path, timeout=1) is not None:
+            raise RuntimeError(f"A daemon is already listening at {self.path}")
+        with contextlib.suppress(FileNotFoundError):
+            os.remove(self.path)
+
+    def server_close(self):
+        super().server_close()
+        with contextlib.suppress(FileNotFoundError):
+            os.remove(self.path)
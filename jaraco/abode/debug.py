@@ -0,0 +1,72 @@
+"""Lazily rendered values for debug logging."""
+
+import json
+
+
+class ResponseBody:
+    """
+    The body of a response, decoded, redacted and truncated only
+    when rendered (i.e. when a log message is actually emitted).
+
+    >>> import types
+    >>> resp = types.SimpleNamespace(
+    ...     text='{"token": "secret", "user": {"password": "hunter2", "id": 1}}',
+    ... )
+    >>> print(ResponseBody(resp))
+    {"token": "<redacted>", "user": {"password": "<redacted>", "id": 1}}
+    >>> resp = types.SimpleNamespace(text='x' * 10)
+    >>> print(ResponseBody(resp, limit=4))
+    xxxx... (10 characters)
+    >>> print(ResponseBody(resp, redact_all=True))
+    <redacted>
+    """
+
+    limit = 4096
+    """Maximum number of characters to render (``None`` for unlimited)."""
+
+    redacted_keys = frozenset({
+        'token',
+        'access_token',
+        'refresh_token',
+        'password',
+        'secretAccessKey',
+        'sessionToken',
+    })
+    """Keys in JSON bodies whose values are never rendered."""
+
+    placeholder = '<redacted>'
+
+    def __init__(self, response, limit=None, redact_all=False):
+        self.response = response
+        if limit is not None:
+            self.limit = limit
+        self.redact_all = redact_all
+
+    def __str__(self):
+        if self.redact_all:
+            return self.placeholder
+        return self._truncate(self._redact(self.response.text))
+
+    def _redact(self, text):
+        try:
+            doc = json.loads(text)
+        except ValueError:
+            return text
+        return json.dumps(self._redact_doc(doc))
+
+    def _redact_doc(self, doc):
+        if isinstance(doc, dict):
+            return {
+                key: self.placeholder
+                if key in self.redacted_keys
+                else self._redact_doc(value)
+                for key, value in doc.items()
+            }
+        if isinstance(doc, list):
+            return list(map(self._redact_doc, doc))
+        return doc
+
+    def _truncate(self, text):
+        if self.limit is None or len(text) <= self.limit:
+            return text
+        return f'{text[: self.limit]}... ({len(text)} characters)'
@@ -1,10 +1,12 @@
 """Abode alarm device."""
 
-import copy
+import collections
 import logging
 
 import jaraco.abode
+from jaraco.collections import Projection
 
+from .. import codec
 from ..helpers import errors as ERROR
 from ..helpers import urls
 from .switch import Switch
@@ -17,13 +19,27 @@ def id(area):
 
 
 def state_from_panel(panel_state, area='1'):
-    """Adapt panel state to alarm state."""
-    alarm_state = copy.deepcopy(panel_state)
-    alarm_state['name'] = 'Abode Alarm'
-    alarm_state['id'] = id(area)
-    alarm_state['type'] = 'Alarm'
-    alarm_state['type_tag'] = 'device_type.alarm'
-    return alarm_state
+    """
+    Adapt panel state to alarm state.
+
+    The alarm state is a view over the panel state (not a copy),
+    so reflects changes to the panel.
+
+    >>> panel = dict(mode=dict(area_1='standby'), name='Panel')
+    >>> state = state_from_panel(panel)
+    >>> state['name'], state['id'], state['mode']
+    ('Abode Alarm', 'area_1', {'area_1': 'standby'})
+    >>> panel['mode']['area_1'] = 'away'
+    >>> state['mode']
+    {'area_1': 'away'}
+    """
+    overlay = dict(
+        name='Abode Alarm',
+        id=id(area),
+        type='Alarm',
+        type_tag='device_type.alarm',
+    )
+    return collections.ChainMap(overlay, panel_state)
 
 
 def create_alarm(panel_json, abode, area='1'):
@@ -36,6 +52,7 @@ class Alarm(Switch):
 
     tags = ('alarm',)
     all_modes = 'away', 'standby', 'home'
+    actions = {}
 
     def __init__(self, json_obj, abode, area='1'):
         """Set up Abode alarm device."""
@@ -44,21 +61,22 @@ class Alarm(Switch):
 
     def set_mode(self, mode):
         """Set Abode alarm mode."""
+        mode = self._validate_mode(mode)
+
+        response = self._client.send_request("put", urls.panel_mode(self._area, mode))
+
+        return self._check_mode(codec.loads(response.content), mode)
+
+    def _validate_mode(self, mode):
         if not mode:
             raise jaraco.abode.Exception(ERROR.MISSING_ALARM_MODE)
 
         if mode.lower() not in self.all_modes:
             raise jaraco.abode.Exception(ERROR.INVALID_ALARM_MODE)
 
-        mode = mode.lower()
-
-        response = self._client.send_request("put", urls.panel_mode(self._area, mode))
-
-        log.debug("Set Alarm Home URL (put): %s", urls.panel_mode(self._area, mode))
-        log.debug("Set Alarm Home Response: %s", response.text)
-
-        response_object = response.json()
+        return mode.lower()
 
+    def _check_mode(self, response_object, mode):
         if response_object['area'] != self._area:
             raise jaraco.abode.Exception(ERROR.SET_MODE_AREA)
 
@@ -93,14 +111,27 @@ class Alarm(Switch):
 
     def refresh(self, url=urls.PANEL):
         """Refresh the alarm device."""
-        state = super().refresh(url)
+        return super().refresh(url)
+
+    def _refresh_path(self, path=None):
+        return super()._refresh_path(path or urls.PANEL)
+
+    def _refreshed(self, state):
+        state = super()._refreshed(state)
 
         self._client._panel.update(state)
 
         return state
 
     def update(self, state):
-        super().update(state_from_panel(state, area=self._area))
+        """
+        Update the panel state underlying the alarm from a new panel
+        state, in place.
+        """
+        panel = self._state.maps[-1]
+        if state is panel:
+            return
+        panel.update(Projection(panel, state))
 
     @property
     def is_on(self):
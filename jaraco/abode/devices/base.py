@@ -1,17 +1,22 @@
 import logging
+import types
 import warnings
-from typing import Tuple
+from typing import ClassVar, Dict, Mapping, Tuple
 
 import jaraco.abode
 from jaraco.classes.ancestry import iter_subclasses
 
+from .. import codec
 from ..helpers import errors as ERROR
 from ..helpers import urls
 from ..state import Stateful
 from . import pkg
+from . import status as STATUS
 
 log = logging.getLogger(__name__)
 
+_empty = types.MappingProxyType({})
+
 
 class Device(Stateful):
     """Class to represent each Abode device."""
@@ -22,9 +27,24 @@ class Device(Stateful):
     Each Device subclass declares the tags that it services (with the
     "device_type." prefix omitted).
     """
+    actions: Mapping[str, STATUS.Numeric] = {}
+    """
+    Actions supported by the device that simply change its status,
+    mapped to the resulting status.
+    """
     _desc_t = '{name} (ID: {id}, UUID: {uuid}) - {type} - {status}'
     _url_t = urls.DEVICE
 
+    _lookups: ClassVar[Dict[type, Dict[str, type]]] = {}
+    """
+    Type tag to class lookups by resolving class, invalidated
+    whenever a new subclass is defined.
+    """
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        Device._lookups.clear()
+
     @property
     def _control_url(self):
         if not self._state['control_url']:
@@ -33,16 +53,19 @@ class Device(Stateful):
 
     def set_status(self, status) -> None:
         """Set device status."""
-        response = self._client.send_request(
+        response = self._client.send_request(**self._status_request(status))
+        response_object = codec.loads(response.content)
+
+        self._check_status(response_object, status)
+
+    def _status_request(self, status):
+        return dict(
             method="put",
             path=self._control_url,
             data={'status': str(status)},
         )
-        response_object = response.json()
-
-        log.debug("Set Status URL (put): %s", self._control_url)
-        log.debug("Set Status Response: %s", response.text)
 
+    def _check_status(self, response_object, status):
         if response_object['id'] != self.id:
             raise jaraco.abode.Exception(ERROR.SET_STATUS_DEV_ID)
 
@@ -57,16 +80,19 @@ class Device(Stateful):
 
     def set_level(self, level) -> None:
         """Set device level."""
-        response = self._client.send_request(
-            "put",
-            self._control_url,
+        response = self._client.send_request(**self._level_request(level))
+        response_object = codec.loads(response.content)
+
+        self._check_level(response_object, level)
+
+    def _level_request(self, level):
+        return dict(
+            method="put",
+            path=self._control_url,
             data={'level': str(level)},
         )
-        response_object = response.json()
-
-        log.debug("Set Level URL (put): %s", self._control_url)
-        log.debug("Set Level Response: %s", response.text)
 
+    def _check_level(self, response_object, level):
         if response_object['id'] != self.id:
             raise jaraco.abode.Exception(ERROR.SET_STATUS_DEV_ID)
 
@@ -77,10 +103,25 @@ class Device(Stateful):
 
         log.info("Set device %s level to: %s", self.id, level)
 
+    def perform(self, action) -> None:
+        """
+        Perform the named action (e.g. 'switch_on'), setting the
+        status on the device and reflecting the resulting state.
+        """
+        state = self.actions[action]
+        self.set_status(int(state))
+        self._state['status'] = state
+
     def get_value(self, name):
         """Get a value from the device state."""
         return self._state.get(name.lower(), {})
 
+    def _get_status(self, key):
+        return self._state.get('statuses', _empty).get(key)
+
+    def _get_fault(self, key):
+        return bool(self._state.get('faults', _empty).get(key, 0))
+
     @property
     def status(self):
         """Shortcut to get the generic status of a device."""
@@ -89,29 +130,28 @@ class Device(Stateful):
     @property
     def battery_low(self):
         """Is battery level low."""
-        return bool(self.get_value('faults').get('low_battery', 0))
+        return self._get_fault('low_battery')
 
     @property
     def no_response(self):
         """Is the device responding."""
-        return bool(self.get_value('faults').get('no_response', 0))
+        return self._get_fault('no_response')
 
     @property
     def out_of_order(self):
         """Is the device out of order."""
-        return bool(self.get_value('faults').get('out_of_order', 0))
+        return self._get_fault('out_of_order')
 
     @property
     def tampered(self):
         """Has the device been tampered with."""
         # 'tempered' - Typo in API?
-        return bool(self.get_value('faults').get('tempered', 0))
+        return self._get_fault('tempered')
 
     @property
     def name(self):
         """Get the name of this device."""
-        fallback = f'{self.type} {self.id}'
-        return self._state.get('name') or fallback
+        return self._state.get('name') or f'{self.type} {self.id}'
 
     @property
     def device_id(self):
@@ -156,12 +196,19 @@ class Device(Stateful):
         >>> Device.resolve_class('device_type.povs')
         <class 'jaraco.abode.devices.binary_sensor.Motion'>
         """
-        lookup = {
+        try:
+            lookup = Device._lookups[cls]
+        except KeyError:
+            lookup = Device._lookups[cls] = cls._build_lookup()
+        return lookup.get(type_tag.lower(), Unknown)
+
+    @classmethod
+    def _build_lookup(cls):
+        return {
             f'device_type.{tag}': sub_cls
             for sub_cls in reversed(tuple(iter_subclasses(cls)))
             for tag in sub_cls.tags
         }
-        return lookup.get(type_tag.lower(), Unknown)
 
 
 class Unknown(Device):
@@ -4,11 +4,11 @@ import base64
 import logging
 from shutil import copyfileobj
 
-import requests
-
 import jaraco
 
+from .. import codec
 from .._itertools import single
+from ..debug import ResponseBody
 from ..helpers import errors as ERROR
 from ..helpers import timeline as TIMELINE
 from ..helpers import urls
@@ -49,10 +49,7 @@ class Camera(base.Device):
             raise jaraco.abode.Exception(ERROR.MISSING_CONTROL_URL)
 
         try:
-            response = self._client.send_request("put", url)
-
-            log.debug("Capture image URL (put): %s", url)
-            log.debug("Capture image response: %s", response.text)
+            self._client.send_request("put", url)
 
             return True
 
@@ -66,10 +63,7 @@ class Camera(base.Device):
         url = urls.TIMELINE_IMAGES_ID.format(device_id=self.id)
         response = self._client.send_request("get", url)
 
-        log.debug("Get image URL (get): %s", url)
-        log.debug("Get image response: %s", response.text)
-
-        return self.update_image_location(response.json())
+        return self.update_image_location(codec.loads(response.content))
 
     def update_image_location(self, timeline_json):
         """Update the image location."""
@@ -99,7 +93,7 @@ class Camera(base.Device):
             log.warning(
                 "Unexected response code %s with body: %s",
                 str(response.status_code),
-                response.text,
+                ResponseBody(response),
             )
             raise jaraco.abode.Exception(ERROR.CAM_IMAGE_UNEXPECTED_RESPONSE)
 
@@ -127,18 +121,18 @@ class Camera(base.Device):
             if not self.refresh_image():
                 return False
 
-        response = requests.get(self.image_url, stream=True)
+        downloads = self._client.transport.downloads
+        with downloads.get(self.image_url, stream=True) as response:
+            if response.status_code != 200:
+                log.warning(
+                    "Unexpected response code %s when requesting image: %s",
+                    str(response.status_code),
+                    ResponseBody(response),
+                )
+                raise jaraco.abode.Exception(ERROR.CAM_IMAGE_REQUEST_INVALID)
 
-        if response.status_code != 200:
-            log.warning(
-                "Unexpected response code %s when requesting image: %s",
-                str(response.status_code),
-                response.text,
-            )
-            raise jaraco.abode.Exception(ERROR.CAM_IMAGE_REQUEST_INVALID)
-
-        with open(path, 'wb') as imgfile:
-            copyfileobj(response.raw, imgfile)
+            with open(path, 'wb') as imgfile:
+                copyfileobj(response.raw, imgfile)
 
         return True
 
@@ -148,13 +142,11 @@ class Camera(base.Device):
 
         try:
             response = self._client.send_request("post", url)
-            log.debug("Camera snapshot URL (post): %s", url)
-            log.debug("Camera snapshot response: %s", response.text)
         except jaraco.abode.Exception as exc:
             log.warning("Failed to get camera snapshot image: %s", exc)
             return False
 
-        self._snapshot_base64 = response.json().get("base64Image")
+        self._snapshot_base64 = codec.loads(response.content).get("base64Image")
         if self._snapshot_base64 is None:
             log.warning("Camera snapshot data missing")
             return False
@@ -188,11 +180,9 @@ class Camera(base.Device):
         """Start KVS Stream for camera."""
         url = f"{urls.CAMERA_INTEGRATIONS}{self.uuid}/kvs/stream"
 
-        response = self._client.send_request(method="post", path=url)
-        response_object = response.json()
-
-        log.debug("Camera KVS Stream URL (post): %s", url)
-        log.debug("Camera KVS Stream Response: REDACTED (due to embedded credentials)")
+        # The response embeds credentials, so is not logged.
+        response = self._client.send_request(method="post", path=url, sensitive=True)
+        response_object = codec.loads(response.content)
 
         if response_object['channelEndpoint'] is None:  # pragma: no cover
             raise jaraco.abode.Exception(ERROR.START_KVS_STREAM)
@@ -223,10 +213,7 @@ class Camera(base.Device):
             response = self._client.send_request(
                 method="put", path=path, data=camera_data
             )
-            response_object = response.json()
-
-            log.debug("Camera Privacy Mode URL (put): %s", path)
-            log.debug("Camera Privacy Mode Response: %s", response.text)
+            response_object = codec.loads(response.content)
 
             if response_object['id'] != self.id:
                 raise jaraco.abode.Exception(ERROR.SET_STATUS_DEV_ID)
@@ -9,15 +9,7 @@ class Cover(Switch):
 
     tags = ('secure_barrier',)
 
-    def switch_on(self):
-        """Turn the switch on."""
-        self.set_status(int(STATUS.OPEN))
-        self._state['status'] = STATUS.OPEN
-
-    def switch_off(self):
-        """Turn the switch off."""
-        self.set_status(int(STATUS.CLOSED))
-        self._state['status'] = STATUS.CLOSED
+    actions = dict(switch_on=STATUS.OPEN, switch_off=STATUS.CLOSED)
 
     def open_cover(self):
         """Open the cover."""
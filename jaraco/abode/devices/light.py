@@ -5,6 +5,7 @@ import math
 
 import jaraco.abode
 
+from .. import codec
 from ..helpers import errors as ERROR
 from ..helpers import urls
 from .switch import Switch
@@ -32,10 +33,7 @@ class Light(Switch):
         }
 
         response = self._client.send_request("post", url, data=color_data)
-        response_object = response.json()
-
-        log.debug("Set Color Temp URL (post): %s", url)
-        log.debug("Set Color Temp Response: %s", response.text)
+        response_object = codec.loads(response.content)
 
         if response_object['idForPanel'] != self.id:
             raise jaraco.abode.Exception(ERROR.SET_STATUS_DEV_ID)
@@ -69,10 +67,7 @@ class Light(Switch):
         }
 
         response = self._client.send_request("post", url, data=color_data)
-        response_object = response.json()
-
-        log.debug("Set Color URL (post): %s", url)
-        log.debug("Set Color Response: %s", response.text)
+        response_object = codec.loads(response.content)
 
         if response_object['idForPanel'] != self.id:
             raise jaraco.abode.Exception(ERROR.SET_STATUS_DEV_ID)
@@ -100,19 +95,19 @@ class Light(Switch):
     @property
     def brightness(self):
         """Get light brightness."""
-        return self.get_value('statuses').get('level')
+        return self._get_status('level')
 
     @property
     def color_temp(self):
         """Get light color temp."""
-        return self.get_value('statuses').get('color_temp')
+        return self._get_status('color_temp')
 
     @property
     def color(self):
         """Get light color."""
         return (
-            self.get_value('statuses').get('hue'),
-            self.get_value('statuses').get('saturation'),
+            self._get_status('hue'),
+            self._get_status('saturation'),
         )
 
     @property
@@ -123,7 +118,7 @@ class Light(Switch):
     @property
     def has_color(self):
         """Device is using color mode."""
-        return self.get_value('statuses').get('color_mode') == str(ColorMode.on)
+        return self._get_status('color_mode') == str(ColorMode.on)
 
     @property
     def is_color_capable(self):
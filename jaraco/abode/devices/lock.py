@@ -9,15 +9,15 @@ class Lock(base.Device):
 
     tags = ('door_lock',)
 
+    actions = dict(lock=STATUS.Lock.CLOSED, unlock=STATUS.Lock.OPEN)
+
     def lock(self) -> None:
         """Lock the device."""
-        self.set_status(int(STATUS.Lock.CLOSED))
-        self._state['status'] = STATUS.Lock.CLOSED
+        self.perform('lock')
 
     def unlock(self) -> None:
         """Unlock the device."""
-        self.set_status(int(STATUS.Lock.OPEN))
-        self._state['status'] = STATUS.Lock.OPEN
+        self.perform('unlock')
 
     @property
     def is_locked(self):
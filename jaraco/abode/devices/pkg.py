@@ -1,17 +1,27 @@
 import functools
 import importlib
 
-import importlib_resources as resources
-from bx_py_utils.compat import removesuffix
+modules = (
+    'alarm',
+    'base',
+    'binary_sensor',
+    'camera',
+    'cover',
+    'light',
+    'lock',
+    'sensor',
+    'status',
+    'switch',
+    'valve',
+)
+"""
+The modules of this package, listed rather than discovered, to
+keep from scanning the package on first use.
+"""
 
 
 @functools.lru_cache
 def import_all():
     """Import all modules from this package."""
-    device_mods = (
-        removesuffix(mod.name, '.py')
-        for mod in resources.files(__package__).iterdir()
-        if mod.name != '__init__.py'
-    )
-    for mod in device_mods:
+    for mod in modules:
         importlib.import_module(f'.{mod}', __package__)
@@ -1,24 +1,112 @@
 """Abode sensor device."""
 
 import re
+from typing import NamedTuple, Optional
 
 from . import base
 
+_number = re.compile(r'([-−]?)\s*(\d[\d.,]*)')
+# non-numeric text, after the upper bound of any range
+_unit = re.compile(r'(?:\s*[-−–]\s*\d[\d.,]*)?\s*(\D.*?)?\s*$', re.DOTALL)
+
+
+class Reading(NamedTuple):
+    """A numeric reading and its unit, parsed from a status."""
+
+    value: float
+    unit: Optional[str] = None
+
+    @classmethod
+    def parse(cls, text):
+        """
+        Parse the first number in the text and the unit following it,
+        accepting either a point or a comma as the decimal separator.
+        Of a range, the value is the lower bound.
+
+        >>> Reading.parse('72.23 °F')
+        Reading(value=72.23, unit='°F')
+        >>> Reading.parse('-3,5 °C')
+        Reading(value=-3.5, unit='°C')
+        >>> Reading.parse('−12 °C')
+        Reading(value=-12.0, unit='°C')
+        >>> Reading.parse('1,200 lx')
+        Reading(value=1200.0, unit='lx')
+        >>> Reading.parse('1.234,5 lx')
+        Reading(value=1234.5, unit='lx')
+        >>> Reading.parse('34%')
+        Reading(value=34.0, unit='%')
+        >>> Reading.parse('5-10')
+        Reading(value=5.0, unit=None)
+        >>> Reading.parse('5 – 10 lx')
+        Reading(value=5.0, unit='lx')
+        >>> Reading.parse('') is Reading.parse(None) is Reading.parse('n/a') is None
+        True
+        """
+        match = text and _number.search(text)
+        if not match:
+            return None
+        sign, digits = match.groups()
+        value = float(_normalize(digits.rstrip('.,')))
+        unit = _unit.match(text, match.end())
+        return cls(-value if sign else value, unit and unit.group(1))
+
+
+def _normalize(digits):
+    """
+    Remove grouping separators and make the decimal separator a point.
+    The last separator is the decimal separator, unless it's repeated
+    or a lone comma followed by three digits.
+    """
+    point = max(digits.rfind('.'), digits.rfind(','))
+    if point == -1:
+        return digits
+    sep = digits[point]
+    grouping = digits.count(sep) > 1 or (
+        sep == ',' and '.' not in digits and len(digits) - point == 4
+    )
+    if grouping:
+        return digits.replace('.', '').replace(',', '')
+    return digits[:point].replace('.', '').replace(',', '') + '.' + digits[point + 1 :]
+
 
 class Sensor(base.Device):
-    """Class to represent a sensor device."""
+    """
+    Class to represent a sensor device.
+
+    Readings are parsed once per update of the statuses.
+    """
 
     tags = ('lm',)
 
-    def _get_status(self, key):
-        return self._state.get('statuses', {}).get(key)
+    def __init__(self, state, client):
+        super().__init__(state, client)
+        self._readings = {}
+
+    def update(self, state):
+        changed = 'statuses' in state and state['statuses'] != self._state.get(
+            'statuses'
+        )
+        super().update(state)
+        if changed:
+            self._readings.clear()
+
+    def reading(self, key):
+        """The :class:`Reading` of the status, if any."""
+        try:
+            return self._readings[key]
+        except KeyError:
+            pass
+        reading = self._readings[key] = Reading.parse(self._get_status(key))
+        return reading
 
     def _get_numeric_status(self, key):
         """Extract the numeric value from the statuses object."""
-        value = self._get_status(key)
+        reading = self.reading(key)
+        return reading and reading.value
 
-        if value and any(i.isdigit() for i in value):
-            return float(re.sub("[^0-9.]", "", value))
+    def _get_unit(self, key):
+        reading = self.reading(key)
+        return reading and reading.unit
 
     @property
     def temp(self):
@@ -28,11 +116,9 @@ class Sensor(base.Device):
     @property
     def temp_unit(self):
         """Get unit of temp."""
-        if '°F' in self._get_status('temperature'):
-            return '°F'
-
-        if '°C' in self._get_status('temperature'):
-            return '°C'
+        unit = self._get_unit('temperature')
+        if unit in ('°F', '°C'):
+            return unit
 
     @property
     def humidity(self):
@@ -42,7 +128,7 @@ class Sensor(base.Device):
     @property
     def humidity_unit(self):
         """Get unit of humidity."""
-        if '%' in self._get_status('humidity'):
+        if self._get_unit('humidity') == '%':
             return '%'
 
     @property
@@ -53,20 +139,20 @@ class Sensor(base.Device):
     @property
     def lux_unit(self):
         """Get unit of lux."""
-        if 'lx' in self._get_status('lux'):
+        if self._get_unit('lux') == 'lx':
             return 'lux'
 
     @property
     def has_temp(self):
         """Device reports temperature."""
-        return self.temp is not None
+        return self.reading('temperature') is not None
 
     @property
     def has_humidity(self):
         """Device reports humidity level."""
-        return self.humidity is not None
+        return self.reading('humidity') is not None
 
     @property
     def has_lux(self):
         """Device reports light lux level."""
-        return self.lux is not None
+        return self.reading('lux') is not None
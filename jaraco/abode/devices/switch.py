@@ -16,15 +16,15 @@ class Switch(base.Device):
         'power_switch_meter',
     )
 
+    actions = dict(switch_on=STATUS.ON, switch_off=STATUS.OFF)
+
     def switch_on(self):
         """Turn the switch on."""
-        self.set_status(int(STATUS.ON))
-        self._state['status'] = STATUS.ON
+        self.perform('switch_on')
 
     def switch_off(self):
         """Turn the switch off."""
-        self.set_status(int(STATUS.OFF))
-        self._state['status'] = STATUS.OFF
+        self.perform('switch_off')
 
     @property
     def is_on(self):
@@ -9,15 +9,15 @@ class Valve(Switch):
 
     tags = ('valve',)
 
+    actions = dict(switch_on=STATUS.OPEN, switch_off=STATUS.CLOSED)
+
     def switch_on(self) -> None:
         """Open the valve."""
-        self.set_status(int(STATUS.ON))
-        self._state['status'] = STATUS.OPEN
+        self.perform('switch_on')
 
     def switch_off(self) -> None:
         """Close the valve."""
-        self.set_status(int(STATUS.OFF))
-        self._state['status'] = STATUS.CLOSED
+        self.perform('switch_off')
 
     @property
     def is_on(self):
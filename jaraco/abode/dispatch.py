@@ -0,0 +1,193 @@
+"""
+Dispatchers invoking event callbacks.
+
+Each dispatcher accepts callbacks with a key (e.g. the device id);
+callbacks submitted with the same key are invoked in order.
+"""
+
+import asyncio
+import collections
+import contextlib
+import logging
+import queue
+import threading
+
+log = logging.getLogger(__name__)
+
+
+def _invoke(callback, *args):
+    # Callback with some data, capturing any exceptions to prevent chaos
+    try:
+        return callback(*args)
+    except Exception as exc:
+        log.warning("Captured exception during callback: %s", exc)
+
+
+class Dispatcher:
+    """
+    Base for dispatchers, counting the callbacks (in ``stats``) from
+    any thread.
+    """
+
+    def __init__(self):
+        self.stats = collections.Counter()
+        self._stats_lock = threading.Lock()
+
+    def _count(self, name):
+        with self._stats_lock:
+            self.stats[name] += 1
+
+    def stop(self):
+        """Stop invoking callbacks."""
+
+
+class Inline(Dispatcher):
+    """
+    Invoke callbacks immediately, on the thread receiving the events.
+
+    >>> Inline().submit('key', print, 'called')
+    called
+    """
+
+    @property
+    def depth(self):
+        return 0
+
+    def submit(self, key, callback, *args):
+        self._count('submitted')
+        _invoke(callback, *args)
+        self._count('completed')
+
+    def join(self):
+        pass
+
+
+_stop = object()
+
+
+class ThreadPool(Dispatcher):
+    """
+    Invoke callbacks on ``workers`` threads, so that slow callbacks
+    don't delay the receipt of events.
+
+    Each worker has a queue of at most ``maxsize`` callbacks (0 for
+    unbounded) and callbacks with the same key are always queued for
+    the same worker. When a queue is full, ``overflow`` determines
+    whether to ``'block'`` the receipt of events or ``'drop_oldest'``
+    callback queued.
+
+    >>> pool = ThreadPool(workers=2)
+    >>> pool.submit('key', print, 'called')
+    >>> pool.join()
+    called
+    >>> pool.stop()
+    >>> pool.stats
+    Counter({'submitted': 1, 'completed': 1})
+    """
+
+    overflows = 'block', 'drop_oldest'
+
+    def __init__(self, workers=4, maxsize=1000, overflow='block'):
+        if overflow not in self.overflows:
+            raise ValueError(f"overflow must be one of {self.overflows}")
+        super().__init__()
+        self.overflow = overflow
+        self._queues = [queue.Queue(maxsize) for _ in range(workers)]
+        self._threads = [
+            threading.Thread(
+                target=self._run, args=(q,), name=f'abode-dispatch-{n}', daemon=True
+            )
+            for n, q in enumerate(self._queues)
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    @property
+    def depths(self):
+        """The number of callbacks queued for each worker."""
+        return [q.qsize() for q in self._queues]
+
+    @property
+    def depth(self):
+        """The number of callbacks queued."""
+        return sum(self.depths)
+
+    def submit(self, key, callback, *args):
+        self._count('submitted')
+        self._put(self._queues[hash(key) % len(self._queues)], (callback, args))
+
+    def _put(self, q, item):
+        if self.overflow == 'block':
+            q.put(item)
+            return
+        while True:
+            try:
+                return q.put_nowait(item)
+            except queue.Full:
+                pass
+            with contextlib.suppress(queue.Empty):
+                q.get_nowait()
+                q.task_done()
+                self._count('dropped')
+
+    def _run(self, q):
+        while True:
+            item = q.get()
+            try:
+                if item is _stop:
+                    return
+                callback, args = item
+                _invoke(callback, *args)
+                self._count('completed')
+            finally:
+                q.task_done()
+
+    def join(self):
+        """Wait for the queued callbacks to complete."""
+        for q in self._queues:
+            q.join()
+
+    def stop(self):
+        """Complete the queued callbacks and stop the workers."""
+        for q in self._queues:
+            q.put(_stop)
+        for thread in self._threads:
+            thread.join()
+
+
+class EventLoop(Dispatcher):
+    """
+    Hand callbacks off to an asyncio event loop (running in another
+    thread), where they're invoked in order. Coroutine callbacks are
+    scheduled as tasks.
+    """
+
+    def __init__(self, loop):
+        super().__init__()
+        self.loop = loop
+
+    @property
+    def depth(self):
+        """The number of callbacks not yet invoked."""
+        with self._stats_lock:
+            return self.stats['submitted'] - self.stats['completed']
+
+    def submit(self, key, callback, *args):
+        self._count('submitted')
+        self.loop.call_soon_threadsafe(self._invoke, callback, args)
+
+    def _invoke(self, callback, args):
+        result = _invoke(callback, *args)
+        if asyncio.iscoroutine(result):
+            self.loop.create_task(self._await(result))
+        self._count('completed')
+
+    async def _await(self, coroutine):
+        try:
+            await coroutine
+        except Exception as exc:
+            log.warning("Captured exception during callback: %s", exc)
+
+    def join(self):
+        """Wait for the callbacks submitted so far to be invoked."""
+        asyncio.run_coroutine_threadsafe(asyncio.sleep(0), self.loop).result()
@@ -5,15 +5,17 @@ import http.cookiejar
 import logging
 
 import jaraco
-from jaraco.itertools import always_iterable
 
+from . import dispatch, state
 from . import socketio as sio
-from ._itertools import opt_single, single
+from ._itertools import always_iterable, opt_single, single
+from .coalesce import Coalescer
 from .devices.alarm import Alarm
 from .devices.base import Device
 from .helpers import errors as ERROR
 from .helpers import timeline as TIMELINE
 from .helpers import urls
+from .subscriptions import TimelineIndex
 
 log = logging.getLogger(__name__)
 
@@ -32,19 +34,36 @@ def _cookie_string(cookies: http.cookiejar.CookieJar):
 
 
 class EventController:
-    """Subscribes to events."""
+    """
+    Subscribes to events.
+
+    Callbacks are invoked by the ``dispatcher`` (by default, inline
+    on the SocketIO thread); assign a :class:`dispatch.ThreadPool`
+    or :class:`dispatch.EventLoop` to keep slow callbacks from
+    delaying the receipt of events.
+
+    On reconnection, all devices and automations are refreshed, unless
+    ``resume`` is set, in which case the devices are refreshed and
+    callbacks are invoked for those that changed, and automations are
+    refreshed. ``resume_stats`` counts the ``resumes``, the devices
+    and state keys changed (``devices_changed``, ``keys_changed``)
+    and the ``automations_changed``.
+    """
 
-    def __init__(self, client, url=SOCKETIO_URL):
+    def __init__(self, client, url=SOCKETIO_URL, dispatcher=None, resume=False):
         self._client = client
+        self.dispatcher = dispatcher or dispatch.Inline()
+        self.resume = resume
+        self.resume_stats = collections.Counter()
         self._thread = None
         self._running = False
         self._connected = False
+        self._coalescer = None
 
         # Setup callback dicts
         self._connection_status_callbacks = collections.defaultdict(list)
         self._device_callbacks = collections.defaultdict(list)
-        self._event_callbacks = collections.defaultdict(list)
-        self._timeline_callbacks = collections.defaultdict(list)
+        self._timeline = TimelineIndex()
 
         # Setup SocketIO
         self._socketio = sio.SocketIO(url=url, origin=urls.BASE)
@@ -65,6 +84,30 @@ class EventController:
     def stop(self):
         """Tell the subscription thread to terminate - will block."""
         self._socketio.stop()
+        if self._coalescer:
+            self._coalescer.cancel()
+        self.dispatcher.stop()
+
+    def coalesce_updates(self, window=1.0, batch_threshold=3):
+        """
+        Rather than refreshing a device on every update event, refresh
+        each updated device at most once per ``window`` seconds and
+        refresh all devices in one request when at least
+        ``batch_threshold`` devices were updated together.
+
+        Pass ``window=None`` to refresh on every event (the default).
+
+        Return the :class:`Coalescer`, whose ``stats`` count the
+        requests saved.
+        """
+        if self._coalescer:
+            self._coalescer.flush()
+        self._coalescer = (
+            None
+            if window is None
+            else Coalescer(self._client, self._notify_device, window, batch_threshold)
+        )
+        return self._coalescer
 
     def add_connection_status_callback(self, unique_id, callback):
         """Register callback for Abode server connection status."""
@@ -145,7 +188,7 @@ class EventController:
 
             log.debug("Subscribing to event group: %s", event_group)
 
-            self._event_callbacks[event_group].append(callback)
+            self._timeline.add_group(event_group, callback)
 
         return True
 
@@ -165,7 +208,29 @@ class EventController:
 
             log.debug("Subscribing to timeline event: %s", timeline_event)
 
-            self._timeline_callbacks[event_code].append(callback)
+            self._timeline.add_code(event_code, callback)
+
+        return True
+
+    def add_timeline_range_callback(self, event_codes, callback):
+        """
+        Register a callback for timeline events with codes in a range
+        (e.g. ``range(1100, 1200)``).
+        """
+        log.debug("Subscribing to timeline event codes: %s", event_codes)
+
+        self._timeline.add_range(event_codes, callback)
+
+        return True
+
+    def add_timeline_predicate_callback(self, predicate, callback):
+        """
+        Register a callback for timeline events whose (integer)
+        event code satisfies the predicate.
+        """
+        log.debug("Subscribing to timeline event codes matching: %s", predicate)
+
+        self._timeline.add_predicate(predicate, callback)
 
         return True
 
@@ -188,24 +253,80 @@ class EventController:
         self._connected = True
 
         try:
-            self._client.refresh()
+            if self.resume and self._client._devices is not None:
+                self._resume()
+            else:
+                self._client.refresh()
         except Exception as exc:
             log.warning("Captured exception during Abode refresh: %s", exc)
         finally:
             # Callbacks should still execute even if refresh fails (Abode
             # server issues) so that the entity availability in Home Assistant
             # is updated since we are in fact connected to the web socket.
-            for callbacks in self._connection_status_callbacks.values():
-                for callback in callbacks:
-                    _execute_callback(callback)
+            self._notify_connection_status()
+
+    def _resume(self):
+        """
+        Refresh the devices, notifying subscribers of those that changed,
+        and the automations (which may have changed while disconnected,
+        regardless of the devices).
+        """
+        devices = self._client._devices
+        # Refreshing replaces the values in the states, so shallow
+        # copies keep the values before.
+        before = {
+            device_id: dict(device._state)
+            for device_id, device in list(devices.items())
+        }
+        self._client.get_devices(refresh=True)
+        changes = {
+            device_id: state.diff(before.get(device_id, {}), device._state)
+            for device_id, device in list(devices.items())
+        }
+        changed = {device_id: keys for device_id, keys in changes.items() if keys}
+
+        # automations not loaded before aren't counted as changed
+        automations_before = {
+            automation_id: dict(automation._state)
+            for automation_id, automation in list(
+                (self._client._automations or {}).items()
+            )
+        }
+        loaded = self._client._automations is not None
+        self._client.get_automations(refresh=True)
+        automations_changed = (
+            sum(
+                bool(state.diff(automations_before.get(id, {}), automation._state))
+                for id, automation in list(self._client._automations.items())
+            )
+            if loaded
+            else 0
+        )
+
+        self.resume_stats['resumes'] += 1
+        self.resume_stats['devices_changed'] += len(changed)
+        self.resume_stats['keys_changed'] += sum(map(len, changed.values()))
+        self.resume_stats['automations_changed'] += automations_changed
+        log.info(
+            "Resumed with %d of %d devices and %d automations changed",
+            len(changed),
+            len(devices),
+            automations_changed,
+        )
+
+        for device_id in changed:
+            self._notify_device(devices[device_id])
 
     def _on_socket_disconnected(self):
         """Socket IO disconnected callback."""
         self._connected = False
 
+        self._notify_connection_status()
+
+    def _notify_connection_status(self):
         for callbacks in self._connection_status_callbacks.values():
             for callback in callbacks:
-                _execute_callback(callback)
+                self.dispatcher.submit(callback, callback)
 
     def _on_device_update(self, devid):
         """Device callback from Abode SocketIO server."""
@@ -217,14 +338,21 @@ class EventController:
 
         log.debug("Device update event for device ID: %s", devid)
 
+        if self._coalescer:
+            self._coalescer.mark(devid)
+            return
+
         device = self._client.get_device(devid, True)
 
         if not device:
             log.debug("Got device update for unknown device: %s", devid)
             return
 
+        self._notify_device(device)
+
+    def _notify_device(self, device):
         for callback in self._device_callbacks[device.id]:
-            _execute_callback(callback, device)
+            self.dispatcher.submit(device.id, callback, device)
 
     def _on_mode_change(self, mode):
         """Mode change broadcast from Abode SocketIO server."""
@@ -248,8 +376,7 @@ class EventController:
         # force the mode status now to match the notification.
         alarm_device._state['mode']['area_1'] = mode
 
-        for callback in self._device_callbacks[alarm_device.id]:
-            _execute_callback(callback, alarm_device)
+        self._notify_device(alarm_device)
 
     def _on_timeline_update(self, event):
         """Timeline update broadcast from Abode SocketIO server."""
@@ -269,20 +396,13 @@ class EventController:
             event_code,
         )
 
-        # Compress our callbacks into those that match this event_code
-        # or ones registered to get callbacks for all events
-        codes = (event_code, TIMELINE.ALL['event_code'])
-        all_callbacks = [self._timeline_callbacks[code] for code in codes]
-
-        for callbacks in all_callbacks:
-            for callback in callbacks:
-                _execute_callback(callback, event)
-
-        # Attempt to map the event code to a group and callback
-        event_group = TIMELINE.map_event_code(event_code)
+        # Keep events for a device in order
+        key = event.get('device_id') or event_code
 
-        for callback in self._event_callbacks[event_group]:
-            _execute_callback(callback, event)
+        # Callbacks for this event_code, all events, its group,
+        # and matching ranges and predicates
+        for callback in self._timeline[event_code]:
+            self.dispatcher.submit(key, callback, event)
 
     def _on_automation_update(self, event):
         """Automation update broadcast from Abode SocketIO server."""
@@ -290,13 +410,5 @@ class EventController:
 
         event = single(event)
 
-        for callback in self._event_callbacks[event_group]:
-            _execute_callback(callback, event)
-
-
-def _execute_callback(callback, *args, **kwargs):
-    # Callback with some data, capturing any exceptions to prevent chaos
-    try:
-        callback(*args, **kwargs)
-    except Exception as exc:
-        log.warning("Captured exception during callback: %s", exc)
+        for callback in self._timeline.group(event_group):
+            self.dispatcher.submit(event_group, callback, event)
@@ -1,7 +1,5 @@
 import builtins
 
-import requests
-
 
 class Exception(builtins.Exception):
     """Class to throw general abode exception."""
@@ -25,6 +23,8 @@ class AuthenticationException(Exception):
 
     @classmethod
     def raise_for(cls, response):
+        import requests
+
         try:
             response.raise_for_status()
         except requests.exceptions.HTTPError as exc:
@@ -37,6 +37,13 @@ class AuthenticationException(Exception):
         return response.text
 
 
+class TransientException(Exception):
+    """
+    Class to throw exception for failures (e.g. network errors, timeouts
+    or server errors) that may succeed if retried.
+    """
+
+
 class SocketIOException(Exception):
     """Class to throw SocketIO Error exception."""
 
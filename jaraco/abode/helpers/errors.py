@@ -87,3 +87,5 @@ MFA_CODE_REQUIRED = (32, "Multifactor authentication code required for login.")
 UNKNOWN_MFA_TYPE = (33, "Unknown multifactor authentication type.")
 
 START_KVS_STREAM = (34, "Unable to start KVS stream for camera")
+
+REQUEST_TIMEOUT = (35, "Request did not complete before its deadline.")
@@ -1,6 +1,7 @@
 """Timeline event constants."""
 
 import csv
+import functools
 
 from importlib_resources import files
 
@@ -68,8 +69,37 @@ def map_event_code(event_code):
     return event_code_mapping.get(int(event_code))
 
 
+def map_event_codes(event_codes):
+    """
+    Map a sequence (or NumPy array) of event codes to event groups,
+    looking up codes from 0 to 9999 in a table built from the
+    :data:`event_code_mapping`.
+
+    >>> map_event_codes(['1100', 1400, 1700, 10000])
+    ['abode_alarm', 'abode_disarm', None, None]
+    """
+    table = _code_table(tuple(event_code_mapping.items()))
+    size = len(table)
+    if hasattr(event_codes, 'tolist'):
+        event_codes = event_codes.tolist()
+    return [
+        table[code] if 0 <= code < size else event_code_mapping.get(code)
+        for code in map(int, event_codes)
+    ]
+
+
+@functools.lru_cache(maxsize=1)
+def _code_table(mapping_items, size=10_000):
+    """
+    The group of each code less than ``size``, rebuilt whenever
+    the mapping changes.
+    """
+    mapping = RangeMap(dict(mapping_items))
+    return tuple(mapping.get(code) for code in range(size))
+
+
 def _read_events():
-    with files().joinpath('events.csv').open(encoding='utf-8') as strm:
+    with files(__package__).joinpath('events.csv').open(encoding='utf-8') as strm:
         yield from csv.DictReader(strm, quoting=csv.QUOTE_NONE, skipinitialspace=True)
 
 
@@ -88,7 +118,7 @@ def _load_events():
     all_events = list(_read_events())
     vars = {
         var_name(event): dict(event_code=event['code'], event_type=event['text'])
-        for event in _read_events()
+        for event in all_events
     }
     assert len(all_events) == len(vars)
     globals().update(vars)
@@ -31,6 +31,7 @@ AUTOMATION = '/integrations/v1/automations/'
 AUTOMATION_ID = AUTOMATION + '{id}/'
 AUTOMATION_APPLY = AUTOMATION_ID + 'apply'
 
+TIMELINE = '/api/v1/timeline'
 TIMELINE_IMAGES_ID = (
     '/api/v1/timeline?device_id={device_id}&dir=next&event_label=Image+Capture&size=1'
 )
@@ -0,0 +1,234 @@
+"""
+A local, append-only history of the numeric readings of devices.
+"""
+
+import array
+import atexit
+import contextlib
+import mmap
+import os
+import pathlib
+import threading
+import time
+from typing import NamedTuple
+
+from . import codec, config
+from .devices.sensor import Reading
+
+
+class Sample(NamedTuple):
+    timestamp: float
+    value: float
+
+
+class Bucket(NamedTuple):
+    start: float
+    min: float
+    max: float
+    avg: float
+    count: int
+
+
+class Segment:
+    """
+    A segment file of ``count`` rows, stored as columns of timestamps
+    and values (doubles) and series keys (unsigned ints), and read
+    through a memory map.
+    """
+
+    row_size = 8 + 8 + 4
+
+    def __init__(self, path):
+        with open(path, 'rb') as file:
+            self._map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        self.count = len(self._map) // self.row_size
+        view = memoryview(self._map)
+        self.timestamps = view[: 8 * self.count].cast('d')
+        self.values = view[8 * self.count : 16 * self.count].cast('d')
+        self.keys = view[16 * self.count : 20 * self.count].cast('I')
+
+    @classmethod
+    def write(cls, path, timestamps, values, keys):
+        tmp = path.with_name(path.name + '.tmp')
+        with open(tmp, 'wb') as file:
+            for column in (timestamps, values, keys):
+                column.tofile(file)
+        os.replace(tmp, path)
+        return cls(path)
+
+    def close(self):
+        for view in (self.timestamps, self.values, self.keys):
+            view.release()
+        self._map.close()
+
+
+class History:
+    """
+    Numeric readings (parsed from the ``statuses``) of devices as they
+    change, held in columns in memory and written to a segment file
+    in ``path`` every ``segment_size`` rows, or on the first reading
+    appended ``flush_interval`` seconds after the oldest row held.
+    Rows not yet written are lost unless the history is flushed or
+    closed (as tracked histories are at exit).
+
+    >>> history = History(getfixture('tmp_path'), segment_size=2)
+    >>> for ts, temp in enumerate(['20 °C', '21 °C', '21 °C', '23 °C']):
+    ...     history.append('ZW:01', 'temperature', Reading.parse(temp).value, ts)
+    >>> history.samples('ZW:01', 'temperature', start=1)
+    [Sample(timestamp=1.0, value=21.0), Sample(timestamp=3.0, value=23.0)]
+    >>> history.downsample('ZW:01', 'temperature', bucket=2)
+    [Bucket(start=0.0, min=20.0, max=21.0, avg=20.5, count=2), Bucket(start=2.0, ...)]
+    >>> history.close()
+    >>> len(History(history.path).samples('ZW:01', 'temperature'))
+    3
+    """
+
+    tags = ('device_type.lm', 'device_type.power_switch_meter')
+    """Type tags of the devices tracked by default."""
+
+    def __init__(self, path=None, segment_size=4096, flush_interval=3600):
+        self.path = pathlib.Path(path or config.paths.user_data / 'history')
+        self.path.mkdir(parents=True, exist_ok=True)
+        self.segment_size = segment_size
+        self.flush_interval = flush_interval
+        self._lock = threading.Lock()
+        self._series = [tuple(series) for series in self._load_series()]
+        self._keys = {series: key for key, series in enumerate(self._series)}
+        self._saved_series = len(self._series)
+        self._segments = [
+            Segment(path) for path in sorted(self.path.glob('segment-*.bin'))
+        ]
+        self._next_segment = len(self._segments)
+        self._last = {}
+        self._reset_buffer()
+
+    def _load_series(self):
+        with contextlib.suppress(FileNotFoundError):
+            return codec.loads(self.path.joinpath('series.json').read_bytes())
+        return []
+
+    def _reset_buffer(self):
+        self._buffered_since = None
+        self._timestamps = array.array('d')
+        self._values = array.array('d')
+        self._buffer_keys = array.array('I')
+
+    def append(self, device_id, field, value, timestamp=None):
+        """
+        Append a reading, unless it's the same as the last one
+        appended for the device and field.
+        """
+        series = device_id, field
+        with self._lock:
+            if self._last.get(series) == value:
+                return
+            self._last[series] = value
+            key = self._keys.get(series)
+            if key is None:
+                key = self._keys[series] = len(self._series)
+                self._series.append(series)
+            self._timestamps.append(time.time() if timestamp is None else timestamp)
+            self._values.append(value)
+            self._buffer_keys.append(key)
+            if self._buffered_since is None:
+                self._buffered_since = time.monotonic()
+            if self._due():
+                self._flush()
+
+    def _due(self):
+        held = time.monotonic() - self._buffered_since
+        return len(self._timestamps) >= self.segment_size or (
+            held >= self.flush_interval
+        )
+
+    def record(self, device, timestamp=None):
+        """
+        Append the numeric statuses of the device. Suitable as a
+        device callback.
+        """
+        for field, status in device._state.get('statuses', {}).items():
+            reading = Reading.parse(status) if isinstance(status, str) else None
+            if reading:
+                self.append(device.id, field, reading.value, timestamp)
+
+    def track(self, client, devices=None):
+        """
+        Record the current and subsequent readings of the devices
+        (by default, those with one of the :attr:`tags`).
+        """
+        if devices is None:
+            devices = [
+                device
+                for device in client.get_devices()
+                if device.type_tag.lower() in self.tags
+            ]
+        for device in devices:
+            self.record(device)
+        atexit.register(self.flush)
+        return client.events.add_device_callback(devices, self.record)
+
+    def flush(self):
+        """Write the rows in memory to a new segment."""
+        with self._lock:
+            self._flush()
+
+    def _flush(self):
+        if not self._timestamps:
+            return
+        if len(self._series) > self._saved_series:
+            self._save_series()
+        path = self.path / f'segment-{self._next_segment:06}.bin'
+        self._next_segment += 1
+        segment = Segment.write(path, self._timestamps, self._values, self._buffer_keys)
+        self._segments.append(segment)
+        self._reset_buffer()
+
+    def _save_series(self):
+        path = self.path / 'series.json'
+        tmp = path.with_name(path.name + '.tmp')
+        tmp.write_text(codec.dumps(self._series), encoding='utf-8')
+        os.replace(tmp, path)
+        self._saved_series = len(self._series)
+
+    def close(self):
+        """Flush and release the segments."""
+        with self._lock:
+            self._flush()
+            for segment in self._segments:
+                segment.close()
+            self._segments.clear()
+
+    def samples(self, device_id, field, start=None, end=None):
+        """The readings of the field from ``start`` until ``end``."""
+        key = self._keys.get((device_id, field))
+        if key is None:
+            return []
+        start = float('-inf') if start is None else start
+        end = float('inf') if end is None else end
+        with self._lock:
+            columns = [
+                (segment.timestamps, segment.values, segment.keys)
+                for segment in self._segments
+            ]
+            columns.append((self._timestamps, self._values, self._buffer_keys))
+            return sorted(
+                Sample(timestamp, value)
+                for timestamps, values, keys in columns
+                for timestamp, value, row_key in zip(timestamps, values, keys)
+                if row_key == key and start <= timestamp < end
+            )
+
+    def downsample(self, device_id, field, bucket, start=None, end=None):
+        """
+        The minimum, maximum and average of the readings of the field
+        in each period of ``bucket`` seconds that has any.
+        """
+        stats = {}
+        for timestamp, value in self.samples(device_id, field, start, end):
+            index = timestamp // bucket
+            low, high, total, count = stats.get(index, (value, value, 0.0, 0))
+            stats[index] = min(low, value), max(high, value), total + value, count + 1
+        return [
+            Bucket(index * bucket, low, high, total / count, count)
+            for index, (low, high, total, count) in sorted(stats.items())
+        ]
@@ -0,0 +1,108 @@
+"""
+Parse and encode Engine.IO (v3) and Socket.IO packets.
+
+An Engine.IO packet is a type digit followed by its data. The data of
+a message packet is a Socket.IO packet: a type digit, optionally
+followed by the number of binary attachments, the namespace, an
+ack id and the JSON payload.
+"""
+
+import json
+from typing import Any, NamedTuple, Optional
+
+from . import codec
+
+_decoder = json.JSONDecoder()
+
+
+class EngineIO:
+    OPEN = '0'
+    CLOSE = '1'
+    PING = '2'
+    PONG = '3'
+    MESSAGE = '4'
+
+
+class SocketIO:
+    CONNECT = 0
+    DISCONNECT = 1
+    EVENT = 2
+    ACK = 3
+    ERROR = 4
+    BINARY_EVENT = 5
+    BINARY_ACK = 6
+
+
+class Packet(NamedTuple):
+    """A Socket.IO packet."""
+
+    type: int
+    namespace: str = '/'
+    id: Optional[int] = None
+    data: Any = None
+
+
+def parse(text, pos=0):
+    """
+    Parse the Socket.IO packet in ``text`` at ``pos``, decoding its
+    payload directly from the text.
+
+    >>> parse('2["com.goabode.device.update","ZW:01"]')
+    Packet(type=2, namespace='/', id=None, data=['com.goabode.device.update', 'ZW:01'])
+    >>> parse('42/alarm,17["update"]', pos=1)
+    Packet(type=2, namespace='/alarm', id=17, data=['update'])
+    >>> parse('0/alarm,')
+    Packet(type=0, namespace='/alarm', id=None, data=None)
+    >>> parse('51-/alarm,["image",{"_placeholder":true,"num":0}]')
+    Packet(type=5, namespace='/alarm', id=None, data=['image', {...}])
+    >>> parse('3')
+    Packet(type=3, namespace='/', id=None, data=None)
+    """
+    end = len(text)
+    type = ord(text[pos]) - 48
+    pos += 1
+
+    if type in (SocketIO.BINARY_EVENT, SocketIO.BINARY_ACK):
+        pos = text.index('-', pos) + 1
+
+    namespace = '/'
+    if pos < end and text[pos] == '/':
+        comma = text.find(',', pos)
+        if comma == -1:
+            comma = end
+        namespace = text[pos:comma]
+        pos = comma + 1
+
+    start = pos
+    while pos < end and '0' <= text[pos] <= '9':
+        pos += 1
+    id = int(text[start:pos]) if pos > start else None
+
+    data = _decode(text, pos) if pos < end else None
+    return Packet(type, namespace, id, data)
+
+
+def _decode(text, pos):
+    if codec.name == 'json':
+        # decode in place, without copying the payload
+        return _decoder.raw_decode(text, pos)[0]
+    return codec.loads(text[pos:])
+
+
+def encode(type, data=None, namespace='/', id=None):
+    """
+    Encode a Socket.IO packet (as the data of an Engine.IO message).
+
+    >>> encode(SocketIO.ACK, [], namespace='/alarm', id=17)
+    '43/alarm,17[]'
+    >>> encode(SocketIO.EVENT, ['ping'])
+    '42["ping"]'
+    """
+    parts = [EngineIO.MESSAGE, str(type)]
+    if namespace != '/':
+        parts.append(namespace + ',')
+    if id is not None:
+        parts.append(str(id))
+    if data is not None:
+        parts.append(codec.dumps(data))
+    return ''.join(parts)
@@ -0,0 +1,109 @@
+"""
+Run a plan of steps concurrently, keeping the steps affecting the
+same thing in order.
+"""
+
+import concurrent.futures
+import contextvars
+import logging
+import time
+from typing import Any, Callable, Hashable, NamedTuple, Optional
+
+log = logging.getLogger(__name__)
+
+
+class Step(NamedTuple):
+    """
+    An action (``func``) affecting ``key`` (e.g. a device), which
+    runs after any earlier step with the same key and returns a true
+    value if it succeeded.
+    """
+
+    key: Hashable
+    label: str
+    func: Callable[[], Any]
+
+
+class Outcome(NamedTuple):
+    """
+    The time taken by a :class:`Step`, the value it returned and the
+    exception it raised, if any.
+    """
+
+    step: Step
+    elapsed: float
+    result: Any = None
+    exception: Optional[BaseException] = None
+
+    @property
+    def ok(self):
+        return self.exception is None and bool(self.result)
+
+
+def _run(step, prior):
+    if prior is not None:
+        concurrent.futures.wait([prior])
+    start = time.monotonic()
+    try:
+        result = step.func()
+    except Exception as exc:
+        return Outcome(step, time.monotonic() - start, exception=exc)
+    return Outcome(step, time.monotonic() - start, result)
+
+
+def run(steps, workers=4):
+    """
+    Run the steps on up to ``workers`` threads, each in a copy of
+    the caller's context (see :mod:`contextvars`), returning the
+    :class:`Outcome` of each, in order.
+
+    >>> order = []
+    >>> def act(name):
+    ...     order.append(name)
+    ...     return True
+    >>> steps = [
+    ...     Step('cam', 'capture', lambda: time.sleep(0.01) or act('capture')),
+    ...     Step('lock', 'unlock', lambda: act('unlock')),
+    ...     Step('cam', 'image', lambda: act('image')),
+    ...     Step('lock', 'fail', lambda: 1 / 0),
+    ...     Step('switch', 'not found', lambda: None),
+    ... ]
+    >>> outcomes = run(steps)
+    >>> order.index('capture') < order.index('image')
+    True
+    >>> [outcome.ok for outcome in outcomes]
+    [True, True, True, False, False]
+    """
+    last = {}
+    with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = []
+        for step in steps:
+            context = contextvars.copy_context()
+            future = pool.submit(context.run, _run, step, last.get(step.key))
+            futures.append(future)
+            last[step.key] = future
+    return [future.result() for future in futures]
+
+
+def report(outcomes, elapsed):
+    """Log the outcome of each step and the total time."""
+    for outcome in outcomes:
+        if outcome.ok:
+            log.info("%s: done in %.2fs", outcome.step.label, outcome.elapsed)
+        elif outcome.exception is None:
+            log.error("%s: failed in %.2fs", outcome.step.label, outcome.elapsed)
+        else:
+            log.error(
+                "%s: failed in %.2fs: %s",
+                outcome.step.label,
+                outcome.elapsed,
+                outcome.exception,
+            )
+    failed = sum(not outcome.ok for outcome in outcomes)
+    log.info(
+        "%d actions (%d failed) in %.2fs (%.2fs if run serially)",
+        len(outcomes),
+        failed,
+        elapsed,
+        sum(outcome.elapsed for outcome in outcomes),
+    )
@@ -0,0 +1,192 @@
+"""Deadlines and retry policies for requests to Abode."""
+
+import asyncio
+import collections
+import concurrent.futures
+import random
+import threading
+import time
+
+from .exceptions import AuthenticationException, TransientException
+from .helpers import errors as ERROR
+
+
+class Metrics(collections.Counter):
+    """
+    Counts that may be incremented from any thread.
+
+    >>> metrics = Metrics()
+    >>> metrics.count('retries')
+    >>> metrics['retries']
+    1
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._lock = threading.Lock()
+
+    def count(self, name):
+        with self._lock:
+            self[name] += 1
+
+
+class Deadline:
+    """
+    The time by which an operation (possibly spanning several
+    requests) must complete.
+
+    >>> Deadline(None).remaining is None
+    True
+    >>> 0 < Deadline(5).remaining <= 5
+    True
+    >>> Deadline(0).check()
+    Traceback (most recent call last):
+    ...
+    jaraco.abode.exceptions.TransientException: (35, ...)
+    """
+
+    def __init__(self, timeout):
+        self.expires = None if timeout is None else time.monotonic() + timeout
+
+    @classmethod
+    def of(cls, timeout):
+        """A deadline for the timeout (or the deadline itself)."""
+        return timeout if isinstance(timeout, cls) else cls(timeout)
+
+    @property
+    def remaining(self):
+        """Seconds remaining until the deadline (``None`` if unbounded)."""
+        if self.expires is None:
+            return None
+        return max(self.expires - time.monotonic(), 0)
+
+    def check(self):
+        """Return the seconds remaining, raising if none remain."""
+        remaining = self.remaining
+        if remaining == 0:
+            raise TransientException(ERROR.REQUEST_TIMEOUT)
+        return remaining
+
+    def allows(self, delay):
+        """Whether waiting ``delay`` seconds leaves time for another attempt."""
+        remaining = self.remaining
+        return remaining is None or delay < remaining
+
+
+class RetryPolicy:
+    """
+    How failed requests are retried.
+
+    Authentication failures are retried once, after logging in again.
+    Transient failures (see :class:`TransientException`) are retried
+    up to ``retries`` times without logging in again, after waiting an
+    exponentially increasing ``backoff`` (capped at ``max_backoff``
+    and randomized if ``jitter``), but never past the deadline.
+    Other failures are not retried.
+
+    If ``hedge_after`` is set, idempotent requests that haven't
+    completed after that many seconds are issued again, and the
+    first response to arrive is used.
+
+    >>> policy = RetryPolicy(retries=4, backoff=1, max_backoff=5, jitter=False)
+    >>> list(policy.delays())
+    [1, 2, 4, 5]
+    >>> delays = RetryPolicy(backoff=1).delays()
+    >>> all(0 <= delay <= 2**n for n, delay in enumerate(delays))
+    True
+    """
+
+    idempotent = frozenset({'get', 'head', 'options'})
+
+    def __init__(
+        self, retries=2, backoff=0.5, max_backoff=8.0, jitter=True, hedge_after=None
+    ):
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.jitter = jitter
+        self.hedge_after = hedge_after
+
+    def delays(self):
+        """The delay before each retry of a transient failure."""
+        for attempt in range(self.retries):
+            delay = min(self.backoff * 2**attempt, self.max_backoff)
+            yield random.uniform(0, delay) if self.jitter else delay
+
+    def _next_delay(self, delays, deadline):
+        delay = next(delays, None)
+        return delay if delay is not None and deadline.allows(delay) else None
+
+    def call(self, attempt, reauthenticate, deadline, metrics):
+        """
+        Invoke ``attempt`` until it succeeds or the failure is final,
+        invoking ``reauthenticate`` before retrying an authentication
+        failure.
+        """
+        delays = self.delays()
+        reauthenticated = False
+        while True:
+            try:
+                return attempt()
+            except AuthenticationException:
+                if reauthenticated:
+                    raise
+                reauthenticated = True
+                metrics.count('reauthentications')
+                reauthenticate()
+            except TransientException:
+                delay = self._next_delay(delays, deadline)
+                if delay is None:
+                    raise
+                metrics.count('retries')
+                time.sleep(delay)
+
+    async def call_async(self, attempt, reauthenticate, deadline, metrics):
+        """Like :meth:`call`, but for coroutine functions."""
+        delays = self.delays()
+        reauthenticated = False
+        while True:
+            try:
+                return await attempt()
+            except AuthenticationException:
+                if reauthenticated:
+                    raise
+                reauthenticated = True
+                metrics.count('reauthentications')
+                await reauthenticate()
+            except TransientException:
+                delay = self._next_delay(delays, deadline)
+                if delay is None:
+                    raise
+                metrics.count('retries')
+                await asyncio.sleep(delay)
+
+    def hedges(self, method):
+        """Whether requests with this method are hedged."""
+        return self.hedge_after is not None and method.lower() in self.idempotent
+
+    def hedge(self, request, executor, metrics):
+        """
+        Invoke ``request`` in the executor, invoking it again if it
+        hasn't completed after ``hedge_after`` seconds, and return
+        the first successful result.
+        """
+        first = executor.submit(request)
+        try:
+            return first.result(timeout=self.hedge_after)
+        except concurrent.futures.TimeoutError:
+            pass
+
+        metrics.count('hedged')
+        second = executor.submit(request)
+        error = None
+        for future in concurrent.futures.as_completed((first, second)):
+            try:
+                result = future.result()
+            except Exception as exc:
+                error = exc
+                continue
+            if future is second:
+                metrics.count('hedge_wins')
+            return result
+        raise error
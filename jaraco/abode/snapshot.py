@@ -0,0 +1,102 @@
+"""Snapshots of the state of an Abode system, persisted to disk."""
+
+import contextlib
+import hashlib
+import logging
+import os
+import time
+
+from . import codec, config
+from .devices import alarm as ALARM
+
+log = logging.getLogger(__name__)
+
+
+class Snapshot:
+    """
+    The panel, device and automation states of the account of
+    ``username``, as of ``saved`` (seconds since the epoch).
+
+    >>> snap = Snapshot(
+    ...     panel={'mode': {}}, devices=[], automations=None, saved=0, username='me'
+    ... )
+    >>> path = getfixture('tmp_path') / 'snapshot.json'
+    >>> snap.save(path)
+    >>> Snapshot.load(path, username='me').panel
+    {'mode': {}}
+    >>> Snapshot.load(path, username='other') is None
+    True
+    >>> Snapshot.load(path, max_age=60, username='me') is None
+    True
+    >>> Snapshot.load(path.with_name('missing.json')) is None
+    True
+    """
+
+    def __init__(self, panel, devices, automations, saved=None, username=None):
+        self.panel = panel
+        self.devices = devices
+        self.automations = automations
+        self.saved = time.time() if saved is None else saved
+        self.username = username
+
+    @classmethod
+    def capture(cls, client):
+        """Capture the states loaded by the client."""
+        devices = (
+            [
+                dict(device._state)
+                for device in list(client._devices.values())
+                if not isinstance(device, ALARM.Alarm)
+            ]
+            if client._devices is not None
+            else None
+        )
+        automations = (
+            [
+                dict(automation._state)
+                for automation in list(client._automations.values())
+            ]
+            if client._automations is not None
+            else None
+        )
+        return cls(dict(client._panel), devices, automations, username=client._username)
+
+    @property
+    def age(self):
+        """Seconds since the snapshot was taken."""
+        return time.time() - self.saved
+
+    @staticmethod
+    def default_path(username):
+        """The path of the snapshot for the account of ``username``."""
+        key = hashlib.sha256(str(username).encode('utf-8')).hexdigest()[:16]
+        return config.paths.user_data / f'snapshot-{key}.json'
+
+    def save(self, path=None):
+        """Save the snapshot (atomically replacing any previous one)."""
+        path = path or self.default_path(self.username)
+        tmp = path.with_name(path.name + '.tmp')
+        tmp.write_text(codec.dumps(vars(self)), encoding='utf-8')
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path=None, max_age=None, username=None):
+        """
+        Load the saved snapshot of the account of ``username``, unless
+        it's missing, unreadable, for another account or older than
+        ``max_age`` seconds.
+        """
+        path = path or cls.default_path(username)
+        with contextlib.suppress(FileNotFoundError):
+            try:
+                snapshot = cls(**codec.loads(path.read_bytes()))
+            except (ValueError, TypeError) as exc:
+                log.warning("Ignoring invalid snapshot %s: %s", path, exc)
+                return None
+            if snapshot.username != username:
+                log.debug("Ignoring snapshot of another account")
+                return None
+            if max_age is None or snapshot.age <= max_age:
+                return snapshot
+            log.debug("Ignoring snapshot %.0f seconds old", snapshot.age)
+        return None
@@ -2,36 +2,24 @@
 
 import collections
 import contextlib
-import datetime
 import itertools
-import json
 import logging
 import random
 import threading
+import time
 import urllib.parse
 
 from lomond import WebSocket, events
 from lomond.errors import WebSocketError
 from lomond.persist import persist
 
-import jaraco.collections
-
+from . import codec, packets
 from .exceptions import SocketIOException
 from .helpers import errors as ERRORS
 
 log = logging.getLogger(__name__)
 
 
-class EngineIO:
-    codes = jaraco.collections.BijectiveMap(
-        open=0,
-        close=1,
-        ping=2,
-        pong=3,
-        message=4,
-    )
-
-
 class BackoffIntervals:
     """
     >>> bi = BackoffIntervals()
@@ -60,39 +48,69 @@ class BackoffIntervals:
         self.attempts = itertools.count(*args)
 
 
-def find_json_list(text):
-    r"""
-    >>> find_json_list('["foo",\n\t"bar"]')
-    ['foo', 'bar']
-    >>> find_json_list('{"abc": ["123"]}')
-    ['123']
-    >>> find_json_list('{"abc": null}')
-    Traceback (most recent call last):
-    ...
-    ValueError: ...
-    >>> find_json_list('some text string')
-    Traceback (most recent call last):
-    ...
-    ValueError: ...
+class Keepalive:
+    """
+    Invoke ``ping`` every ``interval`` seconds and ``expire`` if no
+    packet is ``received`` for ``timeout`` seconds, on a thread that
+    wakes only at those deadlines (on the monotonic clock).
+
+    >>> pings = []
+    >>> expired = threading.Event()
+    >>> keepalive = Keepalive(0.01, 0.05, lambda: pings.append(1), expired.set)
+    >>> keepalive.start()
+    >>> expired.wait(1)
+    True
+    >>> len(pings) > 1
+    True
     """
-    l_bracket = text.find("[")
-    r_bracket = text.rfind("]")
 
-    if l_bracket == -1 or r_bracket == -1:
-        raise ValueError("No list found", text)
+    def __init__(self, interval, timeout, ping, expire):
+        self.interval = interval
+        self.timeout = timeout
+        self._ping = ping
+        self._expire = expire
+        self._stopped = threading.Event()
+        self._last_packet = time.monotonic()
+        self._thread = threading.Thread(
+            target=self._run, name='SocketIOKeepalive', daemon=True
+        )
 
-    return json.loads(text[l_bracket : r_bracket + 1])
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stopped.set()
+
+    def received(self):
+        """Note that a packet was received."""
+        self._last_packet = time.monotonic()
+
+    def _run(self):
+        next_ping = time.monotonic()
+        while True:
+            now = time.monotonic()
+            expires = self._last_packet + self.timeout
+            if now >= expires:
+                log.warning("SocketIO Server Ping Timeout")
+                self._expire()
+                return
+            if now >= next_ping:
+                self._ping()
+                next_ping = now + self.interval
+            if self._stopped.wait(min(next_ping, expires) - now):
+                return
 
 
 class SocketIO:
-    """Class for using websockets to talk to a SocketIO server."""
+    """
+    Class for using websockets to talk to a SocketIO server.
+
+    Pings and ping timeouts are handled by a :class:`Keepalive`, so
+    the websocket is only polled every ``poll`` seconds for lomond's
+    own housekeeping.
+    """
 
-    codes = jaraco.collections.BijectiveMap(
-        connect=0,
-        disconnect=1,
-        event=2,
-        error=4,
-    )
+    poll = 60.0
 
     def __init__(self, url, cookie=None, origin=None):
         params = dict(EIO=3, transport='websocket')
@@ -110,11 +128,24 @@ class SocketIO:
         self._engineio_connected = False
         self._socketio_connected = False
 
-        self._last_ping_time = datetime.datetime.min
-        self._last_packet_time = datetime.datetime.min
+        self._keepalive = None
 
         self._callbacks = collections.defaultdict(list)
 
+        self._engineio_handlers = {
+            packets.EngineIO.OPEN: self._on_engineio_open,
+            packets.EngineIO.CLOSE: self._on_engineio_close,
+            packets.EngineIO.PONG: self._on_engineio_pong,
+            packets.EngineIO.MESSAGE: self._on_engineio_message,
+        }
+        self._socketio_handlers = {
+            packets.SocketIO.CONNECT: self._on_socketio_connected,
+            packets.SocketIO.DISCONNECT: self._on_socketio_disconnected,
+            packets.SocketIO.EVENT: self._on_socketio_event,
+            packets.SocketIO.ACK: self._on_socketio_ack,
+            packets.SocketIO.ERROR: self._on_socketio_error,
+        }
+
     def set_origin(self, origin=None):
         """Set the Origin header."""
         self._origin = origin
@@ -152,6 +183,11 @@ class SocketIO:
         if self._exit_event:
             self._exit_event.set()
 
+        # Close promptly rather than waiting for the next poll
+        if self._websocket_connected:
+            with contextlib.suppress(WebSocketError):
+                self._websocket.close()
+
         self._thread.join()
 
     def _run(self):
@@ -194,7 +230,7 @@ class SocketIO:
         self._add_header('Origin', self._origin)
 
         for event in persist(
-            self._websocket, ping_rate=0, poll=5.0, exit_event=self._exit_event
+            self._websocket, ping_rate=0, poll=self.poll, exit_event=self._exit_event
         ):
             if isinstance(event, events.Connected):
                 intervals.reset()
@@ -213,6 +249,7 @@ class SocketIO:
         self._handle_event('connected')
 
     def _on_websocket_disconnected(self, _event):
+        self._stop_keepalive()
         self._websocket_connected = False
         self._engineio_connected = False
         self._socketio_connected = False
@@ -221,94 +258,114 @@ class SocketIO:
         self._handle_event('disconnected')
 
     def _on_websocket_poll(self, _event):
-        last_packet_delta = datetime.datetime.now() - self._last_packet_time
+        self._handle_event('poll')
 
-        if self._engineio_connected and last_packet_delta > self._ping_timeout:
-            log.warning("SocketIO Server Ping Timeout")
-            self._websocket.close()
+    def _ping(self):
+        try:
+            self._websocket.send_text(packets.EngineIO.PING)
+        except WebSocketError as exc:
+            log.debug("Unable to ping: %s", exc)
             return
+        log.debug("Client Ping")
+        self._handle_event('ping')
 
-        last_ping_delta = datetime.datetime.now() - self._last_ping_time
+    def _expire(self):
+        # Drop the connection (rather than closing it gracefully), as
+        # the server isn't responding.
+        self._websocket.session.close()
 
-        if self._engineio_connected and last_ping_delta >= self._ping_interval:
-            self._websocket.send_text(str(EngineIO.codes['ping']))
-            self._last_ping_time = datetime.datetime.now()
-            log.debug("Client Ping")
-            self._handle_event('ping')
-
-        self._handle_event('poll')
+    def _stop_keepalive(self):
+        if self._keepalive:
+            self._keepalive.stop()
+        self._keepalive = None
 
     def _on_websocket_text(self, _event):
-        self._last_packet_time = datetime.datetime.now()
-
-        log.debug("Received: %s", _event.text)
+        if self._keepalive:
+            self._keepalive.received()
 
-        code = int(_event.text[:1])
-        message = _event.text[1:]
+        text = _event.text
+        log.debug("Received: %s", text)
 
-        try:
-            name = EngineIO.codes[code]
-            handler = getattr(self, f'_on_engineio_{name}')
-            handler(message)
-        except KeyError:
+        handler = self._engineio_handlers.get(text[:1])
+        if handler is None:
             log.debug("Ignoring unrecognized EngineIO packet")
+            return
+        handler(text)
 
     def _on_websocket_backoff(self, _event):
         return
 
-    def _on_engineio_open(self, message):
-        packet = json.loads(message)
+    def _on_engineio_open(self, text):
+        packet = codec.loads(text[1:])
 
-        self._ping_interval = datetime.timedelta(milliseconds=packet['pingInterval'])
-        log.debug("Set ping interval to %s", self._ping_interval)
+        interval = packet['pingInterval'] / 1000
+        log.debug("Set ping interval to %s seconds", interval)
 
-        self._ping_timeout = datetime.timedelta(milliseconds=packet['pingTimeout'])
-        log.debug("Set ping timeout to %s", self._ping_timeout)
+        timeout = packet['pingTimeout'] / 1000
+        log.debug("Set ping timeout to %s seconds", timeout)
+
+        self._stop_keepalive()
+        self._keepalive = Keepalive(interval, timeout, self._ping, self._expire)
+        self._keepalive.start()
 
         self._engineio_connected = True
         log.debug("EngineIO Connected")
 
-    def _on_engineio_close(self, message):
+    def _on_engineio_close(self, text):
         self._engineio_connected = False
         log.debug("EngineIO Disconnected")
         self._websocket.close()
 
-    def _on_engineio_pong(self, message):
+    def _on_engineio_pong(self, text):
         log.debug("Server Pong")
         self._handle_event('pong')
 
-    def _on_engineio_message(self, message):
-        code = int(message[:1])
-        data = message[1:]
-
+    def _on_engineio_message(self, text):
         try:
-            name = SocketIO.codes[code]
-            handler = getattr(self, f'_on_socketio_{name}')
-            handler(data)
-        except KeyError:
-            log.debug("Ignoring SocketIO message: %s", message)
+            packet = packets.parse(text, pos=1)
+        except (ValueError, IndexError):
+            log.warning("Unable to parse SocketIO message: %s", text)
+            return
+
+        handler = self._socketio_handlers.get(packet.type)
+        if handler is None:
+            log.debug("Ignoring SocketIO message: %s", text)
+            return
+        # callbacks receive the packet text following the type, as before
+        handler(packet, text[2:])
 
-    def _on_socketio_connected(self):
+    def _on_socketio_connected(self, packet, raw):
         self._socketio_connected = True
-        log.debug("SocketIO Connected")
+        log.debug("SocketIO Connected to %s", packet.namespace)
 
-    def _on_socketio_disconnected(self):
+    def _on_socketio_disconnected(self, packet, raw):
         self._socketio_connected = False
-        log.debug("SocketIO Disconnected")
+        log.debug("SocketIO Disconnected from %s", packet.namespace)
         self._websocket.close()
 
-    def _on_socketio_error(self, _message_data):
-        self._handle_event('error', _message_data)
-        raise SocketIOException(ERRORS.SOCKETIO_ERROR, details=_message_data)
+    def _on_socketio_error(self, packet, raw):
+        self._handle_event('error', raw)
+        raise SocketIOException(ERRORS.SOCKETIO_ERROR, details=raw)
 
-    def _on_socketio_event(self, _message_data):
-        try:
-            json_data = find_json_list(_message_data)
-        except ValueError:
-            log.warning("Unable to find event [data]: %s", _message_data)
+    def _on_socketio_ack(self, packet, raw):
+        log.debug("Ignoring SocketIO ack %s", packet.id)
+
+    def _on_socketio_event(self, packet, raw):
+        data = packet.data
+        if not isinstance(data, list) or not data:
+            log.warning("Unable to find event [data]: %s", data)
             return
-        self._handle_event('event', _message_data)
-        self._handle_event(json_data[0], json_data[1:])
+        if packet.id is not None:
+            self._send_ack(packet)
+        self._handle_event('event', raw)
+        self._handle_event(data[0], data[1:])
+
+    def _send_ack(self, packet):
+        ack = packets.encode(packets.SocketIO.ACK, [], packet.namespace, packet.id)
+        try:
+            self._websocket.send_text(ack)
+        except WebSocketError as exc:
+            log.debug("Unable to acknowledge event: %s", exc)
 
     def _handle_event(self, event_name, *args):
         for callback in self._callbacks[event_name]:
@@ -1,11 +1,150 @@
+import collections.abc
+import itertools
 import logging
+import sys
 
 from jaraco.collections import DictAdapter, Projection
 
+from . import codec
 from ._itertools import single
 
 log = logging.getLogger(__name__)
 
+_missing = object()
+
+
+def diff(old, new):
+    """
+    The keys whose values differ between two states.
+
+    >>> sorted(diff({'a': 1, 'b': {'c': 2}, 'e': 5}, {'a': 1, 'b': {'c': 3}, 'd': 4}))
+    ['b', 'd', 'e']
+    >>> diff({'a': 1}, {'a': 1})
+    set()
+    """
+    return {
+        key
+        for key in old.keys() | new.keys()
+        if old.get(key, _missing) != new.get(key, _missing)
+    }
+
+
+class CompactState(collections.abc.MutableMapping):
+    """
+    A device state holding the frequently-read fields in slots and
+    the others encoded as JSON, decoded on demand. String values of
+    the slotted fields are interned, so that devices share them.
+
+    >>> state = CompactState(id='ZW:01', status='Closed', name='Door', zone='1')
+    >>> state['status'], state['name']
+    ('Closed', 'Door')
+    >>> state.update(status='Open', name='Front Door')
+    >>> dict(state) == dict(id='ZW:01', status='Open', name='Front Door', zone='1')
+    True
+    >>> del state['zone']
+    >>> 'zone' in state, 'uuid' in state
+    (False, False)
+    >>> state.update_known(dict(status='Closed', zone='2', area='1'))
+    >>> state['status'], 'zone' in state
+    ('Closed', False)
+    >>> state['uuid']
+    Traceback (most recent call last):
+    ...
+    KeyError: 'uuid'
+
+    Values decoded on demand are copies; to change a nested value,
+    assign the key.
+    """
+
+    __slots__ = (
+        'id',
+        'uuid',
+        'type_tag',
+        'type',
+        'name',
+        'status',
+        'faults',
+        'statuses',
+        '_rest',
+    )
+    slotted = frozenset(__slots__[:-1])
+
+    def __init__(self, state=(), **kwargs):
+        self._rest = None
+        self.update(state, **kwargs)
+
+    def __getitem__(self, key):
+        if key in self.slotted:
+            try:
+                return getattr(self, key)
+            except AttributeError:
+                raise KeyError(key) from None
+        return self._decoded()[key]
+
+    def __contains__(self, key):
+        if key in self.slotted:
+            return hasattr(self, key)
+        return key in self._decoded()
+
+    def __setitem__(self, key, value):
+        self.update({key: value})
+
+    def __delitem__(self, key):
+        if key in self.slotted:
+            try:
+                delattr(self, key)
+            except AttributeError:
+                raise KeyError(key) from None
+            return
+        rest = self._decoded()
+        del rest[key]
+        self._encode(rest)
+
+    def __iter__(self):
+        slotted = (key for key in self.__slots__[:-1] if hasattr(self, key))
+        return itertools.chain(slotted, self._decoded())
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+    def __repr__(self):
+        return f'{type(self).__name__}({dict(self)!r})'
+
+    def update(self, other=(), /, **kwargs):
+        """Update the state, encoding the other fields only once."""
+        rest = None
+        for key, value in itertools.chain(dict(other).items(), kwargs.items()):
+            if key in self.slotted:
+                setattr(self, key, sys.intern(value) if type(value) is str else value)
+                continue
+            if rest is None:
+                rest = self._decoded()
+            rest[key] = value
+        if rest is not None:
+            self._encode(rest)
+
+    def update_known(self, state):
+        """Update only the fields already present, decoding the others once."""
+        rest = self._decoded()
+        changed = False
+        for key, value in state.items():
+            if key in self.slotted:
+                if hasattr(self, key):
+                    setattr(
+                        self, key, sys.intern(value) if type(value) is str else value
+                    )
+            elif key in rest:
+                rest[key] = value
+                changed = True
+        if changed:
+            self._encode(rest)
+
+    def _decoded(self):
+        return codec.loads(self._rest) if self._rest else {}
+
+    def _encode(self, rest):
+        self._rest = codec.dumps(rest).encode('utf-8') if rest else None
+
 
 class Stateful:
     def __init__(self, state, client):
@@ -24,6 +163,9 @@ class Stateful:
 
         Only updates keys already present.
         """
+        if isinstance(self._state, CompactState):
+            self._state.update_known(state)
+            return
         self._state.update(Projection(self._state, state))
 
     @property
@@ -36,14 +178,17 @@ class Stateful:
 
         Useful when not using the notification service.
         """
-        tmpl = path or self._url_t
-        path = tmpl.format(id=self.id)
+        response = self._client.send_request(
+            method="get", path=self._refresh_path(path)
+        )
 
-        response = self._client.send_request(method="get", path=path)
-        state = single(response.json())
+        return self._refreshed(single(codec.loads(response.content)))
 
-        log.debug(f"{self.__class__.__name__} Refresh Response: %s", response.text)
+    def _refresh_path(self, path=None):
+        tmpl = path or self._url_t
+        return tmpl.format(id=self.id)
 
+    def _refreshed(self, state):
         self._validate(state)
         self.update(state)
 
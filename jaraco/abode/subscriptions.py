@@ -0,0 +1,83 @@
+"""Index of timeline event subscriptions."""
+
+import itertools
+
+from .helpers import timeline as TIMELINE
+
+
+class TimelineIndex:
+    """
+    Timeline callbacks, subscribed by event code (including all codes),
+    event group, range of event codes or predicate on the event code.
+
+    The callbacks for an event code are resolved once and cached
+    until the subscriptions change.
+
+    >>> index = TimelineIndex()
+    >>> index.add_code(TIMELINE.CAPTURE_IMAGE['event_code'], 'image')
+    >>> index.add_code(TIMELINE.ALL['event_code'], 'all')
+    >>> index.add_group(TIMELINE.Groups.CAPTURE, 'capture')
+    >>> index.add_range(range(5000, 5100), 'range')
+    >>> index.add_predicate(lambda code: code % 2, 'odd')
+    >>> index['5001']
+    ('image', 'all', 'capture', 'range', 'odd')
+    >>> index['1100']
+    ('all',)
+    >>> index.group(TIMELINE.Groups.CAPTURE)
+    ('capture',)
+    """
+
+    def __init__(self):
+        self._codes = {}
+        self._groups = {}
+        self._ranges = []
+        self._predicates = []
+        self._index = {}
+
+    def _changed(self):
+        self._index = {}
+
+    def add_code(self, event_code, callback):
+        """Subscribe to events with the code (``'0'`` for all events)."""
+        self._codes.setdefault(str(event_code), []).append(callback)
+        self._changed()
+
+    def add_group(self, event_group, callback):
+        """Subscribe to events in the group (see :class:`TIMELINE.Groups`)."""
+        self._groups.setdefault(event_group, []).append(callback)
+        self._changed()
+
+    def add_range(self, event_codes, callback):
+        """Subscribe to events with codes in the range."""
+        self._ranges.append((event_codes, callback))
+        self._changed()
+
+    def add_predicate(self, predicate, callback):
+        """Subscribe to events whose (integer) code satisfies the predicate."""
+        self._predicates.append((predicate, callback))
+        self._changed()
+
+    def __getitem__(self, event_code):
+        """The callbacks for events with the code."""
+        try:
+            return self._index[event_code]
+        except KeyError:
+            pass
+        callbacks = self._index[event_code] = self._resolve(event_code)
+        return callbacks
+
+    def _resolve(self, event_code):
+        code = int(event_code)
+        return tuple(
+            itertools.chain(
+                self._codes.get(str(event_code), ()),
+                self._codes.get(TIMELINE.ALL['event_code'], ()),
+                self._groups.get(TIMELINE.map_event_code(code), ()),
+                (callback for codes, callback in self._ranges if code in codes),
+                (callback for pred, callback in self._predicates if pred(code)),
+            )
+        )
+
+    def group(self, event_group):
+        """The callbacks subscribed to the group."""
+        return tuple(self._groups.get(event_group, ()))
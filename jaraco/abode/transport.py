@@ -0,0 +1,69 @@
+"""HTTP transport shared by the Abode API and image downloads."""
+
+import functools
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests_toolbelt import sessions
+
+from .helpers import urls
+
+
+class Transport:
+    """
+    Connection pools shared by the sessions talking to the Abode API
+    and downloading images, so that connections are reused across them.
+
+    ``pool_connections`` is the number of hosts for which to keep
+    pools and ``pool_maxsize`` the number of connections kept per host
+    (raise it to match the number of concurrent requests). With
+    ``keep_alive=False``, connections are closed after each request.
+
+    >>> transport = Transport(pool_maxsize=20)
+    >>> transport.stats()
+    {}
+    """
+
+    def __init__(self, pool_connections=10, pool_maxsize=10, keep_alive=True):
+        self.keep_alive = keep_alive
+        self.adapter = HTTPAdapter(
+            pool_connections=pool_connections, pool_maxsize=pool_maxsize
+        )
+
+    def mount(self, session):
+        """Configure the session to use this transport."""
+        session.mount('https://', self.adapter)
+        session.mount('http://', self.adapter)
+        if not self.keep_alive:
+            session.headers['Connection'] = 'close'
+        return session
+
+    def api_session(self):
+        """A new session for the Abode API."""
+        return self.mount(sessions.BaseUrlSession(urls.BASE))
+
+    @functools.cached_property
+    def downloads(self):
+        """The session for downloads (e.g. images) outside the API."""
+        return self.mount(requests.Session())
+
+    def stats(self):
+        """
+        Connection pool statistics by host: the number of connections
+        opened, requests made, and connections idle in the pool.
+        """
+        pools = self.adapter.poolmanager.pools
+        return {
+            f'{key.key_scheme}://{key.key_host}:{key.key_port}': _pool_stats(pools[key])
+            for key in pools.keys()
+        }
+
+
+def _pool_stats(pool):
+    # the queue holds a placeholder for each connection not yet opened
+    queue = list(pool.pool.queue) if pool.pool else []
+    return dict(
+        connections=pool.num_connections,
+        requests=pool.num_requests,
+        idle=sum(conn is not None for conn in queue),
+    )
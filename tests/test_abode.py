@@ -4,13 +4,20 @@ Test Abode system setup, shutdown, and general functionality.
 Tests the system initialization and attributes of the main Abode system.
 """
 
+import concurrent.futures
+import logging
+import time
+
 import pytest
 import requests
 
 import jaraco.abode
 import jaraco.abode.devices.status as STATUS
 from jaraco.abode import config, settings
+from jaraco.abode.exceptions import TransientException
+from jaraco.abode.helpers import errors as ERROR
 from jaraco.abode.helpers import urls
+from jaraco.abode.policy import RetryPolicy
 
 from . import mock as MOCK
 from .mock import devices as DEVICES
@@ -58,6 +65,17 @@ class TestAbode:
 
         self.client_no_cred.login(username=USERNAME, password=PASSWORD)
 
+    def test_login_response_redacted(self, m, caplog):
+        """Check that credentials in logged responses are redacted."""
+        m.post(urls.LOGIN, json=LOGIN.post_response_ok())
+        m.get(urls.OAUTH_TOKEN, json=OAUTH_CLAIMS.get_response_ok())
+
+        caplog.set_level(logging.DEBUG, logger='jaraco.abode')
+        self.client_no_cred.login(username=USERNAME, password=PASSWORD)
+
+        assert 'Login Response' in caplog.text
+        assert MOCK.AUTH_TOKEN not in caplog.text
+
     def test_manual_login_with_mfa(self, m):
         """Check that we can login with MFA code."""
         m.post(urls.LOGIN, json=LOGIN.post_response_ok())
@@ -303,6 +321,131 @@ class TestAbode:
         with pytest.raises(jaraco.abode.Exception):
             self.client.get_devices()
 
+    def test_concurrent_reauthentication(self, m):
+        """Check that requests rejected together log in again only once."""
+        new_token = 'FOOBAR'
+        m.post(
+            urls.LOGIN,
+            [
+                dict(json=LOGIN.post_response_ok()),
+                dict(json=LOGIN.post_response_ok(auth_token=new_token)),
+            ],
+        )
+        m.get(urls.OAUTH_TOKEN, json=OAUTH_CLAIMS.get_response_ok())
+
+        def respond(request, context):
+            if request.headers['ABODE-API-KEY'] != new_token:
+                context.status_code = 403
+                return MOCK.response_forbidden()
+            return DEVICES.EMPTY_DEVICE_RESPONSE
+
+        m.get(urls.DEVICES, json=respond)
+
+        self.client.login()
+        with concurrent.futures.ThreadPoolExecutor(max_workers=8) as pool:
+            futures = [
+                pool.submit(self.client.send_request, 'get', urls.DEVICES)
+                for _ in range(8)
+            ]
+        assert all(future.result().ok for future in futures)
+
+        logins = [req for req in m.request_history if req.path == urls.LOGIN]
+        assert len(logins) == 2
+        assert self.client._token == new_token
+
+    def test_proactive_refresh(self, m):
+        """Check that credentials are renewed before they expire."""
+        new_token = 'FOOBAR'
+        m.post(
+            urls.LOGIN,
+            [
+                dict(json=LOGIN.post_response_ok()),
+                dict(json=LOGIN.post_response_ok(auth_token=new_token)),
+            ],
+        )
+        m.get(urls.OAUTH_TOKEN, json=OAUTH_CLAIMS.get_response_ok())
+        m.get(urls.DEVICES, json=DEVICES.EMPTY_DEVICE_RESPONSE)
+
+        self.client.login()
+        assert 3000 < self.client._expires - time.monotonic() < 3600
+
+        self.client._expires = time.monotonic()
+        self.client.send_request('get', urls.DEVICES)
+
+        assert self.client._token == new_token
+        assert self.client.metrics['reauthentications'] == 0
+
+    def test_transient_failure_retried(self, m):
+        """Check that transient failures are retried without logging in again."""
+        self.client.retry_policy = RetryPolicy(backoff=0)
+        m.post(urls.LOGIN, json=LOGIN.post_response_ok())
+        m.get(urls.OAUTH_TOKEN, json=OAUTH_CLAIMS.get_response_ok())
+        m.get(
+            urls.DEVICES,
+            [
+                dict(exc=requests.exceptions.ReadTimeout),
+                dict(status_code=503),
+                dict(json=DEVICES.EMPTY_DEVICE_RESPONSE),
+            ],
+        )
+        m.get(urls.PANEL, json=PANEL.get_response_ok())
+
+        self.client.get_devices()
+
+        assert self.client.metrics['retries'] == 2
+        assert self.client.metrics['timeouts'] == 1
+        assert self.client.metrics['reauthentications'] == 0
+        assert len([req for req in m.request_history if req.path == urls.LOGIN]) == 1
+
+    def test_permanent_failure_not_retried(self, m):
+        """Check that client errors are neither retried nor reauthenticated."""
+        m.post(urls.LOGIN, json=LOGIN.post_response_ok())
+        m.get(urls.OAUTH_TOKEN, json=OAUTH_CLAIMS.get_response_ok())
+        m.get(urls.DEVICES, status_code=404)
+
+        with pytest.raises(jaraco.abode.Exception):
+            self.client.get_devices()
+
+        assert self.client.metrics['requests'] == 1
+
+    def test_deadline_exceeded(self, m):
+        """Check that no request is made past its deadline."""
+        m.post(urls.LOGIN, json=LOGIN.post_response_ok())
+        m.get(urls.OAUTH_TOKEN, json=OAUTH_CLAIMS.get_response_ok())
+
+        with pytest.raises(TransientException) as exc_info:
+            self.client.send_request('get', urls.DEVICES, timeout=0)
+
+        assert exc_info.value.errcode == ERROR.REQUEST_TIMEOUT[0]
+        assert self.client.metrics['requests'] == 0
+
+    def test_hedged_request(self, m, monkeypatch):
+        """Check that a slow GET is hedged by a second request."""
+        self.client.retry_policy = RetryPolicy(hedge_after=0.05)
+        m.post(urls.LOGIN, json=LOGIN.post_response_ok())
+        m.get(urls.OAUTH_TOKEN, json=OAUTH_CLAIMS.get_response_ok())
+        m.get(urls.DEVICES, json=DEVICES.EMPTY_DEVICE_RESPONSE)
+        m.post(urls.LOGOUT, json=LOGOUT.post_response_ok())
+        delays = iter([0.5, 0])
+        request = self.client._request
+
+        def slow_request(*args):
+            time.sleep(next(delays))
+            return request(*args)
+
+        monkeypatch.setattr(self.client, '_request', slow_request)
+
+        self.client.send_request('get', urls.DEVICES)
+
+        assert self.client.metrics['hedged'] == 1
+        assert self.client.metrics['hedge_wins'] == 1
+
+        executor = self.client._hedge_executor
+        assert executor._max_workers == self.client.hedge_workers
+        self.client.logout()
+        assert executor._shutdown
+        assert '_hedge_executor' not in vars(self.client)
+
     def test_default_mode(self):
         """Test that the default mode fails if not of type home or away."""
         self.client.set_default_mode('home')
@@ -363,6 +506,33 @@ class TestAbode:
         assert dc2b['id'] == dc2b_dev.id
         assert dc2a_dev is dc2b_dev
 
+    def test_compact_device_states(self, m):
+        """Check that devices with compact states read and refresh."""
+        devid = 'RF:01'
+        m.post(urls.LOGIN, json=LOGIN.post_response_ok())
+        m.get(urls.OAUTH_TOKEN, json=OAUTH_CLAIMS.get_response_ok())
+        m.get(urls.PANEL, json=PANEL.get_response_ok())
+        m.get(
+            urls.DEVICES,
+            json=DOOR_CONTACT.device(devid=devid, status=STATUS.OPEN, low_battery=True),
+        )
+
+        self.client.compact = True
+        device = self.client.get_device(devid)
+
+        assert isinstance(device._state, jaraco.abode.state.CompactState)
+        assert device.status == STATUS.OPEN
+        assert device.battery_low
+        assert device.name == 'Back Door'
+        assert device.is_on
+
+        m.get(urls.DEVICES, json=DOOR_CONTACT.device(devid=devid, status=STATUS.CLOSED))
+        self.client.get_devices(refresh=True)
+        assert self.client.get_device(devid) is device
+        assert device.status == STATUS.CLOSED
+        assert not device.is_on
+        assert not device.battery_low
+
     def test_settings_validation(self, m):
         """Check that device panel general settings are working."""
         m.post(urls.LOGIN, json=LOGIN.post_response_ok())
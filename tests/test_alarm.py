@@ -32,6 +32,38 @@ class TestAlarm:
 
         assert alarm_device._state == alarm
 
+    def test_alarm_state_shares_panel(self, m):
+        """Check that the alarm state is a view on the panel, not a copy."""
+        m.post(urls.LOGIN, json=LOGIN.post_response_ok())
+        m.get(urls.OAUTH_TOKEN, json=OAUTH_CLAIMS.get_response_ok())
+        m.get(urls.DEVICES, json=DEVICES.EMPTY_DEVICE_RESPONSE)
+        m.get(urls.PANEL, json=PANEL.get_response_ok(mode='standby'))
+
+        alarm = self.client.get_alarm()
+        assert alarm._state['mode'] is self.client._panel['mode']
+
+        m.get(urls.PANEL, json=PANEL.get_response_ok(mode='away'))
+        self.client.get_devices(refresh=True)
+
+        assert alarm.mode == 'away'
+        assert alarm.id == 'area_1'
+        assert alarm.name == 'Abode Alarm'
+
+    def test_alarm_state_after_login(self, m):
+        """Check that the alarm state remains a view on the panel after login."""
+        m.post(urls.LOGIN, json=LOGIN.post_response_ok())
+        m.get(urls.OAUTH_TOKEN, json=OAUTH_CLAIMS.get_response_ok())
+        m.get(urls.DEVICES, json=DEVICES.EMPTY_DEVICE_RESPONSE)
+        m.get(urls.PANEL, json=PANEL.get_response_ok(mode='standby'))
+        alarm = self.client.get_alarm()
+
+        login = dict(LOGIN.post_response_ok(), panel=PANEL.get_response_ok(mode='away'))
+        m.post(urls.LOGIN, json=login)
+        self.client.login()
+
+        assert alarm.mode == 'away'
+        assert alarm._state['mode'] is self.client._panel['mode']
+
     def test_alarm_device_properties(self, m):
         """Check that the abode device properties are working."""
         # Set up URLs
@@ -0,0 +1,267 @@
+"""Test the asyncio Abode client."""
+
+import asyncio
+import json
+import urllib.parse
+
+import pytest
+
+import jaraco.abode
+import jaraco.abode.devices.status as STATUS
+from jaraco.abode.async_client import AsyncClient
+from jaraco.abode.client import _cookies
+from jaraco.abode.helpers import urls
+from jaraco.abode.policy import RetryPolicy
+
+from . import mock as MOCK
+from .mock import devices as DEVICES
+from .mock import login as LOGIN
+from .mock import logout as LOGOUT
+from .mock import oauth_claims as OAUTH_CLAIMS
+from .mock import panel as PANEL
+from .mock.devices import door_lock as DOOR_LOCK
+from .mock.devices import power_switch_sensor as POWERSENSOR
+
+
+class FakeResponse:
+    def __init__(self, status=200, payload=None):
+        self.status = status
+        self.headers = {'Content-Type': 'application/json'}
+        self._body = json.dumps(payload).encode()
+
+    async def read(self):
+        return self._body
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        pass
+
+
+class FakeSession:
+    """
+    Stand-in for an aiohttp session, responding to registered paths.
+    """
+
+    def __init__(self):
+        self.responses = {}
+        self.requests = []
+
+    def register(self, method, path, *responses):
+        path = '/' + path.lstrip('/')
+        self.responses[method.upper(), path] = list(responses)
+
+    def request(
+        self, method, url, headers=None, json=None, cookies=None, allow_redirects=True
+    ):
+        path = urllib.parse.urlparse(url).path
+        self.requests.append((method, path, json))
+        self.cookies = dict(cookies or {})
+        responses = self.responses[method, path]
+        return responses.pop(0) if len(responses) > 1 else responses[0]
+
+
+@pytest.fixture
+def session():
+    session = FakeSession()
+    session.register('post', urls.LOGIN, FakeResponse(payload=LOGIN.post_response_ok()))
+    session.register(
+        'get', urls.OAUTH_TOKEN, FakeResponse(payload=OAUTH_CLAIMS.get_response_ok())
+    )
+    session.register(
+        'post', urls.LOGOUT, FakeResponse(payload=LOGOUT.post_response_ok())
+    )
+    session.register(
+        'get', urls.PANEL, FakeResponse(payload=PANEL.get_response_ok(mode='standby'))
+    )
+    session.register(
+        'get',
+        urls.DEVICES,
+        FakeResponse(
+            payload=[
+                POWERSENSOR.device(status=STATUS.OFF),
+                DOOR_LOCK.device(status=STATUS.Lock.CLOSED),
+            ]
+        ),
+    )
+    return session
+
+
+@pytest.fixture
+def client(session):
+    return AsyncClient(username='foobar', password='deadbeef', session=session)
+
+
+def test_login(client):
+    asyncio.run(client.login())
+    assert client._token == MOCK.AUTH_TOKEN
+    assert client._oauth_token == MOCK.OAUTH_TOKEN
+
+
+def test_get_devices(client):
+    devices = asyncio.run(client.get_devices())
+    assert {device.id for device in devices} == {
+        POWERSENSOR.DEVICE_ID,
+        DOOR_LOCK.DEVICE_ID,
+        'area_1',
+    }
+    alarm = asyncio.run(client.get_alarm())
+    assert alarm.mode == 'standby'
+
+
+def test_device_actions(client, session):
+    session.register(
+        'put',
+        POWERSENSOR.CONTROL_URL,
+        FakeResponse(
+            payload=DEVICES.status_put_response_ok(
+                devid=POWERSENSOR.DEVICE_ID, status=int(STATUS.ON)
+            )
+        ),
+    )
+    session.register(
+        'put',
+        DOOR_LOCK.CONTROL_URL,
+        FakeResponse(
+            payload=DEVICES.status_put_response_ok(
+                devid=DOOR_LOCK.DEVICE_ID, status=int(STATUS.Lock.OPEN)
+            )
+        ),
+    )
+
+    async def run():
+        switch = await client.get_device(POWERSENSOR.DEVICE_ID)
+        lock = await client.get_device(DOOR_LOCK.DEVICE_ID)
+        await asyncio.gather(client.switch_on(switch), client.unlock(lock))
+        return switch, lock
+
+    switch, lock = asyncio.run(run())
+    assert switch.is_on
+    assert not lock.is_locked
+
+
+def test_execute_many(client, session):
+    session.register(
+        'put',
+        POWERSENSOR.CONTROL_URL,
+        FakeResponse(
+            payload=DEVICES.status_put_response_ok(
+                devid=POWERSENSOR.DEVICE_ID, status=int(STATUS.ON)
+            )
+        ),
+    )
+
+    results = asyncio.run(
+        client.execute_many(
+            [
+                (POWERSENSOR.DEVICE_ID, 'switch_on'),
+                ('ZW:nonexistent', 'switch_on'),
+            ],
+            limit=1,
+        )
+    )
+
+    assert results[0].ok
+    assert isinstance(results[1].exception, jaraco.abode.Exception)
+    assert client._devices[POWERSENSOR.DEVICE_ID].is_on
+
+
+def test_execute_many_cancelled(client, monkeypatch):
+    async def cancelled(device):
+        raise asyncio.CancelledError()
+
+    monkeypatch.setattr(client, 'switch_on', cancelled)
+
+    (result,) = asyncio.run(client.execute_many([(POWERSENSOR.DEVICE_ID, 'switch_on')]))
+
+    assert not result.ok
+    assert isinstance(result.exception, asyncio.CancelledError)
+
+
+def test_invalid_status_response(client, session):
+    session.register(
+        'put',
+        POWERSENSOR.CONTROL_URL,
+        FakeResponse(
+            payload=DEVICES.status_put_response_ok(
+                devid=POWERSENSOR.DEVICE_ID, status=int(STATUS.OFF)
+            )
+        ),
+    )
+
+    async def run():
+        switch = await client.get_device(POWERSENSOR.DEVICE_ID)
+        await client.switch_on(switch)
+
+    with pytest.raises(jaraco.abode.Exception):
+        asyncio.run(run())
+
+
+def test_reauthorize(client, session):
+    new_token = 'FOOBAR'
+    session.register(
+        'post',
+        urls.LOGIN,
+        FakeResponse(payload=LOGIN.post_response_ok()),
+        FakeResponse(payload=LOGIN.post_response_ok(auth_token=new_token)),
+    )
+    session.register(
+        'get',
+        urls.DEVICES,
+        FakeResponse(status=403, payload=MOCK.response_forbidden()),
+        FakeResponse(payload=DEVICES.EMPTY_DEVICE_RESPONSE),
+    )
+
+    asyncio.run(client.get_devices())
+    assert client._token == new_token
+
+
+def test_close_logs_out(client, session):
+    async def run():
+        async with client:
+            await client.login()
+
+    asyncio.run(run())
+    assert client._token is None
+    assert session.requests[-1] == ('POST', urls.LOGOUT, None)
+
+
+def test_cookies_saved(client, session):
+    """Check that the uuid is saved on logout, sent and shared with Client."""
+    asyncio.run(client.login())
+    uuid = session.requests[0][2]['uuid']
+    asyncio.run(client.close())
+
+    assert _cookies().get('uuid') == uuid
+    again = AsyncClient(username='foobar', password='deadbeef', session=session)
+    asyncio.run(again.login())
+    assert session.requests[-2][2]['uuid'] == uuid
+    assert session.cookies['uuid'] == uuid
+
+
+def test_transient_failure_retried(client, session):
+    client.retry_policy = RetryPolicy(backoff=0)
+    session.register(
+        'get',
+        urls.DEVICES,
+        FakeResponse(status=503, payload={}),
+        FakeResponse(payload=DEVICES.EMPTY_DEVICE_RESPONSE),
+    )
+
+    asyncio.run(client.get_devices())
+    assert client.metrics['retries'] == 1
+    assert client.metrics['reauthentications'] == 0
+
+
+def test_single_login_when_expired(client, session):
+    async def run():
+        await client.login()
+        client._expires = 0
+        await asyncio.gather(
+            *(client.send_request('get', urls.PANEL) for _ in range(5))
+        )
+
+    asyncio.run(run())
+    logins = [req for req in session.requests if req[1] == urls.LOGIN]
+    assert len(logins) == 2
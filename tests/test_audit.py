@@ -0,0 +1,80 @@
+"""Test storing the timeline of events."""
+
+import pytest
+
+import jaraco.abode
+from jaraco.abode.audit import Store, pages
+from jaraco.abode.helpers import timeline as TIMELINE
+from jaraco.abode.helpers import urls
+
+from .mock import login as LOGIN
+from .mock import oauth_claims as OAUTH_CLAIMS
+
+
+def event(id, code='1100', utc=1700000000, device_id='RF:01'):
+    return dict(
+        id=str(id),
+        event_code=code,
+        event_type='Burglar',
+        event_utc=str(utc),
+        device_id=device_id,
+    )
+
+
+@pytest.fixture
+def timeline(m):
+    m.post(urls.LOGIN, json=LOGIN.post_response_ok())
+    m.get(urls.OAUTH_TOKEN, json=OAUTH_CLAIMS.get_response_ok())
+    newest = [event(5, utc=1700000500), event(4, code='5100', utc=1700000400)]
+    older = [event(3, code='1400', utc=1700000300, device_id='RF:02'), event(2)]
+    oldest = [event(1, utc=1699990000)]
+    m.get(f'{urls.TIMELINE}?dir=next&size=2', json=newest)
+    m.get(f'{urls.TIMELINE}?dir=next&size=2&id=4', json=older)
+    m.get(f'{urls.TIMELINE}?dir=next&size=2&id=2', json=oldest)
+    return m
+
+
+class TestAudit:
+    def test_pages(self, timeline):
+        """Check that pages follow the cursor until a short page."""
+        ids = [[ev['id'] for ev in page] for page in pages(self.client, size=2)]
+        assert ids == [['5', '4'], ['3', '2'], ['1']]
+
+    def test_backfill_and_query(self, timeline):
+        store = Store(':memory:')
+        assert store.backfill(self.client, size=2) == 5
+
+        assert [ev['id'] for ev in store.query(code=1100)] == ['5', '2', '1']
+        assert [ev['id'] for ev in store.query(group=TIMELINE.Groups.DEVICE)] == ['4']
+        assert [ev['id'] for ev in store.query(device_id='RF:02')] == ['3']
+        assert [ev['id'] for ev in store.query(start=1700000000, limit=2)] == [
+            '5',
+            '4',
+        ]
+        assert [ev['id'] for ev in store.query(end=1700000000)] == ['1']
+
+        with pytest.raises(jaraco.abode.Exception):
+            store.query(group='abode_unknown')
+
+        # the first page is already stored
+        assert store.backfill(self.client, size=2) == 0
+
+    def test_live_events_deduplicated(self, timeline):
+        store = Store(':memory:')
+        assert store.track(self.client.events)
+
+        self.client.events._on_timeline_update(event(6, utc=1700000600))
+        self.client.events._on_timeline_update(event(5, utc=1700000500))
+        store.backfill(self.client, size=2, full=True)
+
+        assert [ev['id'] for ev in store.query()] == ['6', '5', '4', '3', '2', '1']
+
+    def test_ties_and_missing_codes(self):
+        """Check that ids order numerically and events without codes are kept."""
+        store = Store(':memory:')
+        uncoded = event(11)
+        del uncoded['event_code']
+        assert store.add([event(9), event(10), uncoded]) == 3
+
+        assert [ev['id'] for ev in store.query()] == ['11', '10', '9']
+        assert [ev['id'] for ev in store.query(code=1100)] == ['10', '9']
@@ -0,0 +1,63 @@
+"""Test concurrent execution of device commands."""
+
+import jaraco.abode
+import jaraco.abode.devices.status as STATUS
+from jaraco.abode.helpers import urls
+
+from .mock import devices as DEVICES
+from .mock import login as LOGIN
+from .mock import logout as LOGOUT
+from .mock import oauth_claims as OAUTH_CLAIMS
+from .mock import panel as PANEL
+from .mock.devices import door_lock as DOOR_LOCK
+from .mock.devices import power_switch_sensor as POWERSENSOR
+
+
+class TestBulk:
+    """Test Client.execute_many."""
+
+    def test_execute_many(self, m):
+        """Check that commands execute and report their outcomes."""
+        m.post(urls.LOGIN, json=LOGIN.post_response_ok())
+        m.get(urls.OAUTH_TOKEN, json=OAUTH_CLAIMS.get_response_ok())
+        m.post(urls.LOGOUT, json=LOGOUT.post_response_ok())
+        m.get(urls.PANEL, json=PANEL.get_response_ok(mode='standby'))
+        m.get(
+            urls.DEVICES,
+            json=[
+                POWERSENSOR.device(status=STATUS.OFF),
+                DOOR_LOCK.device(status=STATUS.Lock.CLOSED),
+            ],
+        )
+        m.put(
+            urls.BASE + POWERSENSOR.CONTROL_URL,
+            json=DEVICES.status_put_response_ok(
+                devid=POWERSENSOR.DEVICE_ID, status=int(STATUS.ON)
+            ),
+        )
+        # respond with the wrong status to fail the unlock
+        m.put(
+            urls.BASE + DOOR_LOCK.CONTROL_URL,
+            json=DEVICES.status_put_response_ok(
+                devid=DOOR_LOCK.DEVICE_ID, status=int(STATUS.Lock.CLOSED)
+            ),
+        )
+
+        switch = self.client.get_device(POWERSENSOR.DEVICE_ID)
+
+        results = self.client.execute_many([
+            (switch, 'switch_on'),
+            (DOOR_LOCK.DEVICE_ID, 'unlock', None),
+            ('ZW:nonexistent', 'switch_off'),
+        ])
+
+        assert [result.command.action for result in results] == [
+            'switch_on',
+            'unlock',
+            'switch_off',
+        ]
+        assert results[0].ok
+        assert switch.is_on
+        assert isinstance(results[1].exception, jaraco.abode.Exception)
+        assert self.client.get_device(DOOR_LOCK.DEVICE_ID).is_locked
+        assert isinstance(results[2].exception, jaraco.abode.Exception)
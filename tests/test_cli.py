@@ -0,0 +1,136 @@
+"""Test the command-line interface."""
+
+import logging
+import os
+import sys
+
+import pytest
+
+import jaraco.abode.devices.status as STATUS
+from jaraco.abode import cli, codec
+from jaraco.abode.helpers import urls
+
+from .mock import devices as DEVICES
+from .mock import login as LOGIN
+from .mock import oauth_claims as OAUTH_CLAIMS
+from .mock import panel as PANEL
+from .mock.devices import door_lock as DOOR_LOCK
+from .mock.devices import power_switch_sensor as POWERSENSOR
+
+
+class TestParallel:
+    def test_dispatch_parallel(self, m, caplog):
+        """Check that actions run concurrently and report their outcomes."""
+        m.post(urls.LOGIN, json=LOGIN.post_response_ok())
+        m.get(urls.OAUTH_TOKEN, json=OAUTH_CLAIMS.get_response_ok())
+        m.get(urls.PANEL, json=PANEL.get_response_ok(mode='standby'))
+        m.get(
+            urls.DEVICES,
+            json=[
+                POWERSENSOR.device(status=STATUS.OFF),
+                DOOR_LOCK.device(status=STATUS.Lock.CLOSED),
+            ],
+        )
+        m.put(
+            urls.BASE + POWERSENSOR.CONTROL_URL,
+            json=DEVICES.status_put_response_ok(
+                devid=POWERSENSOR.DEVICE_ID, status=int(STATUS.ON)
+            ),
+        )
+        # respond for the wrong device to fail the unlock
+        m.put(
+            urls.BASE + DOOR_LOCK.CONTROL_URL,
+            json=DEVICES.status_put_response_ok(
+                devid=POWERSENSOR.DEVICE_ID, status=int(STATUS.Lock.OPEN)
+            ),
+        )
+        argv = ['--on', POWERSENSOR.DEVICE_ID, '--unlock', DOOR_LOCK.DEVICE_ID]
+        args = cli.build_parser().parse_args([*argv, '--parallel', '2'])
+        dispatcher = cli.Dispatcher(self.client, args)
+
+        assert [step.label for step in dispatcher.steps()] == [
+            f'--on {POWERSENSOR.DEVICE_ID}',
+            f'--unlock {DOOR_LOCK.DEVICE_ID}',
+        ]
+
+        caplog.set_level(logging.INFO)
+        assert dispatcher.dispatch() == 1
+        assert self.client.get_device(POWERSENSOR.DEVICE_ID).is_on
+        assert f'--unlock {DOOR_LOCK.DEVICE_ID}: failed' in caplog.text
+        assert '2 actions (1 failed)' in caplog.text
+
+        assert f'Switched on device with id: {POWERSENSOR.DEVICE_ID}' in caplog.text
+
+    @pytest.mark.parametrize('parallel', [[], ['--parallel', '1']])
+    def test_missing_device(self, m, caplog, parallel):
+        """Check that an action on a missing device fails, serially or not."""
+        m.post(urls.LOGIN, json=LOGIN.post_response_ok())
+        m.get(urls.OAUTH_TOKEN, json=OAUTH_CLAIMS.get_response_ok())
+        m.get(urls.PANEL, json=PANEL.get_response_ok(mode='standby'))
+        m.get(urls.DEVICES, json=[POWERSENSOR.device()])
+        args = cli.build_parser().parse_args(['--on', 'ZW:missing', *parallel])
+
+        assert cli.Dispatcher(self.client, args).dispatch() == 1
+        assert 'Could not find device with id: ZW:missing' in caplog.text
+
+    @pytest.mark.parametrize('workers', ['0', '-1', 'many'])
+    def test_invalid_workers(self, workers):
+        with pytest.raises(SystemExit):
+            cli.build_parser().parse_args(['--parallel', workers])
+
+
+class TestFormat:
+    def test_ndjson(self, m, capsys):
+        """Check that devices are output as JSON, one per line."""
+        m.post(urls.LOGIN, json=LOGIN.post_response_ok())
+        m.get(urls.OAUTH_TOKEN, json=OAUTH_CLAIMS.get_response_ok())
+        m.get(urls.PANEL, json=PANEL.get_response_ok(mode='standby'))
+        m.get(
+            urls.DEVICES,
+            json=[POWERSENSOR.device(), DOOR_LOCK.device()],
+        )
+        argv = ['--json', DOOR_LOCK.DEVICE_ID, '--devices', '--format', 'ndjson']
+        args = cli.build_parser().parse_args(argv)
+
+        assert cli.Dispatcher(self.client, args).dispatch() == 0
+
+        lines = capsys.readouterr().out.splitlines()
+        docs = [codec.loads(line) for line in lines]
+        assert docs[0]['id'] == DOOR_LOCK.DEVICE_ID
+        # then all the devices, including the alarm
+        assert [doc['id'] for doc in docs[1:]] == [
+            device.id for device in self.client.get_devices()
+        ]
+        assert lines[0] == codec.dumps(docs[0])
+
+    def test_ndjson_broken_pipe(self, m, monkeypatch):
+        """Check that the command exits once the reader goes away."""
+        m.post(urls.LOGIN, json=LOGIN.post_response_ok())
+        m.get(urls.OAUTH_TOKEN, json=OAUTH_CLAIMS.get_response_ok())
+        m.get(urls.PANEL, json=PANEL.get_response_ok(mode='standby'))
+        m.get(urls.DEVICES, json=[POWERSENSOR.device(), DOOR_LOCK.device()])
+        read, write = os.pipe()
+        os.close(read)
+        with os.fdopen(write, 'w') as stdout:
+            monkeypatch.setattr(sys, 'stdout', stdout)
+            args = cli.build_parser().parse_args(['--devices', '--format', 'ndjson'])
+
+            with pytest.raises(SystemExit) as exc_info:
+                cli.Dispatcher(self.client, args).dispatch()
+
+        assert exc_info.value.code == 1
+
+    def test_json_missing(self, m, capsys, caplog):
+        """Check that a missing device is reported, not output."""
+        m.post(urls.LOGIN, json=LOGIN.post_response_ok())
+        m.get(urls.OAUTH_TOKEN, json=OAUTH_CLAIMS.get_response_ok())
+        m.get(urls.PANEL, json=PANEL.get_response_ok(mode='standby'))
+        m.get(urls.DEVICES, json=[POWERSENSOR.device()])
+
+        for format in ('text', 'ndjson'):
+            argv = ['--json', 'ZW:missing', '--format', format]
+            args = cli.build_parser().parse_args(argv)
+            assert cli.Dispatcher(self.client, args).dispatch() == 0
+
+        assert not capsys.readouterr().out
+        assert caplog.text.count('Could not find device with id: ZW:missing') == 2
@@ -0,0 +1,29 @@
+"""Test the JSON codecs."""
+
+import json
+
+import pytest
+
+from jaraco.abode import codec
+
+DOC = {'id': 'ZW:01', 'name': 'Café / Door', 'statuses': {'open': 1}, 'x': None}
+
+
+@pytest.fixture(params=list(codec.codecs))
+def selected(request):
+    try:
+        return codec.select(request.param)
+    except ImportError:
+        pytest.skip(f"{request.param} not installed")
+
+
+def test_roundtrip(selected):
+    assert selected.loads(selected.dumps(DOC)) == DOC
+    assert selected.loads(selected.dumps(DOC).encode('utf-8')) == DOC
+
+
+def test_pretty(selected):
+    text = selected.dumps(DOC, pretty=True)
+    assert text.index('"id"') < text.index('"name"') < text.index('"statuses"')
+    assert text == json.dumps(DOC, indent=4, sort_keys=True)
+    assert selected.loads(text) == DOC
@@ -0,0 +1,129 @@
+"""Test serving CLI commands from a daemon."""
+
+import socket
+import threading
+
+import pytest
+
+from jaraco.abode import cli, daemon
+from jaraco.abode.helpers import urls
+
+from .mock import login as LOGIN
+from .mock import oauth_claims as OAUTH_CLAIMS
+from .mock import panel as PANEL
+from .mock.devices import door_contact as DOOR_CONTACT
+
+pytestmark = pytest.mark.skipif(
+    not hasattr(socket, 'AF_UNIX'), reason="Unix-domain sockets unavailable"
+)
+
+
+@pytest.fixture
+def path(tmp_path):
+    return tmp_path / 'abode.sock'
+
+
+def test_request(path):
+    """Check a request round trip, replacing a stale socket file."""
+    path.write_text('')
+    server = daemon.Server(lambda message: dict(echo=message['argv']), path)
+    thread = threading.Thread(target=server.serve_forever)
+    thread.start()
+    try:
+        assert daemon.request(dict(argv=['--mode']), path) == dict(echo=['--mode'])
+        with pytest.raises(RuntimeError):
+            daemon.Server(dict, path)
+    finally:
+        server.shutdown()
+        server.server_close()
+        thread.join()
+    assert not path.exists()
+    assert daemon.request(dict(argv=[]), path) is None
+
+
+@pytest.fixture
+def listener(path):
+    """A socket that accepts connections but never replies."""
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.bind(str(path))
+        sock.listen()
+        yield sock
+
+
+def test_request_empty_reply(listener, path):
+    """Check that a connection closed without a reply is an error."""
+
+    def close():
+        conn, _ = listener.accept()
+        with conn:
+            conn.recv(1024)
+
+    thread = threading.Thread(target=close)
+    thread.start()
+    response = daemon.request(dict(argv=['--mode']), path)
+    thread.join()
+    assert 'No valid response from the daemon' in response['error']
+
+
+def test_request_timeout(listener, path):
+    """Check that a daemon that doesn't reply in time is an error."""
+    response = daemon.request(dict(argv=['--mode']), path, timeout=0.1)
+    assert 'timed out' in response['error']
+
+
+class TestDaemon:
+    def test_dispatch(self, m):
+        """Check that commands run with the daemon's client."""
+        m.post(urls.LOGIN, json=LOGIN.post_response_ok())
+        m.get(urls.OAUTH_TOKEN, json=OAUTH_CLAIMS.get_response_ok())
+        m.get(urls.PANEL, json=PANEL.get_response_ok(mode='standby'))
+        m.get(urls.DEVICES, json=DOOR_CONTACT.device())
+        serve = cli.Daemon(self.client, 'foobar')
+
+        response = serve(dict(argv=['--json', DOOR_CONTACT.DEVICE_ID], username=None))
+        assert f'"id": "{DOOR_CONTACT.DEVICE_ID}"' in response['stdout']
+
+        response = serve(dict(argv=['--device', 'RF:missing'], username='foobar'))
+        assert 'Could not find device with id: RF:missing' in response['stderr']
+
+        assert 'refused' in serve(dict(argv=['--mode'], username='other'))
+        assert 'refused' in serve(dict(argv=['--listen'], username=None))
+
+    def test_dispatch_parallel(self, m):
+        """Check that the logs of the actions run in parallel are captured."""
+        m.post(urls.LOGIN, json=LOGIN.post_response_ok())
+        m.get(urls.OAUTH_TOKEN, json=OAUTH_CLAIMS.get_response_ok())
+        m.get(urls.PANEL, json=PANEL.get_response_ok(mode='standby'))
+        m.get(urls.DEVICES, json=DOOR_CONTACT.device())
+        serve = cli.Daemon(self.client, 'foobar')
+
+        response = serve(dict(argv=['--on', 'RF:missing', '--parallel', '2']))
+        assert 'Could not find device with id: RF:missing' in response['stderr']
+        assert '--on RF:missing: failed' in response['stderr']
+        assert response['status'] == 1
+
+    def test_dispatch_failure(self, monkeypatch):
+        """Check that a failed command is reported, not refused."""
+
+        def fail(self):
+            raise RuntimeError("boom")
+
+        monkeypatch.setattr(cli.Dispatcher, 'dispatch', fail)
+        response = cli.Daemon(self.client, 'foobar')(dict(argv=['--mode']))
+        assert response['status'] == 1
+        assert 'RuntimeError: boom' in response['stderr']
+
+
+@pytest.mark.parametrize(
+    'response, expected',
+    [
+        (None, None),
+        (dict(refused="Command not supported by the daemon"), None),
+        (dict(error="boom"), dict(status=1)),
+    ],
+)
+def test_run_in_daemon(monkeypatch, response, expected):
+    """Check that only a refused command is run again locally."""
+    monkeypatch.setattr(daemon, 'request', lambda message: response)
+    args = cli.build_parser().parse_args(['--mode'])
+    assert cli._run_in_daemon(args, ['--mode']) == expected
@@ -1,10 +1,12 @@
 """Test the Abode device classes."""
 
+import gc
+
 import pytest
 
 import jaraco.abode
 import jaraco.abode.devices.status as STATUS
-from jaraco.abode.devices.base import Device
+from jaraco.abode.devices.base import Device, Unknown
 from jaraco.abode.helpers import urls
 
 from .mock import devices as DEVICES
@@ -35,6 +37,23 @@ class TestDevice:
             del device['type_tag']
             Device.new(device, self.client)
 
+    def test_resolve_class_new_subclass(self):
+        """Check that defining a device class makes its tags resolvable."""
+        assert Device.resolve_class('device_type.test_gadget') is Unknown
+
+        class Gadget(Device):
+            tags = ('test_gadget',)
+
+        try:
+            assert Device.resolve_class('device_type.test_gadget') is Gadget
+        finally:
+            # remove Gadget from the subclasses and the lookups
+            del Gadget
+            Device._lookups.clear()
+            gc.collect()
+
+        assert Device.resolve_class('device_type.test_gadget') is Unknown
+
     def test_device_auto_naming(self):
         """Check the generic Abode device creates a name."""
         source = GLASS.device(
@@ -0,0 +1,79 @@
+"""Test the callback dispatchers."""
+
+import asyncio
+import threading
+
+import pytest
+
+from jaraco.abode import dispatch
+
+
+def test_thread_pool_order():
+    pool = dispatch.ThreadPool(workers=3)
+    calls = []
+    for n in range(50):
+        pool.submit('device', calls.append, n)
+    pool.stop()
+    assert calls == list(range(50))
+    assert pool.stats['completed'] == 50
+
+
+def test_thread_pool_stats():
+    """Check that callbacks completed on many workers are all counted."""
+    pool = dispatch.ThreadPool(workers=8)
+    for n in range(2000):
+        pool.submit(n, int, n)
+    pool.stop()
+    assert pool.stats == dict(submitted=2000, completed=2000)
+
+
+def test_thread_pool_drop_oldest():
+    pool = dispatch.ThreadPool(workers=1, maxsize=2, overflow='drop_oldest')
+    started = threading.Event()
+    release = threading.Event()
+    calls = []
+
+    def block(n):
+        started.set()
+        release.wait()
+        calls.append(n)
+
+    pool.submit('device', block, 1)
+    started.wait()
+    for n in range(2, 7):
+        pool.submit('device', calls.append, n)
+    assert pool.depth == 2
+
+    release.set()
+    pool.stop()
+    assert calls == [1, 5, 6]
+    assert pool.stats['dropped'] == 3
+
+
+def test_invalid_overflow():
+    with pytest.raises(ValueError):
+        dispatch.ThreadPool(overflow='spill')
+
+
+def test_event_loop():
+    loop = asyncio.new_event_loop()
+    thread = threading.Thread(target=loop.run_forever)
+    thread.start()
+    calls = []
+
+    async def record(n):
+        calls.append(n)
+
+    try:
+        dispatcher = dispatch.EventLoop(loop)
+        dispatcher.submit('device', calls.append, 1)
+        dispatcher.submit('device', record, 2)
+        dispatcher.join()
+        dispatcher.join()
+    finally:
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join()
+        loop.close()
+
+    assert calls == [1, 2]
+    assert dispatcher.depth == 0
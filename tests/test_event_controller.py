@@ -1,5 +1,6 @@
 """Test the Abode event controller class."""
 
+import threading
 from unittest.mock import Mock, call
 
 import pytest
@@ -7,9 +8,11 @@ import pytest
 import jaraco.abode
 import jaraco.abode.devices.status as STATUS
 import jaraco.abode.helpers.timeline as TIMELINE
+from jaraco.abode import dispatch
 from jaraco.abode.devices.binary_sensor import BinarySensor
 from jaraco.abode.helpers import urls
 
+from .mock import automation as AUTOMATION
 from .mock import login as LOGIN
 from .mock import logout as LOGOUT
 from .mock import oauth_claims as OAUTH_CLAIMS
@@ -251,6 +254,137 @@ class TestEventController:
         # Test that an unknown device cleanly returns
         events._on_device_update(DOORCONTACT.DEVICE_ID)
 
+    def test_resume(self, m):
+        """Tests that reconnecting notifies only devices that changed."""
+        m.post(urls.LOGIN, json=LOGIN.post_response_ok())
+        m.get(urls.OAUTH_TOKEN, json=OAUTH_CLAIMS.get_response_ok())
+        m.get(urls.PANEL, json=PANEL.get_response_ok(mode='standby'))
+        automation = dict(name='Night', id='47fae27488f74f55b964a81a066c3a01')
+        m.get(
+            urls.AUTOMATION,
+            json=[AUTOMATION.get_response_ok(enabled=True, **automation)],
+        )
+        m.get(
+            urls.DEVICES,
+            json=[
+                COVER.device(status=STATUS.CLOSED),
+                DOORCONTACT.device(status=STATUS.CLOSED),
+            ],
+        )
+
+        cover = self.client.get_device(COVER.DEVICE_ID)
+        door = self.client.get_device(DOORCONTACT.DEVICE_ID)
+
+        events = self.client.events
+        events.resume = True
+        callback = Mock()
+        assert events.add_device_callback([cover.id, door.id], callback)
+        status_callback = Mock()
+        assert events.add_connection_status_callback('test', status_callback)
+
+        m.get(
+            urls.DEVICES,
+            json=[
+                COVER.device(status=STATUS.OPEN),
+                DOORCONTACT.device(status=STATUS.CLOSED),
+            ],
+        )
+        events._on_socket_connected()
+
+        callback.assert_called_once_with(cover)
+        status_callback.assert_called_once_with()
+        assert events.resume_stats == dict(
+            resumes=1, devices_changed=1, keys_changed=1, automations_changed=0
+        )
+        assert m.request_history[-1].path == urls.AUTOMATION
+
+        # No device changed, so no callbacks, but automations may have
+        m.get(
+            urls.AUTOMATION,
+            json=[AUTOMATION.get_response_ok(enabled=False, **automation)],
+        )
+        events._on_socket_connected()
+
+        callback.assert_called_once_with(cover)
+        assert m.request_history[-1].path == urls.AUTOMATION
+        assert events.resume_stats['automations_changed'] == 1
+        assert not self.client.get_automation(automation['id']).enabled
+
+    def test_coalesced_device_updates(self, m):
+        """Tests that device updates are coalesced into fewer refreshes."""
+        # Set up URLs
+        m.post(urls.LOGIN, json=LOGIN.post_response_ok())
+        m.get(urls.OAUTH_TOKEN, json=OAUTH_CLAIMS.get_response_ok())
+        m.post(urls.LOGOUT, json=LOGOUT.post_response_ok())
+        m.get(urls.PANEL, json=PANEL.get_response_ok(mode='standby'))
+        m.get(
+            urls.DEVICES,
+            json=[
+                COVER.device(status=STATUS.CLOSED),
+                DOORCONTACT.device(status=STATUS.CLOSED),
+            ],
+        )
+
+        # Logout to reset everything
+        self.client.logout()
+
+        cover = self.client.get_device(COVER.DEVICE_ID)
+        door = self.client.get_device(DOORCONTACT.DEVICE_ID)
+
+        events = self.client.events
+        callback = Mock()
+        assert events.add_device_callback([cover.id, door.id], callback)
+
+        # Use a long window so that only explicit flushes refresh
+        coalescer = events.coalesce_updates(window=60, batch_threshold=2)
+
+        # Repeated updates for one device refresh it once
+        cover_url = urls.DEVICE.format(id=COVER.DEVICE_ID)
+        m.get(cover_url, json=COVER.device(status=STATUS.OPEN))
+        for _ in range(3):
+            events._on_device_update(cover.id)
+        callback.assert_not_called()
+        coalescer.flush()
+
+        assert cover.status == STATUS.OPEN
+        callback.assert_called_once_with(cover)
+        assert coalescer.stats == dict(events=3, requests=1, saved=2)
+
+        # Updates for many devices refresh them all at once
+        callback.reset_mock()
+        m.get(
+            urls.DEVICES,
+            json=[
+                COVER.device(status=STATUS.CLOSED),
+                DOORCONTACT.device(status=STATUS.OPEN),
+            ],
+        )
+        events._on_device_update(cover.id)
+        events._on_device_update(door.id)
+        events._on_device_update(cover.id)
+        coalescer.flush()
+
+        assert cover.status == STATUS.CLOSED
+        assert door.status == STATUS.OPEN
+        callback.assert_has_calls([call(cover), call(door)])
+        assert coalescer.stats == dict(events=6, requests=2, saved=4)
+
+        # The alarm is refreshed from the panel, even among many devices
+        alarm = self.client.get_alarm()
+        assert events.add_device_callback(alarm.id, callback)
+        callback.reset_mock()
+        m.get(urls.PANEL, json=PANEL.get_response_ok(mode='away'))
+        for device_id in (cover.id, door.id, alarm.id):
+            events._on_device_update(device_id)
+        coalescer.flush()
+
+        assert alarm.mode == 'away'
+        callback.assert_has_calls([call(cover), call(door), call(alarm)])
+        assert coalescer.stats == dict(events=9, requests=4, saved=5)
+
+        # Disable coalescing
+        assert events.coalesce_updates(window=None) is None
+
     def test_events_callback(self):
         """Tests that event updates callback correctly."""
         # Get the event controller
@@ -309,6 +443,34 @@ class TestEventController:
         # Test that an invalid event exits cleanly
         events._on_timeline_update({"invalid": "event"})
 
+    def test_timeline_range_callback(self):
+        """Tests timeline callbacks by event code range and predicate."""
+        events = self.client.events
+
+        range_callback = Mock()
+        alarm_range_callback = Mock()
+        predicate_callback = Mock()
+
+        assert events.add_timeline_range_callback(range(5000, 5100), range_callback)
+        assert events.add_timeline_range_callback(
+            range(1100, 1200), alarm_range_callback
+        )
+
+        event_json = IRCAMERA.timeline_event()
+        events._on_timeline_update(event_json)
+
+        range_callback.assert_called_once_with(event_json)
+        alarm_range_callback.assert_not_called()
+
+        # Subscriptions added later apply to subsequent events
+        assert events.add_timeline_predicate_callback(
+            lambda code: code == 5001, predicate_callback
+        )
+        events._on_timeline_update(event_json)
+
+        assert range_callback.call_count == 2
+        predicate_callback.assert_called_once_with(event_json)
+
     def test_alarm_callback(self, m):
         """Tests that alarm device updates callback correctly."""
         # Set up URLs
@@ -366,6 +528,24 @@ class TestEventController:
         event_json = IRCAMERA.timeline_event()
         events._on_timeline_update(event_json)
 
+    def test_threaded_dispatch(self):
+        """Tests that callbacks may be invoked off the SocketIO thread."""
+        events = self.client.events
+        events.dispatcher = dispatch.ThreadPool(workers=2)
+        receiver = threading.current_thread()
+        threads = []
+
+        def _callback(event_json):
+            threads.append(threading.current_thread())
+
+        assert events.add_timeline_callback(TIMELINE.CAPTURE_IMAGE, _callback)
+
+        events._on_timeline_update(IRCAMERA.timeline_event())
+        events.stop()
+
+        assert threads and receiver not in threads
+        assert not any(thread.is_alive() for thread in events.dispatcher._threads)
+
     def test_multi_device_callback(self, m):
         """Tests that multiple device updates callback correctly."""
         # Set up URLs
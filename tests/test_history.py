@@ -0,0 +1,59 @@
+"""Test the history of device readings."""
+
+from jaraco.abode.helpers import urls
+from jaraco.abode.history import History
+
+from .mock import devices as DEVICES
+from .mock import login as LOGIN
+from .mock import oauth_claims as OAUTH_CLAIMS
+from .mock import panel as PANEL
+from .mock.devices import door_contact as DOOR_CONTACT
+from .mock.devices import lm as LM
+
+
+class TestHistory:
+    def test_track(self, m, tmp_path):
+        """Check that readings pushed for tracked devices are recorded."""
+        m.post(urls.LOGIN, json=LOGIN.post_response_ok())
+        m.get(urls.OAUTH_TOKEN, json=OAUTH_CLAIMS.get_response_ok())
+        m.get(urls.PANEL, json=PANEL.get_response_ok(mode='standby'))
+        m.get(
+            urls.DEVICES,
+            json=[LM.device(temp='20 °C', humidity='40 %'), DOOR_CONTACT.device()],
+        )
+        m.get(urls.AUTOMATION, json=DEVICES.EMPTY_DEVICE_RESPONSE)
+
+        history = History(tmp_path, segment_size=3)
+        assert history.track(self.client)
+
+        m.get(
+            urls.DEVICE.format(id=LM.DEVICE_ID),
+            json=LM.device(temp='-2,5 °C', humidity='40 %'),
+        )
+        self.client.events._on_device_update(LM.DEVICE_ID)
+
+        temps = history.samples(LM.DEVICE_ID, 'temperature')
+        assert [sample.value for sample in temps] == [20.0, -2.5]
+        assert len(history.samples(LM.DEVICE_ID, 'humidity')) == 1
+        assert history.samples(DOOR_CONTACT.DEVICE_ID, 'temperature') == []
+
+        # the first three rows were written to a segment
+        assert [path.name for path in tmp_path.glob('segment-*')] == [
+            'segment-000000.bin'
+        ]
+        history.close()
+
+        reopened = History(tmp_path)
+        assert reopened.samples(LM.DEVICE_ID, 'temperature') == temps
+        (bucket,) = reopened.downsample(LM.DEVICE_ID, 'temperature', bucket=1e12)
+        assert (bucket.min, bucket.max, bucket.avg, bucket.count) == (-2.5, 20, 8.75, 2)
+        reopened.close()
+
+    def test_flush_interval(self, tmp_path):
+        """Check that rows held longer than the flush interval are written."""
+        history = History(str(tmp_path), flush_interval=0)
+        history.append(LM.DEVICE_ID, 'temperature', 20.0, timestamp=1)
+        history.append(LM.DEVICE_ID, 'temperature', 21.0, timestamp=2)
+
+        assert len(list(tmp_path.glob('segment-*'))) == 2
+        history.close()
@@ -0,0 +1,38 @@
+"""Test that importing the package defers its heavy dependencies."""
+
+import subprocess
+import sys
+
+import pytest
+
+
+def imported(statement):
+    script = f'{statement}; import sys; print(*sys.modules)'
+    proc = subprocess.run(
+        [sys.executable, '-c', script], capture_output=True, text=True, check=True
+    )
+    return set(proc.stdout.split())
+
+
+@pytest.mark.parametrize(
+    'statement', ['import jaraco.abode', 'import jaraco.abode.cli']
+)
+def test_deferred_imports(statement):
+    modules = imported(statement)
+    deferred = {'requests', 'lomond', 'keyring', 'jaraco.abode.client', 'inflect'}
+    assert not modules & deferred
+
+
+def test_client_on_demand():
+    modules = imported('import jaraco.abode; jaraco.abode.Client')
+    assert 'jaraco.abode.client' in modules
+    assert 'lomond' not in modules
+
+
+def test_device_modules_listed():
+    import pathlib
+
+    from jaraco.abode.devices import pkg
+
+    found = {path.stem for path in pathlib.Path(pkg.__file__).parent.glob('*.py')}
+    assert set(pkg.modules) == found - {'__init__', 'pkg'}
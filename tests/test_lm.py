@@ -142,3 +142,37 @@ class TestLM:
         assert device.humidity_unit is None
         assert device.lux is None
         assert device.lux_unit is None
+
+    def test_lm_locale_readings(self, m):
+        """Tests that negative and comma-decimal readings are parsed."""
+        m.post(urls.LOGIN, json=LOGIN.post_response_ok())
+        m.get(urls.OAUTH_TOKEN, json=OAUTH_CLAIMS.get_response_ok())
+        m.post(urls.LOGOUT, json=LOGOUT.post_response_ok())
+        m.get(urls.PANEL, json=PANEL.get_response_ok(mode='standby'))
+        m.get(
+            urls.DEVICES,
+            json=LM.device(status='-3,5 °C', temp='-3,5 °C', lux='1,200 lx'),
+        )
+
+        self.client.logout()
+
+        device = self.client.get_device(LM.DEVICE_ID)
+
+        assert device.temp == -3.5
+        assert device.temp_unit == '°C'
+        assert device.lux == 1200
+        assert device.reading('temperature') is device.reading('temperature')
+
+        # Readings are kept when the statuses are unchanged
+        reading = device.reading('temperature')
+        device.update(LM.device(status='-3,5 °C', temp='-3,5 °C', lux='1,200 lx'))
+        assert device.reading('temperature') is reading
+
+        # Readings are parsed again when the statuses are updated
+        m.get(
+            urls.DEVICE.format(id=LM.DEVICE_ID),
+            json=LM.device(status='21,5 °C', temp='21,5 °C'),
+        )
+        device.refresh()
+
+        assert device.temp == 21.5
@@ -0,0 +1,88 @@
+"""Test serving devices from a snapshot saved to disk."""
+
+import jaraco.abode
+import jaraco.abode.devices.status as STATUS
+from jaraco.abode.helpers import urls
+from jaraco.abode.snapshot import Snapshot
+
+from .mock import devices as DEVICES
+from .mock import login as LOGIN
+from .mock import oauth_claims as OAUTH_CLAIMS
+from .mock import panel as PANEL
+from .mock.devices import door_contact as DOOR_CONTACT
+
+
+def client(username='foobar'):
+    return jaraco.abode.Client(
+        username=username, password='deadbeef', snapshot_max_age=60
+    )
+
+
+class TestSnapshot:
+    def test_restore(self, m, monkeypatch):
+        """Check that a new client serves the saved devices, then revalidates."""
+        m.post(urls.LOGIN, json=LOGIN.post_response_ok())
+        m.get(urls.OAUTH_TOKEN, json=OAUTH_CLAIMS.get_response_ok())
+        m.get(urls.PANEL, json=PANEL.get_response_ok(mode='standby'))
+        m.get(urls.AUTOMATION, json=DEVICES.EMPTY_DEVICE_RESPONSE)
+        m.get(urls.DEVICES, json=[DOOR_CONTACT.device(status=STATUS.CLOSED)])
+        client().refresh()
+
+        m.get(urls.DEVICES, json=[DOOR_CONTACT.device(status=STATUS.OPEN)])
+        # defer the revalidation, to observe the state before and after
+        monkeypatch.setattr(
+            jaraco.abode.Client, '_start_revalidation', lambda self: None
+        )
+        restored = client()
+        requests = m.call_count
+
+        contact = restored.get_device(DOOR_CONTACT.DEVICE_ID)
+        assert contact.status == STATUS.CLOSED
+        assert restored.get_alarm().mode == 'standby'
+        assert restored.get_automations() == []
+        assert restored.snapshot.age < 60
+
+        assert not restored.revalidated.is_set()
+        restored._revalidate()
+        assert restored.revalidated.is_set()
+        assert m.call_count > requests
+        assert contact.status == STATUS.OPEN
+        assert restored.data_age < restored.snapshot.age
+
+    def test_auto_login(self, m):
+        """Check that the revalidation and auto login share one login."""
+        m.post(urls.LOGIN, json=LOGIN.post_response_ok())
+        m.get(urls.OAUTH_TOKEN, json=OAUTH_CLAIMS.get_response_ok())
+        m.get(urls.PANEL, json=PANEL.get_response_ok(mode='standby'))
+        m.get(urls.AUTOMATION, json=DEVICES.EMPTY_DEVICE_RESPONSE)
+        m.get(urls.DEVICES, json=[DOOR_CONTACT.device()])
+        client().refresh()
+        requests = m.call_count
+
+        restored = jaraco.abode.Client(
+            username='foobar', password='deadbeef', auto_login=True, snapshot_max_age=60
+        )
+        assert restored.revalidated.wait(5)
+        posts = [req for req in m.request_history[requests:] if req.method == 'POST']
+        assert len(posts) == 1
+
+    def test_other_account(self, m):
+        """Check that a snapshot is served only to the account it's of."""
+        m.post(urls.LOGIN, json=LOGIN.post_response_ok())
+        m.get(urls.OAUTH_TOKEN, json=OAUTH_CLAIMS.get_response_ok())
+        m.get(urls.PANEL, json=PANEL.get_response_ok(mode='standby'))
+        m.get(urls.AUTOMATION, json=DEVICES.EMPTY_DEVICE_RESPONSE)
+        m.get(urls.DEVICES, json=[DOOR_CONTACT.device()])
+        client().refresh()
+
+        assert client('other').snapshot is None
+        assert client('other')._devices is None
+
+    def test_stale(self):
+        """Check that a snapshot older than the max age is ignored."""
+        Snapshot(
+            panel={}, devices=[], automations=[], saved=0, username='foobar'
+        ).save()
+
+        assert client().snapshot is None
+        assert client()._devices is None
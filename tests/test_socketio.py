@@ -0,0 +1,102 @@
+"""Test the SocketIO client."""
+
+import threading
+import time
+import types
+
+import pytest
+
+from jaraco.abode.exceptions import SocketIOException
+from jaraco.abode.socketio import Keepalive, SocketIO
+
+
+def test_keepalive_received():
+    """A connection receiving packets doesn't expire."""
+    pings = []
+    expired = threading.Event()
+    keepalive = Keepalive(
+        0.01, 0.05, lambda: pings.append(time.monotonic()), expired.set
+    )
+    keepalive.start()
+    deadline = time.monotonic() + 0.2
+    while time.monotonic() < deadline:
+        keepalive.received()
+        time.sleep(0.01)
+    keepalive.stop()
+
+    assert not expired.is_set()
+    assert len(pings) > 2
+
+
+def test_keepalive_stop():
+    """A stopped keepalive neither pings nor expires."""
+    pings = []
+    expired = threading.Event()
+    keepalive = Keepalive(10, 10, lambda: pings.append(1), expired.set)
+    keepalive.start()
+    keepalive.stop()
+    keepalive._thread.join(1)
+
+    assert not keepalive._thread.is_alive()
+    assert pings == [1]
+    assert not expired.is_set()
+
+
+class FakeWebSocket:
+    def __init__(self):
+        self.sent = []
+
+    def send_text(self, text):
+        self.sent.append(text)
+
+
+def receive(sio, text):
+    sio._on_websocket_text(types.SimpleNamespace(text=text))
+
+
+def test_event_dispatch():
+    sio = SocketIO(url='wss://example.invalid/socket.io/')
+    sio._websocket = FakeWebSocket()
+    updates = []
+    sio.on('com.goabode.device.update', updates.append)
+
+    events = []
+    sio.on('event', events.append)
+
+    receive(sio, '40')
+    assert sio._socketio_connected
+
+    receive(sio, '42["com.goabode.device.update","ZW:01"]')
+    receive(sio, '42/alarm,7["com.goabode.device.update","ZW:02"]')
+
+    assert updates == [['ZW:01'], ['ZW:02']]
+    assert events == [
+        '["com.goabode.device.update","ZW:01"]',
+        '/alarm,7["com.goabode.device.update","ZW:02"]',
+    ]
+    assert sio._websocket.sent == ['43/alarm,7[]']
+
+
+def test_malformed_messages_ignored():
+    sio = SocketIO(url='wss://example.invalid/socket.io/')
+    events = []
+    sio.on('event', events.append)
+
+    receive(sio, '42{"not": "a list"}')
+    receive(sio, '42[')
+    receive(sio, '4')
+    receive(sio, '9unknown')
+
+    assert events == []
+
+
+def test_error():
+    sio = SocketIO(url='wss://example.invalid/socket.io/')
+    errors = []
+    sio.on('error', errors.append)
+
+    with pytest.raises(SocketIOException) as info:
+        receive(sio, '44"Not authorized"')
+
+    assert errors == ['"Not authorized"']
+    assert info.value.details == '"Not authorized"'
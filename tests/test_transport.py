@@ -0,0 +1,58 @@
+"""Test the shared HTTP transport."""
+
+import http.server
+import threading
+
+import pytest
+
+from jaraco.abode.transport import Transport
+
+
+class Handler(http.server.BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        body = b'image data'
+        self.send_response(200)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    server = http.server.ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def test_connections_reused(server):
+    host, port = server.server_address
+    url = f'http://{host}:{port}/image.jpg'
+    transport = Transport(pool_maxsize=2)
+
+    for _ in range(3):
+        with transport.downloads.get(url, stream=True) as response:
+            assert response.raw.read() == b'image data'
+
+    assert transport.stats() == {
+        f'http://{host}:{port}': dict(connections=1, requests=3, idle=1),
+    }
+
+
+def test_api_session_shares_pools():
+    transport = Transport()
+    api = transport.api_session()
+    assert api.get_adapter('https://my.goabode.com/') is transport.adapter
+    assert transport.downloads.get_adapter('https://s3/') is transport.adapter
+
+
+def test_no_keep_alive():
+    transport = Transport(keep_alive=False)
+    assert transport.api_session().headers['Connection'] == 'close'